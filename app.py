@@ -8,6 +8,7 @@ import asyncio
 import json
 import numpy as np
 from pathlib import Path
+from typing import List, Dict, Optional
 import sys
 
 # Add project root to path
@@ -15,6 +16,11 @@ sys.path.append(str(Path(__file__).parent))
 
 from config.settings import settings, PROCESSED_DATA_DIR
 from src.enhancement.llm_contextualizer import llm_contextualizer
+from src.retrieval.vector_index import BibleVectorIndex
+from src.retrieval.searchers import create_searcher, available_index_types
+from src.retrieval.query_encoder import get_query_encoder
+from src.embeddings.embedding_artifact import artifact_path_for, fresh_artifact_for, save_chunks_artifact
+from src.service.client import get_search_client
 
 st.set_page_config(
     page_title="Amharic Bible Q&A",
@@ -22,57 +28,67 @@ st.set_page_config(
     layout="wide"
 )
 
-def load_embeddings():
-    """Load processed embeddings"""
+@st.cache_resource
+def load_embeddings() -> Optional[BibleVectorIndex]:
+    """Load processed embeddings as a vector index, once per Streamlit process"""
     embeddings_file = PROCESSED_DATA_DIR / "complete_bible_embeddings.json"
     
+    # Binary artifact: memory-mapped, no JSON parsing of float lists
+    artifact_dir = fresh_artifact_for(str(embeddings_file))
+    if artifact_dir is not None:
+        return BibleVectorIndex.from_artifact(str(artifact_dir))
+    
     if not embeddings_file.exists():
         return None
     
     with open(embeddings_file, 'r', encoding='utf-8') as f:
-        return json.load(f)
-
-def calculate_similarity(query_embedding: np.ndarray, chunk_embedding: List[float]) -> float:
-    """Calculate cosine similarity between query and chunk"""
-    chunk_array = np.array(chunk_embedding)
+        embeddings_data = json.load(f)
     
-    dot_product = np.dot(query_embedding, chunk_array)
-    norm_query = np.linalg.norm(query_embedding)
-    norm_chunk = np.linalg.norm(chunk_array)
+    chunks = [chunk for chapter_data in embeddings_data.values() for chunk in chapter_data["chunks"]]
     
-    if norm_query == 0 or norm_chunk == 0:
-        return 0.0
-    
-    return dot_product / (norm_query * norm_chunk)
+    # (Re)write the artifact so later starts skip the JSON parse until the file changes
+    artifact_dir = artifact_path_for(str(embeddings_file))
+    save_chunks_artifact(str(artifact_dir), chunks, settings.EMBEDDING_MODEL,
+                         source=str(embeddings_file), source_file=str(embeddings_file))
+    return BibleVectorIndex.from_artifact(str(artifact_dir))
+
+@st.cache_resource
+def load_model():
+    """Load the query embedding model once per Streamlit process"""
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(settings.EMBEDDING_MODEL)
+
+def _result(chunk: Dict, similarity: float) -> Dict:
+    """Display fields of a matched chunk"""
+    return {
+        "similarity": similarity,
+        "text": chunk["text"],
+        "book": chunk["book"],
+        "chapter": chunk["chapter"],
+        "verse_range": chunk.get("verse_range", [chunk.get("verse_number", 0)] * 2),
+        "context": chunk.get("context", ""),
+        "chunk_id": chunk.get("chunk_id", chunk.get("id"))
+    }
 
-async def search_bible(query: str, embeddings_data: Dict, top_k: int = 5) -> List[Dict]:
+async def search_bible(query: str, index: Optional[BibleVectorIndex], top_k: int = 5, index_type: str = "exact") -> List[Dict]:
     """Search Bible using embeddings and return top matches"""
     
-    # Generate query embedding
-    from sentence_transformers import SentenceTransformer
-    model = SentenceTransformer(settings.EMBEDDING_MODEL)
-    query_embedding = model.encode([query])[0]
+    # The search service owns the model and index when one is configured
+    client = get_search_client()
+    if client is not None:
+        return [_result(hit["record"], hit["similarity"]) for hit in client.search(query, top_k, min_similarity=None)]
+    
+    # Generate query embedding (repeated queries are served from the query cache)
+    query_embedding = get_query_encoder(settings.EMBEDDING_MODEL, model=load_model()).encode_one(query)
     
-    # Search through all chunks
+    # Score all chunks with one matrix-vector product (or an ANN backend)
+    searcher = create_searcher(index, index_type)
     results = []
     
-    for chapter_key, chapter_data in embeddings_data.items():
-        for chunk in chapter_data["chunks"]:
-            similarity = calculate_similarity(query_embedding, chunk["embedding"])
-            
-            results.append({
-                "similarity": similarity,
-                "text": chunk["text"],
-                "book": chunk["book"],
-                "chapter": chunk["chapter"],
-                "verse_range": chunk["verse_range"],
-                "context": chunk.get("context", ""),
-                "chunk_id": chunk["chunk_id"]
-            })
-    
-    # Sort by similarity and return top_k
-    results.sort(key=lambda x: x["similarity"], reverse=True)
-    return results[:top_k]
+    for row_id, similarity in searcher.top_k(query_embedding, top_k):
+        results.append(_result(searcher.records[row_id], similarity))
+    
+    return results
 
 def main():
     """Main Streamlit application"""
@@ -80,16 +96,34 @@ def main():
     st.title("🇪🇹 Amharic Bible Q&A with Late Chunking")
     st.markdown("*Advanced semantic search using modern LLM enhancement and contextualized embeddings*")
     
-    # Load embeddings
-    with st.spinner("Loading Bible embeddings..."):
-        embeddings_data = load_embeddings()
-    
-    if not embeddings_data:
-        st.error("❌ No processed embeddings found!")
-        st.info("Run `python scripts/process_bible.py` first to process your Bible data")
-        return
+    client = get_search_client()
+    index = None
+    
+    if client is not None:
+        # Shared search service: no model or index in this process
+        try:
+            service = client.health()
+        except Exception as e:
+            st.error(f"❌ Search service unavailable at {client.base_url}: {e}")
+            return
+        total_chapters = service["chapters"]
+        total_chunks = service["rows"]
+        cache_stats = service["query_cache"]
+    else:
+        # Load embeddings
+        with st.spinner("Loading Bible embeddings..."):
+            index = load_embeddings()
+        
+        if index is None:
+            st.error("❌ No processed embeddings found!")
+            st.info("Run `python scripts/process_bible.py` first to process your Bible data")
+            return
+        
+        total_chapters = len({(record.get("book"), record.get("chapter")) for record in index.records})
+        total_chunks = len(index)
+        cache_stats = None
     
-    st.success(f"✅ Loaded {len(embeddings_data)} chapters/books")
+    st.success(f"✅ Loaded {total_chapters} chapters/books")
     
     # Query interface
     st.header("🔍 Ask Questions About the Bible")
@@ -105,13 +139,21 @@ def main():
     with col2:
         top_k = st.slider("Number of results", 3, 10, 5)
     
+    index_types = available_index_types()
+    index_type = st.sidebar.selectbox(
+        "Search index",
+        index_types,
+        index=index_types.index(settings.SEARCH_INDEX_TYPE) if settings.SEARCH_INDEX_TYPE in index_types else 0,
+        help="exact: brute-force cosine; hnsw: approximate graph search; ivfpq: compressed codes with exact re-rank; int8: scalar-quantized scan with float16 re-score; binary: Hamming prefilter with exact re-rank; pca: PCA-reduced scan with exact re-rank; sharded: per-testament/book-group shards searched in parallel"
+    )
+    
     if search_button and query:
         with st.spinner("Searching Bible..."):
             # Run async search
             loop = asyncio.new_event_loop()
             asyncio.set_event_loop(loop)
             try:
-                results = loop.run_until_complete(search_bible(query, embeddings_data, top_k))
+                results = loop.run_until_complete(search_bible(query, index, top_k, index_type))
             finally:
                 loop.close()
         
@@ -152,11 +194,14 @@ def main():
         """)
         
         st.header("📊 Statistics")
-        if embeddings_data:
-            total_chunks = sum(len(chapter["chunks"]) for chapter in embeddings_data.values())
-            st.metric("Total Chapters", len(embeddings_data))
-            st.metric("Total Chunks", total_chunks)
-            st.metric("Embedding Model", settings.EMBEDDING_MODEL.split("/")[-1])
+        st.metric("Total Chapters", total_chapters)
+        st.metric("Total Chunks", total_chunks)
+        st.metric("Embedding Model", settings.EMBEDDING_MODEL.split("/")[-1])
+        
+        if cache_stats is None:
+            cache_stats = get_query_encoder(settings.EMBEDDING_MODEL).stats()
+        st.metric("Query Cache Hit Rate", f"{cache_stats['hit_rate']:.0%}",
+                  help=f"{cache_stats['hits']} hits / {cache_stats['misses']} misses")
         
         st.header("🔧 Configuration")
         st.code(f"""
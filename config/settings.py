@@ -48,14 +48,59 @@ class Settings:
     ENABLE_CROSS_REFERENCES = os.getenv("ENABLE_CROSS_REFERENCES", "true").lower() == "true"
     ENABLE_THEOLOGICAL_CONTEXT = os.getenv("ENABLE_THEOLOGICAL_CONTEXT", "true").lower() == "true"
     
+    # Search index ("exact" brute force, approximate "hnsw", compressed "ivfpq")
+    SEARCH_INDEX_TYPE = os.getenv("SEARCH_INDEX_TYPE", "exact")
+    HNSW_M = int(os.getenv("HNSW_M", "16"))
+    HNSW_EF_CONSTRUCTION = int(os.getenv("HNSW_EF_CONSTRUCTION", "200"))
+    HNSW_EF_SEARCH = int(os.getenv("HNSW_EF_SEARCH", "64"))
+    IVF_NLIST = int(os.getenv("IVF_NLIST", "128"))
+    IVF_NPROBE = int(os.getenv("IVF_NPROBE", "16"))
+    PQ_M = int(os.getenv("PQ_M", "32"))
+    IVFPQ_RERANK = int(os.getenv("IVFPQ_RERANK", "100"))
+    INT8_RERANK = int(os.getenv("INT8_RERANK", "256"))
+    BINARY_RERANK = int(os.getenv("BINARY_RERANK", "500"))
+    PCA_DIMENSION = int(os.getenv("PCA_DIMENSION", "128"))  # 64 or 128 components scanned before re-ranking
+    PCA_RERANK = int(os.getenv("PCA_RERANK", "200"))
+    SHARD_BY = os.getenv("SHARD_BY", "testament")  # "testament" or "book_group"
+    SHARD_WORKERS = int(os.getenv("SHARD_WORKERS", "0"))  # 0 = one thread per CPU
+    SHARD_DIR = os.getenv("SHARD_DIR", "")  # persisted shards; "" = shards.<SHARD_BY> inside the artifact
+    SHARD_NAMES = os.getenv("SHARD_NAMES", "")  # comma-separated persisted shards to load; "" = all
+    
+    # Retrieval mode: "dense", "hybrid" (dense + BM25 fused with reciprocal-rank fusion)
+    # or "cascade" (CASCADE_MODEL first stage, re-scored with EMBEDDING_MODEL vectors)
+    SEARCH_MODE = os.getenv("SEARCH_MODE", "dense")
+    HYBRID_CANDIDATES = int(os.getenv("HYBRID_CANDIDATES", "50"))
+    RRF_K = int(os.getenv("RRF_K", "60"))
+    CASCADE_MODEL = os.getenv("CASCADE_MODEL", "sentence-transformers/all-MiniLM-L6-v2")
+    CASCADE_CANDIDATES = int(os.getenv("CASCADE_CANDIDATES", "200"))
+    
+    # Micro-batching of concurrent searches (one encode + one matrix product per batch)
+    SEARCH_BATCH_SIZE = int(os.getenv("SEARCH_BATCH_SIZE", "32"))
+    SEARCH_BATCH_WAIT_MS = float(os.getenv("SEARCH_BATCH_WAIT_MS", "5"))
+    
     # Processing
     BATCH_SIZE = int(os.getenv("BATCH_SIZE", "32"))
     MAX_WORKERS = int(os.getenv("MAX_WORKERS", "4"))
     CACHE_EMBEDDINGS = os.getenv("CACHE_EMBEDDINGS", "true").lower() == "true"
     
+    # Query embedding cache (LRU keyed on model + normalized query; optional .npz persistence)
+    QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "2048"))
+    QUERY_CACHE_FILE = os.getenv("QUERY_CACHE_FILE", "")
+    
+    # Search response cache (keyed on query, parameters and data version)
+    RESPONSE_CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "1024"))
+    RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "3600"))
+    
     # Application
     APP_PORT = int(os.getenv("APP_PORT", "8501"))
     API_PORT = int(os.getenv("API_PORT", "8000"))
+    
+    # Local search service (src/service); when the URL is set, the app, MCP
+    # server and Q&A system query it instead of loading the model and index
+    SEARCH_SERVICE_URL = os.getenv("SEARCH_SERVICE_URL", "")
+    SEARCH_SERVICE_HOST = os.getenv("SEARCH_SERVICE_HOST", "127.0.0.1")
+    SEARCH_SERVICE_TIMEOUT = float(os.getenv("SEARCH_SERVICE_TIMEOUT", "30"))
+    SEARCH_SERVICE_EMBEDDINGS = os.getenv("SEARCH_SERVICE_EMBEDDINGS", str(EMBEDDINGS_DIR / "fixed_structured_embeddings.jsonl"))
     DEBUG = os.getenv("DEBUG", "true").lower() == "true"
     LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO")
 
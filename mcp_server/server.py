@@ -119,11 +119,71 @@ async def handle_list_tools() -> List[Tool]:
                         "type": "number",
                         "description": "Minimum similarity score (0.0-1.0, default: 0.3)",
                         "default": 0.3
+                    },
+                    "book_filter": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only search these books"
+                    },
+                    "testament_filter": {
+                        "type": "string",
+                        "enum": ["old", "new"],
+                        "description": "Only search this testament"
+                    },
+                    "chapter_filter": {
+                        "type": "array",
+                        "items": {"type": "integer"},
+                        "description": "Only search these chapters of the filtered books"
+                    },
+                    "search_mode": {
+                        "type": "string",
+                        "enum": ["dense", "hybrid", "cascade"],
+                        "description": "dense: embedding similarity; hybrid: embeddings fused with BM25 keyword matches (better for names and short words); cascade: fast small-model candidates re-ranked with the full model"
+                    },
+                    "context_verses": {
+                        "type": "integer",
+                        "description": "Neighboring verses to include around each result (default: 0)",
+                        "default": 0
                     }
                 },
                 "required": ["query"]
             }
         ),
+        Tool(
+            name="search_bible_batch",
+            description="Search the Amharic Bible for several queries at once (encoded and scored as one batch)",
+            inputSchema={
+                "type": "object",
+                "properties": {
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Search queries in Amharic or English"
+                    },
+                    "max_results": {
+                        "type": "integer",
+                        "description": "Maximum number of results per query (default: 5)",
+                        "default": 5
+                    },
+                    "min_similarity": {
+                        "type": "number",
+                        "description": "Minimum similarity score (0.0-1.0, default: 0.3)",
+                        "default": 0.3
+                    },
+                    "book_filter": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Only search these books"
+                    },
+                    "testament_filter": {
+                        "type": "string",
+                        "enum": ["old", "new"],
+                        "description": "Only search this testament"
+                    }
+                },
+                "required": ["queries"]
+            }
+        ),
         Tool(
             name="explain_catholic_teaching",
             description="Explain Catholic doctrine and teachings on specific topics",
@@ -226,7 +286,31 @@ async def handle_call_tool(name: str, arguments: dict) -> List[types.TextContent
             max_results = arguments.get("max_results", 5)
             min_similarity = arguments.get("min_similarity", 0.3)
             
-            results = await bible_search_tool.search(query, max_results, min_similarity)
+            results = await bible_search_tool.search(
+                query, max_results, min_similarity,
+                book_filter=arguments.get("book_filter"),
+                testament_filter=arguments.get("testament_filter"),
+                chapter_filter=arguments.get("chapter_filter"),
+                mode=arguments.get("search_mode"),
+                context_verses=arguments.get("context_verses", 0)
+            )
+            
+            return [TextContent(
+                type="text",
+                text=json.dumps(results, ensure_ascii=False, indent=2)
+            )]
+        
+        elif name == "search_bible_batch":
+            if not bible_search_tool:
+                bible_search_tool = BibleSearchTool()
+            
+            results = await bible_search_tool.search_many(
+                arguments["queries"],
+                arguments.get("max_results", 5),
+                arguments.get("min_similarity", 0.3),
+                book_filter=arguments.get("book_filter"),
+                testament_filter=arguments.get("testament_filter")
+            )
             
             return [TextContent(
                 type="text",
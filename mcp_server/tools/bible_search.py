@@ -3,70 +3,123 @@ Bible Search Tool for Catholic Teaching Assistant MCP Server
 Uses existing Amharic Bible embeddings for semantic search
 """
 
-import json
+import asyncio
+import threading
 import numpy as np
+from functools import partial
 from pathlib import Path
-from sentence_transformers import SentenceTransformer
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, NamedTuple
 import sys
 
 sys.path.append(str(Path(__file__).parent.parent.parent))
 from config.settings import settings, EMBEDDINGS_DIR
+from src.retrieval.vector_index import load_bible_index
+from src.retrieval.searchers import create_searcher, top_k_many, rows_view
+from src.retrieval.query_encoder import get_query_encoder
+from src.retrieval.response_cache import get_response_cache
+from src.retrieval.fusion import hybrid_top_k
+from src.retrieval.cascade_index import load_or_build_cascade
+from src.retrieval.micro_batcher import MicroBatcher
+from src.service.client import get_search_client
+
+SEARCH_MODES = ("dense", "hybrid", "cascade")
+
+
+class SearchRequest(NamedTuple):
+    """One search() call queued for the micro-batcher"""
+    query: str
+    max_results: int
+    min_similarity: float
+    book_filter: Optional[Tuple[str, ...]]
+    testament_filter: Optional[str]
+    chapter_filter: Optional[Tuple[int, ...]]
+    mode: str
+    context_verses: int
+    
+    @property
+    def scoring_key(self) -> Tuple:
+        """Requests with equal keys share one top_k_many call"""
+        return (self.max_results, self.min_similarity, self.book_filter, self.testament_filter, self.chapter_filter)
 
 class BibleSearchTool:
     """MCP tool for searching the Amharic Bible using embeddings"""
     
-    def __init__(self):
-        self.model = None
-        self.embeddings_data = None
-        self._load_embeddings()
-    
-    def _load_embeddings(self):
-        """Load the structured Bible embeddings"""
+    def __init__(self, index_type: Optional[str] = None):
+        """
+        Args:
+            index_type: Search backend (see searchers.SEARCH_INDEX_TYPES); defaults to settings.SEARCH_INDEX_TYPE
+        """
+        self.encoder = None
+        self.index = None
+        self.searcher = None
+        self.rows = None
+        self.index_type = index_type or settings.SEARCH_INDEX_TYPE
+        # Prefer the memory-mapped binary artifact, fall back to the JSONL file
+        self.embeddings_file = "data/embeddings/fixed_structured_embeddings.jsonl"
+        # Held while a search uses the index, so a reload never swaps it mid-search
+        self._index_lock = threading.RLock()
         
-        # Try to load the structured embeddings
-        embeddings_file = Path("data/embeddings/fixed_structured_embeddings.jsonl")
+        # Concurrent search() calls are batched and run off the event loop
+        self.batcher = MicroBatcher(self._search_batch, settings.SEARCH_BATCH_SIZE, settings.SEARCH_BATCH_WAIT_MS)
         
-        if embeddings_file.exists():
-            print(f"Loading Bible embeddings from: {embeddings_file}")
-            
-            self.embeddings_data = {"chunks": []}
-            with open(embeddings_file, 'r', encoding='utf-8') as f:
-                for line in f:
-                    if line.strip():
-                        self.embeddings_data["chunks"].append(json.loads(line))
-            
-            print(f"Loaded {len(self.embeddings_data['chunks'])} Bible verses")
+        # With a search service configured, the model and index stay in the service process
+        self.client = get_search_client()
+        if self.client is not None:
+            print(f"Using Bible search service: {self.client.base_url}")
         else:
-            print(f"❌ Bible embeddings not found: {embeddings_file}")
-            self.embeddings_data = None
+            self._load_embeddings()
     
-    def _get_model(self):
-        """Lazy load the embedding model"""
-        if self.model is None:
-            self.model = SentenceTransformer(settings.EMBEDDING_MODEL)
-        return self.model
-    
-    def _calculate_similarity(self, query_embedding: np.ndarray, verse_embedding: List[float]) -> float:
-        """Calculate cosine similarity between query and verse"""
+    def _load_embeddings(self):
+        """Load the structured Bible embeddings into the shared vector index"""
         
-        verse_array = np.array(verse_embedding)
+        self._refresh_index()
         
-        dot_product = np.dot(query_embedding, verse_array)
-        norm_query = np.linalg.norm(query_embedding)
-        norm_verse = np.linalg.norm(verse_array)
+        if self.index is not None:
+            print(f"Loaded {len(self.index)} Bible verses from: {self.embeddings_file} ({self.index_type} search)")
+        else:
+            print(f"❌ Bible embeddings not found: {self.embeddings_file}")
+    
+    def _refresh_index(self) -> None:
+        """Pick up a rebuilt index (load_bible_index reloads rewritten files), with a new searcher"""
         
-        if norm_query == 0 or norm_verse == 0:
-            return 0.0
+        index = load_bible_index(self.embeddings_file) or self.index
+        if index is self.index:
+            return
         
-        return float(dot_product / (norm_query * norm_verse))
+        searcher = create_searcher(index, self.index_type)
+        with self._index_lock:
+            self.index = index
+            self.searcher = searcher
+            # Records, filters and verses of the searcher's row ids
+            self.rows = rows_view(index, searcher)
+    
+    def _get_encoder(self):
+        """Shared query encoder (model loaded lazily, embeddings cached)"""
+        if self.encoder is None:
+            self.encoder = get_query_encoder(settings.EMBEDDING_MODEL)
+        return self.encoder
+    
+    def _cascade(self):
+        """Cascade with a settings.CASCADE_MODEL first stage over the index (first-stage vectors must be built beforehand)"""
+        return load_or_build_cascade(self.index, settings.CASCADE_MODEL, settings.CASCADE_CANDIDATES, build=False)
+    
+    def _filter_rows(self,
+                     book_filter: Optional[List[str]] = None,
+                     testament_filter: Optional[str] = None,
+                     chapter_filter: Optional[List[int]] = None,
+                     rows=None) -> Optional[np.ndarray]:
+        """Row ids matching the filters, from the precomputed row sets of `rows` (default self.rows; None = all rows)"""
+        return (self.rows if rows is None else rows).filters.select(book_filter, testament_filter, chapter_filter)
     
     async def search(self, 
                     query: str, 
                     max_results: int = 5,
                     min_similarity: float = 0.3,
                     book_filter: Optional[List[str]] = None,
-                    testament_filter: Optional[str] = None) -> Dict[str, Any]:
+                    testament_filter: Optional[str] = None,
+                    chapter_filter: Optional[List[int]] = None,
+                    mode: Optional[str] = None,
+                    context_verses: int = 0) -> Dict[str, Any]:
         """
         Search the Bible for passages related to the query
         
@@ -76,12 +129,19 @@ class BibleSearchTool:
             min_similarity: Minimum similarity score (0.0-1.0)
             book_filter: Optional list of book names to filter by
             testament_filter: Optional testament filter ('old' or 'new')
+            chapter_filter: Optional chapter numbers within the filtered books
+            mode: "dense", "hybrid" (dense and BM25 rankings fused with RRF) or
+                "cascade" (small-model candidates re-scored with the index model);
+                defaults to settings.SEARCH_MODE
+            context_verses: Number of neighboring verses attached to each result on each side
         
         Returns:
             Dictionary with search results and metadata
         """
         
-        if not self.embeddings_data:
+        if self.client is None:
+            self._refresh_index()
+        if not self.index and self.client is None:
             return {
                 "error": "Bible embeddings not available",
                 "results": [],
@@ -89,66 +149,80 @@ class BibleSearchTool:
                 "success": False
             }
         
+        mode = (mode or settings.SEARCH_MODE).lower()
+        if mode not in SEARCH_MODES:
+            return {
+                "error": f"Unknown search mode: {mode} (expected one of {', '.join(SEARCH_MODES)})",
+                "results": [],
+                "query": query,
+                "success": False
+            }
+        
+        # Repeated searches are answered from the response cache (keyed on the index version);
+        # the search service does not expose its version up front, so remote searches bypass it
+        cache = get_response_cache() if self.index is not None else None
+        if cache is not None:
+            cache_key = cache.make_key(
+                "bible_search", self.rows.cache_version, query,
+                max_results=max_results,
+                min_similarity=min_similarity,
+                book_filter=sorted(book_filter) if book_filter else None,
+                testament_filter=testament_filter,
+                chapter_filter=sorted(chapter_filter) if chapter_filter else None,
+                index_type=self.index_type,
+                mode=mode,
+                context_verses=context_verses
+            )
+            cached = cache.get(cache_key)
+            if cached is not None:
+                cached["query"] = query
+                return cached
+        
         try:
-            # Generate query embedding
-            model = self._get_model()
-            query_embedding = model.encode([query])[0]
-            
-            # Search through all verses
-            results = []
-            chunks = self.embeddings_data["chunks"]
-            
-            for chunk in chunks:
-                # Apply filters if specified
-                if book_filter and chunk.get("book") not in book_filter:
-                    continue
-                
-                if testament_filter and chunk.get("testament") != testament_filter:
-                    continue
-                
-                # Calculate similarity
-                if "embedding" in chunk:
-                    similarity = self._calculate_similarity(query_embedding, chunk["embedding"])
-                    
-                    if similarity >= min_similarity:
-                        results.append({
-                            "similarity": similarity,
-                            "book": chunk.get("book", "Unknown"),
-                            "chapter": chunk.get("chapter", 0),
-                            "verse_number": chunk.get("verse_number", 0),
-                            "verse_range": chunk.get("verse_range", [0, 0]),
-                            "text": chunk.get("text", ""),
-                            "testament": chunk.get("testament", "unknown"),
-                            "word_count": chunk.get("word_count", 0),
-                            "passage_id": chunk.get("id", 0)
-                        })
-            
-            # Sort by similarity and limit results
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-            results = results[:max_results]
+            search_report = None
+            if self.client is not None:
+                hits = await asyncio.get_running_loop().run_in_executor(None, partial(
+                    self.client.search, query, max_results,
+                    min_similarity=min_similarity,
+                    book_filter=book_filter,
+                    testament_filter=testament_filter,
+                    chapter_filter=chapter_filter,
+                    mode=mode,
+                    context_verses=context_verses
+                ))
+                results = self._format_hits(hits)
+            else:
+                results, search_report = await self.batcher.submit(SearchRequest(
+                    query, max_results, min_similarity,
+                    tuple(book_filter) if book_filter else None,
+                    testament_filter,
+                    tuple(chapter_filter) if chapter_filter else None,
+                    mode, context_verses
+                ))
             
-            # Calculate statistics
-            unique_books = len(set(r["book"] for r in results))
-            testaments = set(r["testament"] for r in results)
+            statistics = self._statistics(results)
+            if search_report is not None:
+                statistics.update(search_report)
             
-            return {
+            response = {
                 "query": query,
                 "results": results,
-                "statistics": {
-                    "total_matches": len(results),
-                    "unique_books": unique_books,
-                    "testaments_found": list(testaments),
-                    "avg_similarity": np.mean([r["similarity"] for r in results]) if results else 0,
-                    "best_similarity": max([r["similarity"] for r in results]) if results else 0
-                },
+                "statistics": statistics,
                 "search_params": {
                     "max_results": max_results,
                     "min_similarity": min_similarity,
                     "book_filter": book_filter,
-                    "testament_filter": testament_filter
+                    "testament_filter": testament_filter,
+                    "chapter_filter": chapter_filter,
+                    "index_type": self.index_type,
+                    "mode": mode,
+                    "context_verses": context_verses
                 },
                 "success": True
             }
+            if cache is not None:
+                cache.put(cache_key, response)
+            return response
         
         except Exception as e:
             return {
@@ -158,31 +232,377 @@ class BibleSearchTool:
                 "success": False
             }
     
-    async def get_verse_context(self, book: str, chapter: int, verse: int) -> Dict[str, Any]:
-        """Get contextual information about a specific verse"""
+    def _search_batch(self, requests: List[SearchRequest]) -> List[Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]]:
+        """
+        Run a micro-batch of searches on the in-process index (called in the batcher's worker thread)
+        
+        All queries are embedded in one encode call; dense requests with the same
+        parameters are scored together with one top_k_many call, and cascade requests
+        with the same parameters share one first-stage encode and scan. Hybrid requests
+        and dense requests that are alone in their group are searched one by one.
+        
+        A failing group or request gets its exception in its own position, so the
+        batcher fails only those callers; the rest of the batch is answered.
+        
+        Returns:
+            (results, extra statistics such as the quantization or cascade report, or None),
+            or the exception raised, per request
+        """
+        self._refresh_index()
+        with self._index_lock:
+            return self._run_batch(requests)
+    
+    def _run_batch(self, requests: List[SearchRequest]) -> List[Any]:
+        """Body of _search_batch, run with the index lock held"""
+        outcomes: List[Any] = [None] * len(requests)
+        
+        # Generate query embeddings (served from the query cache when seen before)
+        try:
+            query_embeddings = self._get_encoder().encode([request.query for request in requests])
+        except Exception:
+            if len(requests) == 1:
+                raise
+            # Find the query that cannot be embedded; the others are encoded one by one
+            query_embeddings = [None] * len(requests)
+            for position, request in enumerate(requests):
+                try:
+                    query_embeddings[position] = self._get_encoder().encode_one(request.query)
+                except Exception as query_error:
+                    outcomes[position] = query_error
+            encoded = [embedding for embedding in query_embeddings if embedding is not None]
+            if not encoded:
+                return outcomes
+            dimension = len(encoded[0])
+            query_embeddings = np.stack([
+                embedding if embedding is not None else np.zeros(dimension, dtype=np.float32)
+                for embedding in query_embeddings
+            ])
+        
+        groups: Dict[Tuple, List[int]] = {}
+        for position, request in enumerate(requests):
+            if request.mode in ("dense", "cascade") and outcomes[position] is None:
+                groups.setdefault((request.mode, request.scoring_key), []).append(position)
+        
+        for (mode, _), positions in groups.items():
+            if mode == "dense" and len(positions) < 2:
+                continue
+            try:
+                first = requests[positions[0]]
+                # The cascade answers in the base index's rows, the searcher in self.rows
+                rows = self.index if mode == "cascade" else self.rows
+                mask = self._filter_rows(first.book_filter, first.testament_filter, first.chapter_filter, rows)
+                report = None
+                if mode == "cascade":
+                    all_matches, cascade_report = self._cascade().top_k_many_with_report(
+                        [requests[position].query for position in positions], query_embeddings[positions],
+                        first.max_results, first.min_similarity, mask)
+                    report = {"cascade": cascade_report}
+                else:
+                    all_matches = top_k_many(self.searcher, query_embeddings[positions], first.max_results, first.min_similarity, mask)
+                for position, matches in zip(positions, all_matches):
+                    outcomes[position] = (self._results(matches, None, requests[position].context_verses, rows), report)
+            except Exception as e:
+                for position in positions:
+                    outcomes[position] = e
         
-        if not self.embeddings_data:
+        for position, request in enumerate(requests):
+            if outcomes[position] is None:
+                try:
+                    outcomes[position] = self._search_one(request, query_embeddings[position])
+                except Exception as e:
+                    outcomes[position] = e
+        
+        return outcomes
+    
+    def _search_one(self, request: SearchRequest, query_embedding: np.ndarray) -> Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Search one query on the in-process index; returns the results and extra statistics (if any)"""
+        
+        # Filters select eligible rows up front; only those rows are scored
+        mask = self._filter_rows(request.book_filter, request.testament_filter, request.chapter_filter)
+        report = None
+        fusion_scores = None
+        if request.mode == "hybrid":
+            matches, fusion_scores = self._hybrid_matches(
+                request.query, query_embedding, request.max_results, request.min_similarity, mask)
+        elif hasattr(self.searcher, "top_k_with_report"):
+            matches, quantization_report = self.searcher.top_k_with_report(
+                query_embedding, request.max_results, request.min_similarity, mask)
+            report = {"quantization": quantization_report}
+        else:
+            matches = self.searcher.top_k(query_embedding, request.max_results, request.min_similarity, mask)
+        
+        return self._results(matches, fusion_scores, request.context_verses), report
+    
+    def _results(self, matches: List, fusion_scores: Optional[List[float]], context_verses: int, rows=None) -> List[Dict[str, Any]]:
+        """Result dicts with fusion scores and neighboring verses attached (rows as in _format_matches)"""
+        
+        results = self._format_matches(matches, rows)
+        if fusion_scores is not None:
+            for result, fusion_score in zip(results, fusion_scores):
+                result["fusion_score"] = fusion_score
+        if context_verses > 0:
+            self._attach_context(results, matches, context_verses, rows)
+        return results
+    
+    async def search_many(self,
+                          queries: List[str],
+                          max_results: int = 5,
+                          min_similarity: float = 0.3,
+                          book_filter: Optional[List[str]] = None,
+                          testament_filter: Optional[str] = None,
+                          chapter_filter: Optional[List[int]] = None) -> Dict[str, Any]:
+        """
+        Search several queries at once
+        
+        Uncached queries are encoded in one model.encode batch and all are scored together
+        (one matrix-matrix product on the exact index), so fan-out costs about
+        one query's worth of work.
+        
+        Returns:
+            Dictionary with one {query, results, statistics} entry per query
+        """
+        
+        if not self.index and self.client is None:
+            return {
+                "error": "Bible embeddings not available",
+                "results": [],
+                "queries": queries,
+                "success": False
+            }
+        
+        try:
+            # Already one batch: run it in a worker thread so the event loop stays free
+            loop = asyncio.get_running_loop()
+            if self.client is not None:
+                all_hits = await loop.run_in_executor(None, partial(
+                    self.client.search_many, list(queries), max_results,
+                    min_similarity=min_similarity,
+                    book_filter=book_filter,
+                    testament_filter=testament_filter,
+                    chapter_filter=chapter_filter
+                ))
+                all_results = [self._format_hits(hits) for hits in all_hits]
+            else:
+                all_results = await loop.run_in_executor(None, partial(
+                    self._search_many_local, queries, max_results, min_similarity,
+                    book_filter, testament_filter, chapter_filter
+                ))
+            
+            per_query = []
+            for query, results in zip(queries, all_results):
+                per_query.append({
+                    "query": query,
+                    "results": results,
+                    "statistics": self._statistics(results)
+                })
+            
+            return {
+                "queries": list(queries),
+                "results": per_query,
+                "search_params": {
+                    "max_results": max_results,
+                    "min_similarity": min_similarity,
+                    "book_filter": book_filter,
+                    "testament_filter": testament_filter,
+                    "chapter_filter": chapter_filter,
+                    "index_type": self.index_type
+                },
+                "success": True
+            }
+        
+        except Exception as e:
+            return {
+                "error": str(e),
+                "results": [],
+                "queries": queries,
+                "success": False
+            }
+    
+    def _search_many_local(self,
+                           queries: List[str],
+                           max_results: int,
+                           min_similarity: float,
+                           book_filter: Optional[List[str]],
+                           testament_filter: Optional[str],
+                           chapter_filter: Optional[List[int]]) -> List[List[Dict[str, Any]]]:
+        """One encode call and one top_k_many call for all queries"""
+        
+        query_embeddings = self._get_encoder().encode(list(queries))
+        
+        self._refresh_index()
+        with self._index_lock:
+            mask = self._filter_rows(book_filter, testament_filter, chapter_filter)
+            all_matches = top_k_many(self.searcher, query_embeddings, max_results, min_similarity, mask)
+            return [self._format_matches(matches) for matches in all_matches]
+    
+    def _hybrid_matches(self,
+                        query: str,
+                        query_embedding: np.ndarray,
+                        max_results: int,
+                        min_similarity: float,
+                        mask) -> Tuple[List[Tuple[int, float]], List[float]]:
+        """Dense and BM25 candidates fused with reciprocal-rank fusion (see fusion.hybrid_top_k)"""
+        
+        return hybrid_top_k(
+            self.rows, self.searcher, query, query_embedding, max_results, min_similarity, mask,
+            candidates=settings.HYBRID_CANDIDATES,
+            rrf_k=settings.RRF_K
+        )
+    
+    def _format_matches(self, matches: List, rows=None) -> List[Dict[str, Any]]:
+        """Result dicts for (row_id, similarity) matches, read from the records of `rows` (default self.rows)"""
+        records = (self.rows if rows is None else rows).records
+        return [self._format_record(records[row_id], similarity) for row_id, similarity in matches]
+    
+    def _format_hits(self, hits: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Result dicts for hits returned by the search service"""
+        
+        results = []
+        for hit in hits:
+            result = self._format_record(hit["record"], hit["similarity"])
+            if "fusion_score" in hit:
+                result["fusion_score"] = hit["fusion_score"]
+            if "context" in hit:
+                result["context"] = [self._context_entry(record) for record in hit["context"]]
+            results.append(result)
+        return results
+    
+    @staticmethod
+    def _format_record(chunk: Dict[str, Any], similarity: float) -> Dict[str, Any]:
+        """Result dict of one verse record"""
+        
+        return {
+            "similarity": similarity,
+            "book": chunk.get("book", "Unknown"),
+            "chapter": chunk.get("chapter", 0),
+            "verse_number": chunk.get("verse_number", 0),
+            "verse_range": chunk.get("verse_range", [0, 0]),
+            "text": chunk.get("text", ""),
+            "testament": chunk.get("testament", "unknown"),
+            "word_count": chunk.get("word_count", 0),
+            "passage_id": chunk.get("id", 0)
+        }
+    
+    @staticmethod
+    def _context_entry(record: Dict[str, Any]) -> Dict[str, Any]:
+        """Compact form of a neighboring verse"""
+        
+        return {
+            "verse_number": record.get("verse_number", 0),
+            "verse_range": record.get("verse_range", [0, 0]),
+            "text": record.get("text", "")
+        }
+    
+    def _attach_context(self, results: List[Dict[str, Any]], matches: List, context_verses: int, rows=None) -> None:
+        """Add the neighboring verses of each match (looked up in the verse index of `rows`, default self.rows)"""
+        
+        rows = self.rows if rows is None else rows
+        for result, (row_id, _) in zip(results, matches):
+            result["context"] = [
+                self._context_entry(rows.records[neighbor])
+                for neighbor in rows.verses.neighbors(row_id, context_verses, context_verses)
+                if neighbor != row_id
+            ]
+    
+    @staticmethod
+    def _statistics(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Summary statistics of a result list"""
+        
+        return {
+            "total_matches": len(results),
+            "unique_books": len(set(r["book"] for r in results)),
+            "testaments_found": list(set(r["testament"] for r in results)),
+            "avg_similarity": np.mean([r["similarity"] for r in results]) if results else 0,
+            "best_similarity": max([r["similarity"] for r in results]) if results else 0
+        }
+    
+    async def get_verse_context(self, book: str, chapter: int, verse: int, context_verses: int = 0) -> Dict[str, Any]:
+        """
+        Get contextual information about a specific verse
+        
+        Args:
+            book, chapter, verse: Verse reference
+            context_verses: Number of surrounding verses to include on each side
+        """
+        
+        if self.client is not None:
+            found = await asyncio.get_running_loop().run_in_executor(
+                None, self.client.verse, book, chapter, verse, context_verses
+            )
+            if found is None:
+                return {"error": f"Verse not found: {book} {chapter}:{verse}"}
+            response = {
+                "verse": found["verse"],
+                "book_info": {"name": book, "testament": found["verse"].get("testament", "unknown")},
+                "chapter_info": {"number": chapter, "verse_count": found["verse_count"]}
+            }
+            if context_verses > 0:
+                response["context"] = found["context"]
+            return response
+        
+        self._refresh_index()
+        index = self.index
+        if not index:
             return {"error": "Bible data not available"}
         
-        # Find the specific verse
-        for chunk in self.embeddings_data["chunks"]:
-            if (chunk.get("book") == book and 
-                chunk.get("chapter") == chapter and
-                chunk.get("verse_number") == verse):
-                
-                return {
-                    "verse": chunk,
-                    "book_info": {
-                        "name": book,
-                        "testament": chunk.get("testament", "unknown")
-                    },
-                    "chapter_info": {
-                        "number": chapter,
-                        "verse_count": "unknown"  # Could calculate if needed
-                    }
-                }
-        
-        return {"error": f"Verse not found: {book} {chapter}:{verse}"}
+        # Direct lookup in the verse reference index (no scan over the records)
+        row_id = index.verses.lookup(book, chapter, verse)
+        if row_id is None:
+            return {"error": f"Verse not found: {book} {chapter}:{verse}"}
+        
+        chunk = index.records[row_id]
+        response = {
+            "verse": chunk,
+            "book_info": {
+                "name": book,
+                "testament": chunk.get("testament", "unknown")
+            },
+            "chapter_info": {
+                "number": chapter,
+                "verse_count": index.verses.verse_count(book, chapter)
+            }
+        }
+        
+        if context_verses > 0:
+            response["context"] = [
+                index.records[neighbor]
+                for neighbor in index.verses.neighbors(row_id, context_verses, context_verses)
+                if neighbor != row_id
+            ]
+        
+        return response
+    
+    async def get_verse_range(self, book: str, chapter: int, start_verse: int = 1, end_verse: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Get all verses of "book chapter:start-end" (the whole chapter when end is omitted)
+        
+        Returns:
+            Dictionary with the verses in order and their joined text
+        """
+        
+        if self.client is not None:
+            reference = f"{book} {chapter}:{start_verse}-{end_verse}" if end_verse is not None else f"{book} {chapter}"
+            passage = await asyncio.get_running_loop().run_in_executor(None, self.client.passage, reference)
+            # The service resolves whole chapters only from verse 1
+            records = [record for record in passage["verses"] if record.get("verse_number", 0) >= start_verse] if passage else []
+        else:
+            self._refresh_index()
+            index = self.index
+            if not index:
+                return {"error": "Bible data not available", "success": False}
+            rows = index.verses.verse_range(book, chapter, start_verse, end_verse)
+            records = index.records[rows] if isinstance(rows, slice) else [index.records[row_id] for row_id in rows]
+        
+        if not records:
+            end_label = f"-{end_verse}" if end_verse is not None else ""
+            return {"error": f"Verses not found: {book} {chapter}:{start_verse}{end_label}", "success": False}
+        
+        return {
+            "reference": {"book": book, "chapter": chapter, "start_verse": start_verse, "end_verse": end_verse},
+            "verses": records,
+            "text": " ".join(record.get("text", "") for record in records),
+            "success": True
+        }
     
     async def search_by_theme(self, theme: str, testament: Optional[str] = None) -> Dict[str, Any]:
         """Search for verses by thematic keywords"""
@@ -202,16 +622,17 @@ class BibleSearchTool:
         queries = theme_queries.get(theme.lower(), [theme])
         all_results = []
         
-        for query in queries:
-            search_result = await self.search(
-                query=query,
-                max_results=3,
-                min_similarity=0.4,
-                testament_filter=testament
-            )
-            
-            if search_result["success"]:
-                all_results.extend(search_result["results"])
+        # All synonyms are encoded and scored in one batch
+        search_result = await self.search_many(
+            queries=queries,
+            max_results=3,
+            min_similarity=0.4,
+            testament_filter=testament
+        )
+        
+        if search_result["success"]:
+            for query_result in search_result["results"]:
+                all_results.extend(query_result["results"])
         
         # Remove duplicates and sort by similarity
         seen_ids = set()
@@ -4,7 +4,17 @@ Provides Catholic doctrine explanations and saint information
 """
 
 from typing import Dict, Any, Optional
+from pathlib import Path
+from functools import partial
+import asyncio
 import json
+import sys
+
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.settings import settings
+from src.retrieval.vector_index import load_bible_index
+from src.retrieval.query_encoder import get_query_encoder
+from src.service.client import get_search_client
 
 class CatechismTool:
     """Tool for accessing Catholic Catechism and doctrinal information"""
@@ -12,6 +22,22 @@ class CatechismTool:
     def __init__(self):
         self.catechism_data = self._load_catechism_basics()
         self.saints_data = self._load_saints_basics()
+        self.index = None
+        self.encoder = None
+        # With SEARCH_SERVICE_URL set, searches go to the service and no index or model is loaded here
+        self.client = get_search_client()
+    
+    def _get_index(self):
+        """Lazy load the shared Bible vector index"""
+        if self.index is None:
+            self.index = load_bible_index("data/embeddings/fixed_structured_embeddings.jsonl")
+        return self.index
+    
+    def _get_encoder(self):
+        """Shared query encoder (model loaded lazily, embeddings cached)"""
+        if self.encoder is None:
+            self.encoder = get_query_encoder(settings.EMBEDDING_MODEL)
+        return self.encoder
     
     def _load_catechism_basics(self) -> Dict[str, str]:
         """Load basic Catholic teachings (can be expanded with real CCC data)"""
@@ -65,7 +91,7 @@ class CatechismTool:
     async def search(self, query: str, max_results: int = 5, min_similarity: float = 0.3) -> Dict[str, Any]:
         """Search Bible using semantic similarity"""
         
-        if not self.embeddings_data:
+        if self.client is None and not self._get_index():
             return {
                 "error": "Bible embeddings not loaded",
                 "results": [],
@@ -73,30 +99,33 @@ class CatechismTool:
             }
         
         try:
-            # Generate query embedding
-            model = self._get_model()
-            query_embedding = model.encode([query])[0]
+            if self.client is not None:
+                # The blocking HTTP call runs off the event loop
+                service_hits = await asyncio.get_running_loop().run_in_executor(None, partial(
+                    self.client.search, query, max_results, min_similarity=min_similarity
+                ))
+                hits = [(hit['record'], hit['similarity']) for hit in service_hits]
+            else:
+                # Generate query embedding (served from the query cache when seen before)
+                query_embedding = self._get_encoder().encode_one(query)
+                
+                # Score all chunks with one matrix-vector product
+                hits = [
+                    (self.index.records[row_id], similarity)
+                    for row_id, similarity in self.index.top_k(query_embedding, max_results, min_similarity)
+                ]
             
-            # Search all chunks
             results = []
-            for chunk in self.embeddings_data["chunks"]:
-                if "embedding" in chunk:
-                    similarity = self._calculate_similarity(query_embedding, chunk["embedding"])
-                    
-                    if similarity >= min_similarity:
-                        results.append({
-                            "similarity": round(similarity, 4),
-                            "book": chunk.get("book", "Unknown"),
-                            "chapter": chunk.get("chapter", 0),
-                            "verse": chunk.get("verse_number", 0),
-                            "text": chunk.get("text", ""),
-                            "testament": chunk.get("testament", "unknown"),
-                            "reference": f"{chunk.get('book', 'Unknown')} {chunk.get('chapter', 0)}:{chunk.get('verse_number', 0)}"
-                        })
-            
-            # Sort and limit
-            results.sort(key=lambda x: x["similarity"], reverse=True)
-            results = results[:max_results]
+            for chunk, similarity in hits:
+                results.append({
+                    "similarity": round(similarity, 4),
+                    "book": chunk.get("book", "Unknown"),
+                    "chapter": chunk.get("chapter", 0),
+                    "verse": chunk.get("verse_number", 0),
+                    "text": chunk.get("text", ""),
+                    "testament": chunk.get("testament", "unknown"),
+                    "reference": f"{chunk.get('book', 'Unknown')} {chunk.get('chapter', 0)}:{chunk.get('verse_number', 0)}"
+                })
             
             return {
                 "query": query,
@@ -20,12 +20,22 @@ from .calendar_calculator import LiturgicalCalendarManager
 # Import Bible search if available
 try:
     sys.path.append(os.path.join(os.path.dirname(__file__), '../../'))
-    from src.vector_db.chroma_manager import ChromaManager
-    from src.qa.bible_qa_system import BibleQASystem
+    from config.settings import settings, EMBEDDINGS_DIR
+    from src.retrieval.vector_index import load_bible_index
+    from src.retrieval.reference_resolver import ReferenceResolver
+    from src.retrieval.query_encoder import get_query_encoder
+    from src.retrieval.response_cache import get_response_cache
     HAS_BIBLE_SEARCH = True
 except ImportError:
     HAS_BIBLE_SEARCH = False
 
+# The search service client is optional: without it the index is loaded in-process
+try:
+    from src.service.client import get_search_client
+except ImportError:
+    def get_search_client():
+        return None
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
@@ -65,14 +75,29 @@ class AmharicLiturgicalSystem:
     Integrated liturgical system combining Ethiopian calendar with Amharic Bible embeddings
     """
     
-    def __init__(self, use_embeddings: bool = True):
+    def __init__(self, use_embeddings: bool = True, embeddings_file: Optional[str] = None):
         self.calendar_manager = LiturgicalCalendarManager()
         self.use_embeddings = use_embeddings and HAS_BIBLE_SEARCH
+        self.index = None
+        self.resolver = None
+        self.embeddings_file = None
+        self.client = None
         
-        # Initialize Bible search system if available
+        # Initialize the verse store if available (readings are looked up by reference, not searched)
         if self.use_embeddings:
+            # With SEARCH_SERVICE_URL set, references and themes go to the search service
+            # and no index or model is loaded here
+            self.client = get_search_client()
+            if self.client is not None:
+                logger.info(f"✅ Using the Bible search service at {settings.SEARCH_SERVICE_URL}")
+        
+        if self.use_embeddings and self.client is None:
             try:
-                self.bible_qa = BibleQASystem()
+                self.embeddings_file = embeddings_file or str(EMBEDDINGS_DIR / "fixed_structured_embeddings.jsonl")
+                self.index = load_bible_index(self.embeddings_file)
+                if self.index is None:
+                    raise FileNotFoundError(self.embeddings_file)
+                self.resolver = ReferenceResolver(self.index)
                 logger.info("✅ Amharic Bible embeddings integrated")
             except Exception as e:
                 logger.warning(f"⚠️ Bible embeddings not available: {e}")
@@ -207,6 +232,14 @@ class AmharicLiturgicalSystem:
         
         return readings
     
+    def _refresh_index(self) -> None:
+        """Pick up a rebuilt index (load_bible_index reloads rewritten files), with a new resolver"""
+        
+        index = load_bible_index(self.embeddings_file) or self.index
+        if index is not self.index:
+            self.index = index
+            self.resolver = ReferenceResolver(index)
+    
     def _create_reading(self, reference: str, source: str) -> LiturgicalReading:
         """Create a reading with Amharic text if available"""
         
@@ -216,12 +249,19 @@ class AmharicLiturgicalSystem:
         
         if self.use_embeddings:
             try:
-                # Search for the biblical reference in Amharic Bible
-                search_result = self.bible_qa.search_verses(reference, max_results=1)
-                if search_result and len(search_result) > 0:
-                    amharic_text = search_result[0].get('content', '')
-                    confidence = search_result[0].get('score', 0.0)
-                    logger.info(f"✅ Found Amharic text for {reference} (confidence: {confidence:.2f})")
+                if self.client is not None:
+                    resolved = self.client.passage(reference)
+                else:
+                    # Resolve the reference directly against the verse index (exact text), through
+                    # the response cache keyed on the index version
+                    self._refresh_index()
+                    key = get_response_cache().make_key("liturgical_reading", self.index.cache_version, reference)
+                    resolved = get_response_cache().get_or_compute(key, lambda: self.resolver.resolve(reference))
+                if resolved:
+                    amharic_text = resolved['text']
+                    confidence = 1.0
+                else:
+                    logger.warning(f"⚠️ Reference not found in the Amharic Bible: {reference}")
             except Exception as e:
                 logger.warning(f"⚠️ Could not retrieve Amharic text for {reference}: {e}")
         
@@ -313,16 +353,32 @@ class AmharicLiturgicalSystem:
             return []
         
         try:
-            results = self.bible_qa.search_verses(theme, max_results=max_results)
+            if self.client is not None:
+                results = [
+                    {**hit['record'], 'similarity': hit['similarity']}
+                    for hit in self.client.search(theme, max_results, min_similarity=None)
+                ]
+            else:
+                self._refresh_index()
+                model_name = (self.index.manifest or {}).get('model', settings.EMBEDDING_MODEL)
+                
+                def search() -> List[Dict[str, Any]]:
+                    query_embedding = get_query_encoder(model_name).encode_one(theme)
+                    return self.index.search(query_embedding, max_results)
+                
+                # Repeated themes are served without touching the model or the matrix
+                key = get_response_cache().make_key("liturgical_theme", self.index.cache_version, theme, k=max_results)
+                results = get_response_cache().get_or_compute(key, search)
             
             readings = []
             for result in results:
+                reference = f"{result.get('book', 'Unknown')} {result.get('chapter', 0)}:{result.get('verse_number', 0)}"
                 reading = LiturgicalReading(
-                    reference=result.get('reference', 'Unknown'),
-                    amharic_text=result.get('content', ''),
-                    english_reference=result.get('reference', 'Unknown'),
+                    reference=reference,
+                    amharic_text=result.get('text', ''),
+                    english_reference=self._translate_reference_to_english(reference),
                     source="thematic_search",
-                    confidence=result.get('score', 0.0)
+                    confidence=result.get('similarity', 0.0)
                 )
                 readings.append(reading)
             
@@ -0,0 +1,175 @@
+"""
+Offset-based storage for chunk text
+Every sentence is written once into a normalized UTF-8 corpus blob; chunks
+keep (start, end) byte offsets into it, so overlapping chunks no longer copy
+their shared sentences and context windows are slices of the blob
+"""
+
+import mmap
+import unicodedata
+from collections import abc
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Sequence, Tuple, Iterator
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Corpus blob of a JSONL chunks file ("<stem>.corpus.txt" next to it)
+CORPUS_SUFFIX = ".corpus.txt"
+
+Span = Tuple[int, int]
+
+
+def corpus_path_for(jsonl_file: str) -> Path:
+    """Corpus blob that sits next to a JSONL chunks file"""
+    path = Path(jsonl_file)
+    return path.with_name(path.stem + CORPUS_SUFFIX)
+
+
+def normalize_text(text: str) -> str:
+    """NFC form with runs of whitespace collapsed to one space"""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+class CorpusTextWriter:
+    """
+    Builds a corpus blob
+
+    Sentences of a passage are joined by single spaces and passages end with
+    a newline, so ' '.join of consecutive sentences is exactly the blob
+    slice from the first sentence's start to the last sentence's end.
+    """
+
+    def __init__(self):
+        self._parts: List[bytes] = []
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _write(self, data: bytes) -> None:
+        self._parts.append(data)
+        self._size += len(data)
+
+    def append_sentences(self, sentences: Sequence[str]) -> List[Span]:
+        """
+        Write a passage's sentences once
+
+        Returns:
+            (start, end) byte offsets of every sentence
+        """
+        spans = []
+        for position, sentence in enumerate(sentences):
+            if position:
+                self._write(b' ')
+            data = normalize_text(sentence).encode('utf-8')
+            spans.append((self._size, self._size + len(data)))
+            self._write(data)
+        self._write(b'\n')
+        return spans
+
+    def to_bytes(self) -> bytes:
+        return b''.join(self._parts)
+
+    def save(self, path: str) -> Path:
+        """Write the blob to disk"""
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'wb') as f:
+            for part in self._parts:
+                f.write(part)
+        logger.info(f"Saved corpus text: {path} ({self._size:,} bytes)")
+        return path
+
+
+def sentence_range_span(spans: Sequence[Span], first: int, last: int) -> List[int]:
+    """Span covering sentences first..last (inclusive), in record form"""
+    return [spans[first][0], spans[last][1]]
+
+
+class CorpusText:
+    """Memory-mapped corpus blob; text is decoded only for the spans asked for"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Corpus blob written by CorpusTextWriter
+        """
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            # mmap cannot map an empty file
+            self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.path.stat().st_size else b''
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def text(self, span: Sequence[int]) -> str:
+        """Text of a (start, end) byte span"""
+        start, end = span
+        return self._data[start:end].decode('utf-8')
+
+    def before(self, span: Sequence[int], chars: int) -> str:
+        """Up to chars characters preceding a span (within its passage)"""
+        start = span[0]
+        # Ge'ez characters are 3 bytes in UTF-8; a cut through a character is dropped
+        window = self._data[max(0, start - 4 * chars):start].decode('utf-8', errors='ignore')
+        return window.rsplit('\n', 1)[-1][-chars:]
+
+    def after(self, span: Sequence[int], chars: int) -> str:
+        """Up to chars characters following a span (within its passage)"""
+        end = span[1]
+        window = self._data[end:end + 4 * chars].decode('utf-8', errors='ignore')
+        return window.split('\n', 1)[0][:chars]
+
+    def materialize(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy of a record with 'text' filled in from its 'text_span' (records with text are returned as-is)"""
+        if 'text' in record or 'text_span' not in record:
+            return record
+        return {**record, 'text': self.text(record['text_span'])}
+
+    def context_window(self, record: Dict[str, Any], chars: int = 100) -> Dict[str, Optional[str]]:
+        """Tail of the previous chunk and head of the next one, from the spans kept in 'context_window'"""
+        window = record.get('context_window') or {}
+        previous_span = window.get('previous_span')
+        next_span = window.get('next_span')
+        return {
+            'previous_text': self.text(previous_span)[-chars:] if previous_span else None,
+            'next_text': self.text(next_span)[:chars] if next_span else None
+        }
+
+    def close(self) -> None:
+        if isinstance(self._data, mmap.mmap):
+            self._data.close()
+
+
+class CorpusRecords(abc.Sequence):
+    """
+    Records whose text lives in a corpus blob
+
+    Behaves like the list of records; the 'text' of a record is decoded
+    when the record is accessed, so only returned results pay for it.
+    A slice returns a plain list of decoded records, as a list slice would.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], corpus: CorpusText):
+        self.records = records
+        self.corpus = corpus
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    def __getitem__(self, item):
+        if isinstance(item, slice):
+            return [self.corpus.materialize(record) for record in self.records[item]]
+        return self.corpus.materialize(self.records[item])
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for record in self.records:
+            yield self.corpus.materialize(record)
+
+
+def with_corpus(records: List[Dict[str, Any]], corpus_file: Optional[Path]):
+    """Wrap records in CorpusRecords when they come with a corpus blob"""
+    if corpus_file is None or not Path(corpus_file).exists():
+        return records
+    return CorpusRecords(records, CorpusText(str(corpus_file)))
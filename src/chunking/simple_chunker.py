@@ -5,7 +5,10 @@ Simple but effective chunking for Amharic Bible text
 import re
 import json
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Optional
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.chunking.corpus_text import CorpusTextWriter, CorpusText, corpus_path_for, sentence_range_span
 import logging
 
 logger = logging.getLogger(__name__)
@@ -38,10 +41,16 @@ class AmharicBibleChunker:
         words = [w for w in text.split() if w.strip()]
         return len(words)
     
-    def create_semantic_chunks(self, text: str) -> List[Dict]:
-        """Create chunks that preserve semantic meaning"""
+    def create_semantic_chunks(self, text: str, corpus: Optional[CorpusTextWriter] = None) -> List[Dict]:
+        """
+        Create chunks that preserve semantic meaning
+        
+        With a corpus writer every sentence is written to it once and chunks
+        carry a 'text_span' (byte offsets) instead of their overlapping text.
+        """
         
         sentences = self.split_into_sentences(text)
+        spans = corpus.append_sentences(sentences) if corpus is not None else None
         chunks = []
         current_chunk = []
         current_word_count = 0
@@ -53,10 +62,9 @@ class AmharicBibleChunker:
             # If adding this sentence would exceed chunk size
             if current_word_count + sentence_words > self.chunk_size and current_chunk:
                 # Save current chunk
-                chunk_text = ' '.join(current_chunk)
                 chunks.append({
                     'id': chunk_id,
-                    'text': chunk_text,
+                    **self._chunk_text(current_chunk, spans, i - len(current_chunk), i - 1),
                     'word_count': current_word_count,
                     'sentence_count': len(current_chunk),
                     'start_sentence': i - len(current_chunk),
@@ -76,10 +84,9 @@ class AmharicBibleChunker:
         
         # Add final chunk
         if current_chunk:
-            chunk_text = ' '.join(current_chunk)
             chunks.append({
                 'id': chunk_id,
-                'text': chunk_text,
+                **self._chunk_text(current_chunk, spans, len(sentences) - len(current_chunk), len(sentences) - 1),
                 'word_count': current_word_count,
                 'sentence_count': len(current_chunk),
                 'start_sentence': len(sentences) - len(current_chunk),
@@ -88,8 +95,15 @@ class AmharicBibleChunker:
         
         return chunks
     
+    @staticmethod
+    def _chunk_text(sentences: List[str], spans: Optional[List], first: int, last: int) -> Dict:
+        """'text' of a chunk, or its 'text_span' when the text lives in a corpus blob"""
+        if spans is None:
+            return {'text': ' '.join(sentences)}
+        return {'text_span': sentence_range_span(spans, first, last)}
+    
     def add_context_metadata(self, chunks: List[Dict], source_file: str) -> List[Dict]:
-        """Add contextual metadata to chunks"""
+        """Add contextual metadata to chunks (neighbour spans instead of text for span chunks)"""
         
         enhanced_chunks = []
         
@@ -106,6 +120,9 @@ class AmharicBibleChunker:
                 'has_previous': prev_chunk is not None,
                 'has_next': next_chunk is not None,
                 'context_window': {
+                    'previous_span': prev_chunk['text_span'] if prev_chunk else None,
+                    'next_span': next_chunk['text_span'] if next_chunk else None
+                } if 'text_span' in chunk else {
                     'previous_text': prev_chunk['text'][-100:] if prev_chunk else None,
                     'next_text': next_chunk['text'][:100] if next_chunk else None
                 }
@@ -124,8 +141,9 @@ class AmharicBibleChunker:
         
         logger.info(f"Processing {len(text)} characters into chunks")
         
-        # Create chunks
-        chunks = self.create_semantic_chunks(text)
+        # Create chunks; sentences are stored once in the corpus blob
+        corpus_writer = CorpusTextWriter()
+        chunks = self.create_semantic_chunks(text, corpus_writer)
         
         # Add metadata
         enhanced_chunks = self.add_context_metadata(chunks, input_file)
@@ -134,11 +152,13 @@ class AmharicBibleChunker:
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Save chunks as JSONL for embedding pipeline
+        # Save chunks as JSONL for embedding pipeline, their text as <stem>.corpus.txt
         chunks_file = output_path / "amharic_bible_chunks.jsonl"
         with open(chunks_file, 'w', encoding='utf-8') as f:
             for chunk in enhanced_chunks:
                 f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+        corpus_file = corpus_writer.save(str(corpus_path_for(str(chunks_file))))
+        corpus = CorpusText(str(corpus_file))
         
         # Save summary
         summary_file = output_path / "chunking_summary.txt"
@@ -160,11 +180,13 @@ class AmharicBibleChunker:
             for i in range(min(5, len(chunks))):
                 f.write(f"\nChunk {i+1}:\n")
                 f.write(f"  Words: {chunks[i]['word_count']}\n")
-                f.write(f"  Text preview: {chunks[i]['text'][:200]}...\n")
+                f.write(f"  Text preview: {corpus.text(chunks[i]['text_span'])[:200]}...\n")
         
+        corpus.close()
         return {
             'total_chunks': len(chunks),
             'chunks_file': str(chunks_file),
+            'corpus_file': str(corpus_file),
             'summary_file': str(summary_file),
             'average_words': avg_words,
             'average_sentences': avg_sentences
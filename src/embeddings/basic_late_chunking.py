@@ -5,10 +5,13 @@ Basic Late Chunking Implementation - Core Logic Only
 import numpy as np
 import json
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Sequence
 from sentence_transformers import SentenceTransformer
 import sys
 sys.path.append('/Users/mekdesyared/Embedding/amharic-bible-embeddings')
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.embeddings.embedding_artifact import save_deduplicated_chunks
+from src.chunking.corpus_text import CorpusTextWriter, sentence_range_span
 import logging
 
 logger = logging.getLogger(__name__)
@@ -17,6 +20,7 @@ class BasicLateChunkingEmbedder:
     """Basic late chunking without LLM enhancement for testing"""
     
     def __init__(self, model_name: str = "sentence-transformers/paraphrase-multilingual-mpnet-base-v2"):
+        self.model_name = model_name
         self.model = SentenceTransformer(model_name, device="cpu")
         self.long_passage_size = 800     # Words per long passage
         self.final_chunk_size = 250      # Words per final chunk
@@ -84,36 +88,46 @@ class BasicLateChunkingEmbedder:
         
         return passages
     
-    def apply_chunking(self, embedded_passages: List[Dict]) -> List[Dict]:
-        """Apply final chunking with embedding pooling"""
+    def apply_chunking(self, embedded_passages: List[Dict], corpus: Optional[CorpusTextWriter] = None) -> List[Dict]:
+        """
+        Apply final chunking with embedding pooling (chunks reference their passage's vector by 'vector_id')
+        
+        With a corpus writer sentences are stored there once and chunks carry
+        a 'text_span' instead of their overlapping text.
+        """
         
         final_chunks = []
         chunk_id = 1
         
-        for passage in embedded_passages:
+        for vector_id, passage in enumerate(embedded_passages):
             text = passage['enhanced_text']
             embedding = np.array(passage['embedding'])
             
             # Simple sentence-based chunking
             sentences = self._split_sentences(text)
+            spans = corpus.append_sentences(sentences) if corpus is not None else None
+            
+            def text_field(sentence_ids: List[int]) -> Dict[str, Any]:
+                if spans is None:
+                    return {'text': ' '.join(sentences[sentence_id] for sentence_id in sentence_ids)}
+                return {'text_span': sentence_range_span(spans, sentence_ids[0], sentence_ids[-1])}
             
             current_chunk = []
+            current_ids = []
             current_words = 0
             
-            for sentence in sentences:
+            for sentence_id, sentence in enumerate(sentences):
                 sentence_words = self.count_amharic_words(sentence)
                 
                 if current_words + sentence_words > self.final_chunk_size and current_chunk:
                     # Create final chunk
-                    chunk_text = ' '.join(current_chunk)
-                    
                     final_chunks.append({
                         'chunk_id': chunk_id,
                         'passage_id': passage['passage_id'],
                         'books': passage['books'],
-                        'text': chunk_text,
+                        **text_field(current_ids),
                         'word_count': current_words,
-                        'embedding': embedding.tolist(),  # Use passage embedding
+                        'vector_id': vector_id,  # Use passage embedding
                         'metadata': {
                             'source_chunks': passage['source_chunk_ids'],
                             'embedding_dimension': len(embedding)
@@ -125,21 +139,22 @@ class BasicLateChunkingEmbedder:
                     # Start new chunk with overlap
                     overlap_size = max(1, int(len(current_chunk) * self.overlap_ratio))
                     current_chunk = current_chunk[-overlap_size:] + [sentence]
+                    current_ids = current_ids[-overlap_size:] + [sentence_id]
                     current_words = sum(self.count_amharic_words(s) for s in current_chunk)
                 else:
                     current_chunk.append(sentence)
+                    current_ids.append(sentence_id)
                     current_words += sentence_words
             
             # Final chunk for passage
             if current_chunk:
-                chunk_text = ' '.join(current_chunk)
                 final_chunks.append({
                     'chunk_id': chunk_id,
                     'passage_id': passage['passage_id'],
                     'books': passage['books'],
-                    'text': chunk_text,
+                    **text_field(current_ids),
                     'word_count': current_words,
-                    'embedding': embedding.tolist(),
+                    'vector_id': vector_id,
                     'metadata': {
                         'source_chunks': passage['source_chunk_ids'],
                         'embedding_dimension': len(embedding)
@@ -155,7 +170,7 @@ class BasicLateChunkingEmbedder:
         sentences = re.split(r'[።፧፡]', text)
         return [s.strip() for s in sentences if len(s.strip()) > 5]
     
-    def process(self, input_file: str, output_dir: str) -> Dict[str, Any]:
+    def process(self, input_file: str, output_dir: str, quantize: Sequence[str] = ()) -> Dict[str, Any]:
         """Complete basic late chunking process"""
         
         # Load chunks
@@ -173,16 +188,19 @@ class BasicLateChunkingEmbedder:
         print(f"Generated embeddings for {len(embedded_passages)} passages")
         
         # Apply final chunking
-        final_chunks = self.apply_chunking(embedded_passages)
+        corpus = CorpusTextWriter()
+        final_chunks = self.apply_chunking(embedded_passages, corpus)
         print(f"Created {len(final_chunks)} final chunks")
         
         # Save results
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path / "basic_late_chunks.jsonl", 'w', encoding='utf-8') as f:
-            for chunk in final_chunks:
-                f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+        # Each passage vector and sentence is stored once: JSONL + vectors file + corpus blob + binary artifact
+        vectors = np.asarray([passage['embedding'] for passage in embedded_passages], dtype=np.float32)
+        saved = save_deduplicated_chunks(str(output_path), "basic_late_chunks", final_chunks, vectors,
+                                         self.model_name, source=input_file, quantize=quantize,
+                                         corpus=corpus.to_bytes())
         
         summary = {
             'input_chunks': len(chunks),
@@ -190,6 +208,8 @@ class BasicLateChunkingEmbedder:
             'final_chunks': len(final_chunks),
             'avg_words_per_chunk': np.mean([c['word_count'] for c in final_chunks]),
             'books_covered': len(set([book for chunk in final_chunks for book in chunk['books']])),
+            'unique_vectors': len(vectors),
+            'artifact_dir': saved['artifact'],
         }
         
         return summary
@@ -0,0 +1,97 @@
+"""
+Canonical row layout for embedding artifacts
+Rows are sorted into canonical book / chapter / verse order so that every
+book and testament occupies one contiguous block of rows
+"""
+
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.preprocessing.biblical_parser import AmharicBiblicalParser
+
+_BOOK_ORDER: Optional[Dict[str, int]] = None
+
+
+def canonical_book_order() -> Dict[str, int]:
+    """Canonical position of each book (AmharicBiblicalParser.book_order)"""
+
+    global _BOOK_ORDER
+    if _BOOK_ORDER is None:
+        _BOOK_ORDER = AmharicBiblicalParser().book_order
+    return _BOOK_ORDER
+
+
+def _first_number(value: Any) -> int:
+    """Leading number of a chapter/verse field (int, [start, end] range or missing)"""
+
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else 0
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return 0
+
+
+def canonical_sort_key(record: Dict[str, Any], book_order: Dict[str, int]) -> Tuple[int, int, int]:
+    """(book, chapter, verse) position of a record; unknown books sort last"""
+
+    book = record.get("book")
+    book_position = book_order.get(book, len(book_order) + 1) if isinstance(book, str) else len(book_order) + 1
+    verse = record.get("verse_number", record.get("verse_range"))
+    return book_position, _first_number(record.get("chapter")), _first_number(verse)
+
+
+def canonical_permutation(records: List[Dict[str, Any]]) -> np.ndarray:
+    """Row order that sorts records canonically (stable for equal keys)"""
+
+    book_order = canonical_book_order()
+    keys = [canonical_sort_key(record, book_order) for record in records]
+    return np.asarray(sorted(range(len(records)), key=keys.__getitem__), dtype=np.int64)
+
+
+def _contiguous_ranges(labels: List[Any]) -> Dict[str, List[int]]:
+    """[start, end) row range of every label that occupies a single contiguous block"""
+
+    ranges: Dict[str, List[int]] = {}
+    split = set()
+
+    for row_id, label in enumerate(labels):
+        if label is None:
+            continue
+
+        key = str(label)
+        if key in split:
+            continue
+        if key not in ranges:
+            ranges[key] = [row_id, row_id + 1]
+        elif ranges[key][1] == row_id:
+            ranges[key][1] = row_id + 1
+        else:
+            # Label appears in more than one block: no single range
+            split.add(key)
+            del ranges[key]
+
+    return ranges
+
+
+def compute_layout(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Row ranges of books, testaments and chapters for records in canonical order
+
+    Returns:
+        Manifest section with [start, end) row offsets; books or testaments
+        whose rows are not contiguous are left out
+    """
+    chapters = _contiguous_ranges([
+        f"{record['book']}:{record['chapter']}" if record.get("book") and record.get("chapter") is not None else None
+        for record in records
+    ])
+
+    return {
+        'order': 'canonical',
+        'books': _contiguous_ranges([record.get("book") for record in records]),
+        'testaments': _contiguous_ranges([record.get("testament") for record in records]),
+        'chapters': chapters
+    }
@@ -0,0 +1,597 @@
+"""
+Binary embedding artifact: memory-mappable .npy matrix with metadata sidecar
+
+Layout of an artifact directory:
+    manifest.json    model, dimension, dtype, row count and file names
+    embeddings.npy   (rows, dimension) L2-normalized float32 matrix
+    norms.npy        original L2 norm of every row
+    metadata.jsonl   one JSON record per row (text + metadata, no vectors)
+
+Files are written under temporary names and swapped in with os.replace,
+the manifest last: processes that memory-mapped the previous files keep
+reading them intact while an artifact is rewritten in place.
+
+An artifact converted from (or written next to) a JSON/JSONL embeddings file
+records that file's size and modification time under "source_stat"; loaders
+skip an artifact whose source has been regenerated since (see fresh_artifact_for).
+
+Rows are stored in canonical book / chapter / verse order; the manifest
+"layout" section gives the [start, end) rows of each book, testament and
+chapter, so those filters are plain slices of the matrix.
+
+Deduplicated artifacts (late-chunked output, where every chunk of a passage
+shares the passage vector) store each distinct vector once:
+    embeddings.npy   (vectors, dimension) unique L2-normalized vectors
+    norms.npy        norm of every unique vector
+    vector_ids.npy   (rows,) int32 row -> vector mapping
+and the manifest gives both "rows" and "vectors".
+
+Records may keep their text as a 'text_span' (byte offsets) into a corpus
+blob (see src/chunking/corpus_text.py), copied into the artifact as
+corpus.txt and listed under files["corpus"].
+
+First-stage copies for cascaded search (listed under "first_stage" by model):
+    first_stage.<model>.npy  (rows, dimension) L2-normalized float32 vectors of
+                             the same rows from a smaller model
+
+Optional quantized copies (listed under "quantization" in the manifest):
+    int8             embeddings.int8.npy + int8_scale.npy / int8_offset.npy
+                     per-dimension calibration, with embeddings.f16.npy
+                     float16 originals for re-scoring
+    binary           embeddings.bin.npy packed sign bits (1 bit per dimension)
+                     + binary_threshold.npy per-dimension bit threshold
+    pca64 / pca128   embeddings.pca<d>.npy PCA-reduced copies + pca<d>_components.npy
+                     and pca_mean.npy (one SVD fit shared by both sizes)
+"""
+
+import os
+import json
+import shutil
+import argparse
+import numpy as np
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable, Sequence, Callable
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.embeddings.quantization import quantize_int8, quantize_binary, fit_pca, project_pca
+from src.chunking.corpus_text import corpus_path_for
+from src.embeddings.canonical_layout import canonical_permutation, compute_layout
+import logging
+
+logger = logging.getLogger(__name__)
+
+ARTIFACT_FORMAT_VERSION = 1
+ARTIFACT_SUFFIX = ".artifact"
+
+MANIFEST_FILE = "manifest.json"
+EMBEDDINGS_FILE = "embeddings.npy"
+NORMS_FILE = "norms.npy"
+METADATA_FILE = "metadata.jsonl"
+VECTOR_IDS_FILE = "vector_ids.npy"
+CORPUS_FILE = "corpus.txt"
+
+# Unique vectors of a deduplicated JSONL chunks file ("<stem>.vectors.npy" next to it)
+VECTORS_SUFFIX = ".vectors.npy"
+
+INT8_CODES_FILE = "embeddings.int8.npy"
+INT8_SCALE_FILE = "int8_scale.npy"
+INT8_OFFSET_FILE = "int8_offset.npy"
+FLOAT16_FILE = "embeddings.f16.npy"
+BINARY_CODES_FILE = "embeddings.bin.npy"
+BINARY_THRESHOLD_FILE = "binary_threshold.npy"
+
+PCA_MEAN_FILE = "pca_mean.npy"
+PCA_DIMENSIONS = (64, 128)
+
+QUANTIZATION_TYPES = ("int8", "binary") + tuple(f"pca{dimension}" for dimension in PCA_DIMENSIONS)
+
+
+@dataclass
+class EmbeddingArtifact:
+    """A loaded embedding artifact"""
+    path: Path
+    manifest: Dict[str, Any]
+    embeddings: np.ndarray       # L2-normalized rows (np.memmap when opened with mmap)
+    norms: np.ndarray            # Original row norms
+    records: List[Dict[str, Any]]
+    vector_ids: Optional[np.ndarray] = None  # Row -> embeddings row (deduplicated artifacts only)
+
+    @property
+    def corpus_file(self) -> Optional[Path]:
+        """Corpus blob holding the text of 'text_span' records, if any"""
+        name = self.manifest['files'].get('corpus')
+        return self.path / name if name else None
+
+    def __len__(self) -> int:
+        return int(self.manifest["rows"])
+
+    def raw_embeddings(self, start: int = 0, end: Optional[int] = None) -> np.ndarray:
+        """Reconstruct the original (un-normalized) vectors for a row range"""
+        end = len(self) if end is None else end
+        if self.vector_ids is not None:
+            ids = self.vector_ids[start:end]
+            return np.asarray(self.embeddings[ids]) * self.norms[ids, None]
+        return np.asarray(self.embeddings[start:end]) * self.norms[start:end, None]
+
+
+def _replace_file(target: Path, write: Callable[[Path], None]) -> None:
+    """Write a file under a temporary name next to target, then swap it in atomically"""
+    temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+    try:
+        write(temporary)
+        os.replace(temporary, target)
+    except BaseException:
+        temporary.unlink(missing_ok=True)
+        raise
+
+
+def _save_array(target: Path, array: np.ndarray) -> None:
+    def write(temporary: Path) -> None:
+        with open(temporary, 'wb') as f:
+            np.save(f, array)
+    _replace_file(target, write)
+
+
+def _save_manifest(artifact_dir: Path, manifest: Dict[str, Any]) -> None:
+    def write(temporary: Path) -> None:
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, ensure_ascii=False, indent=2)
+    _replace_file(artifact_dir / MANIFEST_FILE, write)
+
+
+def artifact_path_for(embeddings_file: str) -> Path:
+    """Artifact directory that sits next to a JSON/JSONL embeddings file"""
+    path = Path(embeddings_file)
+    if path.suffix == ARTIFACT_SUFFIX:
+        return path
+    return path.with_suffix(ARTIFACT_SUFFIX)
+
+
+def is_artifact(path: str) -> bool:
+    """Check whether a path points at an artifact directory"""
+    return (Path(path) / MANIFEST_FILE).exists()
+
+
+def _file_stat(path: str) -> Dict[str, Any]:
+    stat = Path(path).stat()
+    return {'path': str(Path(path).resolve()), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def is_stale(artifact_dir: str, source_file: str) -> bool:
+    """
+    Check whether an embeddings file changed after its artifact was written
+
+    Compares against the size and mtime recorded in the manifest; artifacts
+    written without them count as stale when the source is newer.
+    """
+    source = Path(source_file)
+    if not source.is_file():
+        return False
+
+    recorded = read_manifest(artifact_dir).get('source_stat')
+    if recorded and recorded.get('path') == str(source.resolve()):
+        current = _file_stat(str(source))
+        return (current['size'], current['mtime_ns']) != (recorded['size'], recorded['mtime_ns'])
+
+    return source.stat().st_mtime_ns > (Path(artifact_dir) / MANIFEST_FILE).stat().st_mtime_ns
+
+
+def fresh_artifact_for(embeddings_file: str) -> Optional[Path]:
+    """
+    Artifact to load instead of parsing an embeddings file
+
+    Returns:
+        The artifact directory, or None when there is none or its source
+        file has been regenerated since it was written (logged as a warning)
+    """
+    artifact_dir = artifact_path_for(embeddings_file)
+    if not is_artifact(str(artifact_dir)):
+        return None
+
+    if Path(embeddings_file) != artifact_dir and is_stale(str(artifact_dir), embeddings_file):
+        logger.warning(f"{embeddings_file} is newer than its artifact {artifact_dir}; ignoring the artifact "
+                       f"(re-convert with src/embeddings/embedding_artifact.py)")
+        return None
+
+    return artifact_dir
+
+
+def vectors_path_for(jsonl_file: str) -> Path:
+    """Unique-vector file that sits next to a deduplicated JSONL chunks file"""
+    path = Path(jsonl_file)
+    return path.with_name(path.stem + VECTORS_SUFFIX)
+
+
+def save_embedding_artifact(output_dir: str,
+                            embeddings: np.ndarray,
+                            records: List[Dict[str, Any]],
+                            model_name: str,
+                            source: Optional[str] = None,
+                            quantize: Sequence[str] = (),
+                            canonical_order: bool = True,
+                            vector_ids: Optional[np.ndarray] = None,
+                            corpus_file: Optional[str] = None,
+                            source_file: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write embeddings and their metadata as a binary artifact
+
+    Args:
+        output_dir: Artifact directory to create
+        embeddings: (rows, dimension) embedding matrix, or (vectors, dimension)
+            unique vectors when vector_ids is given
+        records: Per-row metadata; any 'embedding' key is dropped
+        model_name: Model that produced the embeddings
+        source: Optional description of where the embeddings came from
+        quantize: Extra quantized copies to emit (see QUANTIZATION_TYPES);
+            with vector_ids they hold each unique vector once
+        canonical_order: Sort rows into canonical book/chapter/verse order and
+            record book/testament row ranges under "layout"
+        vector_ids: Row -> embeddings row mapping; stores each vector once
+        corpus_file: Corpus blob the records' 'text_span' offsets point into
+        source_file: Embeddings file the artifact mirrors; its size and mtime
+            are recorded so a regenerated file is detected
+
+    Returns:
+        The manifest written to disk
+    """
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+
+    if vector_ids is not None:
+        vector_ids = np.asarray(vector_ids, dtype=np.int32)
+        if matrix.ndim != 2 or len(vector_ids) != len(records):
+            raise ValueError(f"Expected {len(records)} vector ids, got {len(vector_ids)}")
+        if len(vector_ids) and (vector_ids.min() < 0 or vector_ids.max() >= len(matrix)):
+            raise ValueError(f"Vector ids out of range for {len(matrix)} vectors")
+    elif matrix.ndim != 2 or len(matrix) != len(records):
+        raise ValueError(f"Expected {len(records)} embedding rows, got shape {matrix.shape}")
+
+    layout = None
+    if canonical_order:
+        order = canonical_permutation(records)
+        if vector_ids is not None:
+            vector_ids = vector_ids[order]
+        else:
+            matrix = matrix[order]
+        records = [records[row_id] for row_id in order]
+        layout = compute_layout(records)
+
+    norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+    safe_norms = np.where(norms == 0, 1.0, norms).astype(np.float32)
+
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    normalized = matrix / safe_norms[:, None]
+    _save_array(output_path / EMBEDDINGS_FILE, normalized)
+    _save_array(output_path / NORMS_FILE, norms)
+    if vector_ids is not None:
+        _save_array(output_path / VECTOR_IDS_FILE, vector_ids)
+    if corpus_file is not None:
+        _replace_file(output_path / CORPUS_FILE, lambda temporary: shutil.copyfile(corpus_file, temporary))
+    quantization = _write_quantized(output_path, normalized, quantize)
+
+    def write_metadata(temporary: Path) -> None:
+        with open(temporary, 'w', encoding='utf-8') as f:
+            for record in records:
+                record = {key: value for key, value in record.items() if key != 'embedding'}
+                f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    _replace_file(output_path / METADATA_FILE, write_metadata)
+
+    manifest = {
+        'format_version': ARTIFACT_FORMAT_VERSION,
+        'model': model_name,
+        'dimension': int(matrix.shape[1]),
+        'dtype': 'float32',
+        'rows': len(records),
+        'vectors': int(matrix.shape[0]),
+        'normalized': True,
+        'files': {
+            'embeddings': EMBEDDINGS_FILE,
+            'norms': NORMS_FILE,
+            'metadata': METADATA_FILE,
+            **({'vector_ids': VECTOR_IDS_FILE} if vector_ids is not None else {}),
+            **({'corpus': CORPUS_FILE} if corpus_file is not None else {})
+        },
+        'quantization': quantization,
+        'layout': layout,
+        'source': source,
+        'source_stat': _file_stat(source_file) if source_file else None,
+        'created_at': datetime.now().isoformat()
+    }
+
+    # Manifest goes last: readers see either the old files or the complete new set
+    _save_manifest(output_path, manifest)
+
+    logger.info(f"Saved embedding artifact: {output_path} ({manifest['rows']} rows, "
+                f"{manifest['vectors']} x {manifest['dimension']} vectors)")
+    return manifest
+
+
+def _write_quantized(output_path: Path, normalized: np.ndarray, quantize: Sequence[str]) -> Dict[str, Any]:
+    """Write quantized copies of the normalized matrix and describe them for the manifest"""
+
+    quantization = {}
+    # Copies of deduplicated artifacts cover the unique vectors, not the rows
+    rows = int(len(normalized))
+
+    # One PCA fit with the most components requested serves every pca<d> copy
+    pca_dimensions = [dimension for dimension in PCA_DIMENSIONS if f"pca{dimension}" in quantize]
+    pca = fit_pca(normalized, min(max(pca_dimensions), normalized.shape[1])) if pca_dimensions else None
+    if pca is not None:
+        _save_array(output_path / PCA_MEAN_FILE, pca[0])
+
+    for kind in quantize:
+        if kind == "int8":
+            codes, scale, offset = quantize_int8(normalized)
+            _save_array(output_path / INT8_CODES_FILE, codes)
+            _save_array(output_path / INT8_SCALE_FILE, scale)
+            _save_array(output_path / INT8_OFFSET_FILE, offset)
+            _save_array(output_path / FLOAT16_FILE, normalized.astype(np.float16))
+
+            quantization['int8'] = {
+                'codes': INT8_CODES_FILE,
+                'scale': INT8_SCALE_FILE,
+                'offset': INT8_OFFSET_FILE,
+                'rescore': FLOAT16_FILE,
+                'max_abs_error': float(np.abs(codes.astype(np.float32) * scale + offset - normalized).max()),
+                'rows': rows
+            }
+        elif kind == "binary":
+            codes, threshold = quantize_binary(normalized)
+            _save_array(output_path / BINARY_CODES_FILE, codes)
+            _save_array(output_path / BINARY_THRESHOLD_FILE, threshold)
+
+            quantization['binary'] = {
+                'codes': BINARY_CODES_FILE,
+                'threshold': BINARY_THRESHOLD_FILE,
+                'bytes_per_vector': int(codes.shape[1]),
+                'rows': rows
+            }
+        elif kind in {f"pca{dimension}" for dimension in PCA_DIMENSIONS}:
+            mean, components, ratio = pca
+            dimension = min(int(kind[3:]), len(components))
+            codes_file = f"embeddings.{kind}.npy"
+            components_file = f"{kind}_components.npy"
+            _save_array(output_path / codes_file, project_pca(normalized, mean, components[:dimension]))
+            _save_array(output_path / components_file, components[:dimension])
+
+            quantization[kind] = {
+                'codes': codes_file,
+                'components': components_file,
+                'mean': PCA_MEAN_FILE,
+                'dimension': dimension,
+                'explained_variance': float(ratio[:dimension].sum()),
+                'rows': rows
+            }
+        else:
+            raise ValueError(f"Unknown quantization type: {kind} (expected one of {QUANTIZATION_TYPES})")
+
+    return quantization
+
+
+def add_quantization(artifact_dir: str, quantize: Sequence[str]) -> Dict[str, Any]:
+    """Add quantized copies to an existing artifact and update its manifest"""
+
+    path = Path(artifact_dir)
+    manifest = read_manifest(str(path))
+    normalized = np.load(path / manifest['files']['embeddings'])
+
+    manifest.setdefault('quantization', {}).update(_write_quantized(path, normalized, quantize))
+    _save_manifest(path, manifest)
+
+    return manifest
+
+
+def first_stage_file_name(model_name: str) -> str:
+    """File name of a model's first-stage vectors inside an artifact"""
+    return f"first_stage.{model_name.replace('/', '__')}.npy"
+
+
+def add_first_stage(artifact_dir: str, model_name: str, embeddings: np.ndarray) -> Dict[str, Any]:
+    """
+    Store row-aligned vectors of another (smaller) model in an artifact
+
+    Args:
+        artifact_dir: Existing artifact
+        model_name: Model that produced the vectors
+        embeddings: (rows, dimension) raw vectors in artifact row order
+
+    Returns:
+        The updated manifest
+    """
+    path = Path(artifact_dir)
+    manifest = read_manifest(str(path))
+
+    matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+    if matrix.ndim != 2 or len(matrix) != manifest['rows']:
+        raise ValueError(f"Expected {manifest['rows']} first-stage rows, got shape {matrix.shape}")
+
+    norms = np.linalg.norm(matrix, axis=1)
+    file_name = first_stage_file_name(model_name)
+    _save_array(path / file_name, matrix / np.where(norms == 0, 1.0, norms)[:, None])
+
+    manifest.setdefault('first_stage', {})[model_name] = {'file': file_name, 'dimension': int(matrix.shape[1])}
+    _save_manifest(path, manifest)
+
+    return manifest
+
+
+def save_chunks_artifact(output_dir: str,
+                         chunks: Iterable[Dict[str, Any]],
+                         model_name: str,
+                         source: Optional[str] = None,
+                         quantize: Sequence[str] = (),
+                         canonical_order: bool = True,
+                         corpus_file: Optional[str] = None,
+                         source_file: Optional[str] = None) -> Dict[str, Any]:
+    """Write chunk dicts carrying an 'embedding' list as a binary artifact"""
+
+    vectors = []
+    records = []
+
+    for chunk in chunks:
+        if chunk.get('embedding') is None:
+            continue
+        vectors.append(chunk['embedding'])
+        records.append(chunk)
+
+    return save_embedding_artifact(output_dir, np.asarray(vectors, dtype=np.float32), records, model_name,
+                                   source, quantize, canonical_order, corpus_file=corpus_file,
+                                   source_file=source_file)
+
+
+def save_deduplicated_chunks(output_dir: str,
+                             name: str,
+                             chunks: List[Dict[str, Any]],
+                             vectors: np.ndarray,
+                             model_name: str,
+                             source: Optional[str] = None,
+                             quantize: Sequence[str] = (),
+                             corpus: Optional[bytes] = None) -> Dict[str, Optional[str]]:
+    """
+    Write chunks that reference shared vectors by 'vector_id'
+
+    Produces <name>.jsonl (chunks without embeddings), <name>.vectors.npy
+    (each distinct vector once) and the deduplicated <name>.artifact. With
+    a corpus blob (chunks carrying 'text_span') it is written as
+    <name>.corpus.txt and copied into the artifact.
+
+    Returns:
+        Paths of the written files
+    """
+    output_path = Path(output_dir)
+    output_path.mkdir(parents=True, exist_ok=True)
+
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    chunks_file = output_path / f"{name}.jsonl"
+    with open(chunks_file, 'w', encoding='utf-8') as f:
+        for chunk in chunks:
+            record = {key: value for key, value in chunk.items() if key != 'embedding'}
+            f.write(json.dumps(record, ensure_ascii=False) + '\n')
+
+    vectors_file = vectors_path_for(str(chunks_file))
+    _save_array(vectors_file, vectors)
+
+    corpus_file = None
+    if corpus is not None:
+        corpus_file = corpus_path_for(str(chunks_file))
+        corpus_file.write_bytes(corpus)
+
+    artifact_dir = artifact_path_for(str(chunks_file))
+    save_embedding_artifact(str(artifact_dir), vectors, chunks, model_name, source, quantize,
+                            vector_ids=np.asarray([chunk['vector_id'] for chunk in chunks], dtype=np.int32),
+                            corpus_file=str(corpus_file) if corpus_file else None,
+                            source_file=str(chunks_file))
+
+    return {
+        'chunks': str(chunks_file),
+        'vectors': str(vectors_file),
+        'corpus': str(corpus_file) if corpus_file else None,
+        'artifact': str(artifact_dir)
+    }
+
+
+def read_manifest(artifact_dir: str) -> Dict[str, Any]:
+    """Read an artifact manifest"""
+    with open(Path(artifact_dir) / MANIFEST_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def load_embedding_artifact(artifact_dir: str, mmap: bool = True, load_records: bool = True) -> EmbeddingArtifact:
+    """
+    Open an embedding artifact
+
+    Args:
+        artifact_dir: Artifact directory
+        mmap: Memory-map the embedding matrix instead of reading it
+        load_records: Parse the metadata sidecar
+
+    Returns:
+        EmbeddingArtifact with the (memory-mapped) matrix and records
+    """
+    path = Path(artifact_dir)
+    manifest = read_manifest(str(path))
+
+    if manifest.get('format_version', 0) > ARTIFACT_FORMAT_VERSION:
+        raise ValueError(f"Unsupported artifact format version: {manifest['format_version']}")
+
+    files = manifest['files']
+    embeddings = np.load(path / files['embeddings'], mmap_mode='r' if mmap else None)
+    norms = np.load(path / files['norms'])
+    vector_ids = np.load(path / files['vector_ids']) if 'vector_ids' in files else None
+
+    expected = (manifest.get('vectors', manifest['rows']), manifest['dimension'])
+    if embeddings.shape != expected:
+        raise ValueError(f"Artifact {path} is inconsistent: {embeddings.shape} vs manifest {expected}")
+
+    records = []
+    if load_records:
+        with open(path / files['metadata'], 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+
+    return EmbeddingArtifact(
+        path=path,
+        manifest=manifest,
+        embeddings=embeddings,
+        norms=norms,
+        records=records,
+        vector_ids=vector_ids
+    )
+
+
+def convert_jsonl_to_artifact(jsonl_file: str,
+                              output_dir: Optional[str] = None,
+                              model_name: Optional[str] = None,
+                              quantize: Sequence[str] = ()) -> Dict[str, Any]:
+    """Convert an existing JSONL embeddings file into an artifact next to it"""
+
+    output_dir = output_dir or str(artifact_path_for(jsonl_file))
+
+    if model_name is None:
+        from config.settings import settings
+        model_name = settings.EMBEDDING_MODEL
+
+    corpus_file = corpus_path_for(jsonl_file)
+    corpus_file = str(corpus_file) if corpus_file.exists() else None
+
+    vectors_file = vectors_path_for(jsonl_file)
+    if vectors_file.exists():
+        # Deduplicated chunks keep sharing their vectors in the artifact
+        with open(jsonl_file, 'r', encoding='utf-8') as f:
+            records = [json.loads(line) for line in f if line.strip()]
+        return save_embedding_artifact(output_dir, np.load(vectors_file), records, model_name,
+                                       source=str(jsonl_file), quantize=quantize,
+                                       vector_ids=np.asarray([record['vector_id'] for record in records]),
+                                       corpus_file=corpus_file, source_file=jsonl_file)
+
+    def iter_chunks():
+        with open(jsonl_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    return save_chunks_artifact(output_dir, iter_chunks(), model_name, source=str(jsonl_file), quantize=quantize,
+                                corpus_file=corpus_file, source_file=jsonl_file)
+
+
+def main():
+    """Convert JSONL embedding files into binary artifacts"""
+
+    parser = argparse.ArgumentParser(description="Convert JSONL embeddings to a memory-mappable artifact")
+    parser.add_argument("jsonl_files", nargs="+", help="JSONL files with an 'embedding' field per line")
+    parser.add_argument("--model", default=None, help="Model name recorded in the manifest")
+    parser.add_argument("--quantize", nargs="*", default=[], choices=QUANTIZATION_TYPES,
+                        help="Also emit quantized copies")
+    args = parser.parse_args()
+
+    for jsonl_file in args.jsonl_files:
+        manifest = convert_jsonl_to_artifact(jsonl_file, model_name=args.model, quantize=args.quantize)
+        print(f"✅ {jsonl_file} -> {artifact_path_for(jsonl_file)}")
+        print(f"   Rows: {manifest['rows']}, Dimension: {manifest['dimension']}, Model: {manifest['model']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -7,13 +7,16 @@ import numpy as np
 import json
 import asyncio
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Sequence
 from sentence_transformers import SentenceTransformer
 import torch
 from sklearn.metrics.pairwise import cosine_similarity
 import sys
 sys.path.append('/Users/mekdesyared/Embedding/amharic-bible-embeddings')
+sys.path.append(str(Path(__file__).parent.parent.parent))
 from config.llm_config import llm_manager
+from src.embeddings.embedding_artifact import save_deduplicated_chunks
+from src.chunking.corpus_text import CorpusTextWriter, sentence_range_span
 import logging
 
 logger = logging.getLogger(__name__)
@@ -190,26 +193,53 @@ Original Text:
         logger.info(f"Generated embeddings with dimension {full_embeddings.shape[1]}")
         return enhanced_passages
     
-    def apply_intelligent_chunking(self, embedded_passages: List[Dict]) -> List[Dict]:
+    def apply_intelligent_chunking(self,
+                                   embedded_passages: List[Dict],
+                                   corpus: Optional[CorpusTextWriter] = None) -> Tuple[List[Dict], np.ndarray]:
         """
         Step 3: Apply intelligent chunking while preserving embeddings
+        
+        Chunks reference their embedding by 'vector_id' into the returned
+        vectors matrix. Passage i is vector i; a pooled chunk embedding that
+        differs from its passage embedding is appended as a vector of its own,
+        so identical vectors are stored once.
+        
+        With a corpus writer each passage's sentences are written to it once
+        and chunks carry a 'text_span' instead of their (overlapping) text.
+        
+        Returns:
+            (final_chunks, vectors)
         """
         logger.info("Applying intelligent chunking...")
         
         final_chunks = []
         chunk_id = 1
+        vectors = [np.asarray(passage['embedding'], dtype=np.float32) for passage in embedded_passages]
         
-        for passage in embedded_passages:
+        def vector_id_for(passage_index: int, chunk_embedding: np.ndarray) -> int:
+            if np.array_equal(chunk_embedding, vectors[passage_index]):
+                return passage_index
+            vectors.append(np.asarray(chunk_embedding, dtype=np.float32))
+            return len(vectors) - 1
+        
+        for passage_index, passage in enumerate(embedded_passages):
             original_text = passage['original_text']
-            passage_embedding = np.array(passage['embedding'])
+            passage_embedding = vectors[passage_index]
             
             # Split into sentences for intelligent chunking
             sentences = self._split_into_sentences(original_text)
+            spans = corpus.append_sentences(sentences) if corpus is not None else None
+            
+            def text_field(chunk_text: str, sentence_ids: List[int]) -> Dict[str, Any]:
+                if spans is None:
+                    return {'text': chunk_text}
+                return {'text_span': sentence_range_span(spans, sentence_ids[0], sentence_ids[-1])}
             
             current_chunk_sentences = []
+            current_chunk_ids = []
             current_word_count = 0
             
-            for sentence in sentences:
+            for sentence_id, sentence in enumerate(sentences):
                 sentence_words = self.count_amharic_words(sentence)
                 
                 # Check if adding this sentence exceeds target size
@@ -228,10 +258,10 @@ Original Text:
                         'chunk_id': chunk_id,
                         'passage_id': passage['passage_id'],
                         'books': passage['books'],
-                        'text': chunk_text,
+                        **text_field(chunk_text, current_chunk_ids),
                         'word_count': current_word_count,
                         'sentence_count': len(current_chunk_sentences),
-                        'embedding': chunk_embedding.tolist(),
+                        'vector_id': vector_id_for(passage_index, chunk_embedding),
                         'enhanced_context': {
                             'biblical_context': passage['biblical_context'],
                             'theological_themes': passage['theological_themes']
@@ -247,9 +277,11 @@ Original Text:
                     # Start new chunk with overlap
                     overlap_size = int(len(current_chunk_sentences) * self.overlap_ratio)
                     current_chunk_sentences = current_chunk_sentences[-overlap_size:] + [sentence]
+                    current_chunk_ids = current_chunk_ids[-overlap_size:] + [sentence_id]
                     current_word_count = sum(self.count_amharic_words(s) for s in current_chunk_sentences)
                 else:
                     current_chunk_sentences.append(sentence)
+                    current_chunk_ids.append(sentence_id)
                     current_word_count += sentence_words
             
             # Add final chunk for this passage
@@ -265,10 +297,10 @@ Original Text:
                     'chunk_id': chunk_id,
                     'passage_id': passage['passage_id'],
                     'books': passage['books'],
-                    'text': chunk_text,
+                    **text_field(chunk_text, current_chunk_ids),
                     'word_count': current_word_count,
                     'sentence_count': len(current_chunk_sentences),
-                    'embedding': chunk_embedding.tolist(),
+                    'vector_id': vector_id_for(passage_index, chunk_embedding),
                     'enhanced_context': {
                         'biblical_context': passage['biblical_context'],
                         'theological_themes': passage['theological_themes']
@@ -280,8 +312,8 @@ Original Text:
                 })
                 chunk_id += 1
         
-        logger.info(f"Created {len(final_chunks)} final chunks with late chunking")
-        return final_chunks
+        logger.info(f"Created {len(final_chunks)} final chunks sharing {len(vectors)} vectors")
+        return final_chunks, np.vstack(vectors) if vectors else np.zeros((0, 0), dtype=np.float32)
     
     def _pool_embedding_for_chunk(self, 
                                  passage_embedding: np.ndarray, 
@@ -317,7 +349,8 @@ Original Text:
     
     async def process_bible_with_late_chunking(self, 
                                              input_chunks_file: str, 
-                                             output_dir: str) -> Dict[str, Any]:
+                                             output_dir: str,
+                                             quantize: Sequence[str] = ()) -> Dict[str, Any]:
         """
         Complete late chunking pipeline for Amharic Bible
         """
@@ -336,17 +369,18 @@ Original Text:
         embedded_passages = self.generate_passage_embeddings(enhanced_passages)
         
         # Step 3: Apply intelligent chunking
-        final_chunks = self.apply_intelligent_chunking(embedded_passages)
+        corpus = CorpusTextWriter()
+        final_chunks, vectors = self.apply_intelligent_chunking(embedded_passages, corpus)
         
         # Save results
         output_path = Path(output_dir)
         output_path.mkdir(parents=True, exist_ok=True)
         
-        # Save final chunks with embeddings
-        chunks_file = output_path / "late_chunked_embeddings.jsonl"
-        with open(chunks_file, 'w', encoding='utf-8') as f:
-            for chunk in final_chunks:
-                f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+        # Chunks reference shared vectors and corpus text spans:
+        # JSONL + vectors file + corpus blob + binary artifact
+        saved = save_deduplicated_chunks(str(output_path), "late_chunked_embeddings", final_chunks, vectors,
+                                         self.model_name, source=input_chunks_file, quantize=quantize,
+                                         corpus=corpus.to_bytes())
         
         # Save enhanced passages for reference
         passages_file = output_path / "enhanced_passages.jsonl"
@@ -360,10 +394,14 @@ Original Text:
             'enhanced_passages_created': len(enhanced_passages),
             'final_chunks_created': len(final_chunks),
             'avg_words_per_final_chunk': np.mean([c['word_count'] for c in final_chunks]),
-            'embedding_dimension': final_chunks[0]['embedding_dimension'] if final_chunks else 0,
+            'unique_vectors': len(vectors),
+            'embedding_dimension': int(vectors.shape[1]) if final_chunks else 0,
             'books_covered': len(set([book for chunk in final_chunks for book in chunk['books']])),
             'output_files': {
-                'chunks': str(chunks_file),
+                'chunks': saved['chunks'],
+                'vectors': saved['vectors'],
+                'corpus': saved['corpus'],
+                'artifact': saved['artifact'],
                 'passages': str(passages_file)
             }
         }
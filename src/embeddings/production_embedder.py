@@ -4,9 +4,12 @@ Production-scale embedding processor for all 1,827 bible chunks
 import json
 import numpy as np
 from pathlib import Path
+from typing import Sequence
 from sentence_transformers import SentenceTransformer
 import sys
 sys.path.append('/Users/mekdesyared/Embedding/amharic-bible-embeddings')
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.embeddings.embedding_artifact import save_embedding_artifact, artifact_path_for
 import logging
 
 logger = logging.getLogger(__name__)
@@ -16,10 +19,18 @@ class ProductionEmbedder:
     
     def __init__(self):
         # Use faster, smaller model for production
-        self.model = SentenceTransformer('all-MiniLM-L6-v2', device='cpu')
+        self.model_name = 'all-MiniLM-L6-v2'
+        self.model = SentenceTransformer(self.model_name, device='cpu')
         
-    def process_all_chunks(self, input_file: str, output_file: str, batch_size: int = 50):
-        """Process all chunks with embeddings"""
+    def process_all_chunks(self, input_file: str, output_file: str, batch_size: int = 50, write_jsonl: bool = True,
+                           quantize: Sequence[str] = ()):
+        """
+        Process all chunks with embeddings
+        
+        Always writes a binary artifact (<output>.artifact) next to the output
+        file; the legacy JSONL with inline float lists is optional. `quantize`
+        adds compact copies to the artifact (e.g. ["int8"]).
+        """
         
         print("🔄 Processing ALL 1,827 chunks for production embeddings...")
         
@@ -31,6 +42,7 @@ class ProductionEmbedder:
         
         # Process in batches to manage memory
         processed_chunks = []
+        batch_embeddings = []
         
         for i in range(0, len(chunks), batch_size):
             batch_chunks = chunks[i:i + batch_size]
@@ -40,20 +52,30 @@ class ProductionEmbedder:
             
             # Generate embeddings
             embeddings = self.model.encode(batch_texts, show_progress_bar=False)
+            batch_embeddings.append(embeddings)
             
-            # Add embeddings to chunks
+            # Record embedding info on chunks
             for j, chunk in enumerate(batch_chunks):
-                chunk['embedding'] = embeddings[j].tolist()
                 chunk['embedding_dimension'] = len(embeddings[j])
                 processed_chunks.append(chunk)
         
+        all_embeddings = np.vstack(batch_embeddings)
+        
         # Save all embedded chunks
         output_path = Path(output_file)
         output_path.parent.mkdir(parents=True, exist_ok=True)
         
-        with open(output_path, 'w', encoding='utf-8') as f:
-            for chunk in processed_chunks:
-                f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+        if write_jsonl:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                for chunk, embedding in zip(processed_chunks, all_embeddings):
+                    chunk = {**chunk, 'embedding': embedding.tolist()}
+                    f.write(json.dumps(chunk, ensure_ascii=False) + '\n')
+        
+        # Written after the JSONL so the artifact records the file it mirrors
+        artifact_dir = artifact_path_for(str(output_path))
+        save_embedding_artifact(str(artifact_dir), all_embeddings, processed_chunks, self.model_name,
+                                source=input_file, quantize=quantize,
+                                source_file=str(output_path) if write_jsonl else None)
         
         # Analysis
         books_covered = set(chunk['book'] for chunk in processed_chunks)
@@ -63,6 +85,7 @@ class ProductionEmbedder:
             'books_covered': len(books_covered),
             'embedding_dimension': processed_chunks[0]['embedding_dimension'],
             'output_file': str(output_path),
+            'artifact_dir': str(artifact_dir),
             'sample_books': sorted(list(books_covered))[:10]
         }
         
@@ -0,0 +1,127 @@
+"""
+Embedding quantization helpers (int8 scalar, 1-bit binary codes and PCA-reduced copies) used by embedding artifacts and quantized searchers
+"""
+
+import numpy as np
+from typing import Tuple
+
+
+def quantize_int8(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Per-dimension int8 scalar quantization
+
+    Each dimension is calibrated on its min/max so that
+    x ~= codes * scale + offset.
+
+    Args:
+        matrix: (rows, dimension) float matrix
+
+    Returns:
+        (codes int8 (rows, dimension), scale float32 (dimension,), offset float32 (dimension,))
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+
+    low = matrix.min(axis=0)
+    high = matrix.max(axis=0)
+
+    scale = (high - low) / 255.0
+    scale = np.where(scale == 0, 1.0, scale).astype(np.float32)
+    offset = (low + 128.0 * scale).astype(np.float32)
+
+    codes = np.clip(np.rint((matrix - offset) / scale), -128, 127).astype(np.int8)
+    return codes, scale, offset
+
+
+def dequantize_int8(codes: np.ndarray, scale: np.ndarray, offset: np.ndarray) -> np.ndarray:
+    """Approximate float vectors from int8 codes"""
+    return codes.astype(np.float32) * scale + offset
+
+
+# Set bits of every byte value (np.bitwise_count needs NumPy >= 2.0)
+_POPCOUNT_TABLE = np.array([bin(value).count("1") for value in range(256)], dtype=np.uint8)
+
+
+def quantize_binary(matrix: np.ndarray, threshold: np.ndarray = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    1-bit sign quantization packed 8 dimensions per byte
+
+    Bits are taken against a per-dimension threshold (the column mean by
+    default) so that dimensions with a constant bias still carry information.
+
+    Returns:
+        (packed uint8 codes (rows, ceil(dimension / 8)), threshold float32 (dimension,))
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if threshold is None:
+        threshold = matrix.mean(axis=0)
+
+    threshold = np.asarray(threshold, dtype=np.float32)
+    return np.packbits(matrix > threshold, axis=-1), threshold
+
+
+def hamming_distances(codes: np.ndarray, query_codes: np.ndarray, block_size: int = 65536) -> np.ndarray:
+    """
+    Hamming distance between packed codes and one or more packed queries
+
+    Args:
+        codes: (rows, n_bytes) packed uint8 codes
+        query_codes: (n_bytes,) or (queries, n_bytes) packed uint8 codes
+        block_size: Rows compared per block
+
+    Returns:
+        (rows,) or (queries, rows) uint16 distances
+    """
+    single = query_codes.ndim == 1
+    query_codes = np.atleast_2d(query_codes)
+    distances = np.empty((len(query_codes), len(codes)), dtype=np.uint16)
+
+    for start in range(0, len(codes), block_size):
+        block = codes[start:start + block_size]
+        for i, query in enumerate(query_codes):
+            xor = np.bitwise_xor(block, query)
+            if hasattr(np, "bitwise_count"):
+                bits = np.bitwise_count(xor)
+            else:
+                bits = _POPCOUNT_TABLE[xor]
+            distances[i, start:start + len(block)] = bits.sum(axis=1, dtype=np.uint16)
+
+    return distances[0] if single else distances
+
+
+def fit_pca(matrix: np.ndarray, dimension: int, max_rows: int = 50000, seed: int = 0) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    PCA projection fitted with an SVD of the centered matrix
+
+    Components are ordered by explained variance, so the first d rows of a
+    fit are the d-dimensional fit (lower-dimensional copies reuse them).
+
+    Args:
+        matrix: (rows, dimension) float matrix
+        dimension: Number of components to keep
+        max_rows: Fit on a random sample of at most this many rows
+
+    Returns:
+        (mean float32 (dimension,), components float32 (components, dimension),
+        explained variance ratio of every kept component)
+    """
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if len(matrix) > max_rows:
+        rng = np.random.default_rng(seed)
+        matrix = matrix[np.sort(rng.choice(len(matrix), size=max_rows, replace=False))]
+
+    mean = matrix.mean(axis=0)
+    _, singular_values, components = np.linalg.svd(matrix - mean, full_matrices=False)
+
+    variance = singular_values ** 2
+    ratio = variance / variance.sum() if variance.sum() > 0 else variance
+    return mean.astype(np.float32), components[:dimension].astype(np.float32), ratio[:dimension].astype(np.float32)
+
+
+def project_pca(matrix: np.ndarray, mean: np.ndarray, components: np.ndarray, block_size: int = 65536) -> np.ndarray:
+    """(rows, components) PCA coordinates of a matrix, projected block by block"""
+
+    reduced = np.empty((len(matrix), len(components)), dtype=np.float32)
+    for start in range(0, len(matrix), block_size):
+        block = np.asarray(matrix[start:start + block_size], dtype=np.float32)
+        reduced[start:start + len(block)] = (block - mean) @ components.T
+    return reduced
@@ -97,29 +97,17 @@ class EmbeddingEvaluator:
         if 'error' in stats:
             return {"error": "Could not evaluate book coverage", "details": stats}
         
-        # Sample chunks to analyze book distribution
-        sample_results = self.db.collection.peek(limit=1000)
-        
-        book_distribution = {}
-        testament_counts = {'old': 0, 'new': 0}
-        
-        for metadata in sample_results['metadatas']:
-            books = json.loads(metadata['books'])
-            testament = metadata.get('testament', 'unknown')
-            
-            testament_counts[testament] += 1
-            
-            for book in books:
-                book_distribution[book] = book_distribution.get(book, 0) + 1
-        
+        # Exact per-book and per-testament counts from the collection stats
+        book_distribution = stats['book_distribution']
         total_books_found = len(book_distribution)
         
         return {
             "total_books_covered": total_books_found,
             "target_books": 72,
             "coverage_ratio": total_books_found / 72,
-            "book_distribution": dict(sorted(book_distribution.items())),
-            "testament_distribution": testament_counts,
+            "book_distribution": book_distribution,
+            "testament_distribution": stats['testament_distribution'],
+            "chapters_covered": stats['chapters_covered'],
             "coverage_assessment": {
                 "status": "Complete" if total_books_found >= 70 else "Incomplete",
                 "missing_count": max(0, 72 - total_books_found)
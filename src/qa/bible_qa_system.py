@@ -6,8 +6,13 @@ import sys
 sys.path.append('/Users/mekdesyared/Embedding/amharic-bible-embeddings')
 
 from src.vector_db.chroma_manager import ChromaBibleDB
+from src.retrieval.vector_index import load_bible_index
+from src.retrieval.query_encoder import get_query_encoder
+from src.service.client import get_search_client
 from config.llm_config import llm_manager
+from config.settings import settings, EMBEDDINGS_DIR
 import asyncio
+import numpy as np
 from typing import List, Dict, Any, Optional
 import logging
 
@@ -18,29 +23,47 @@ class AmharicBibleQA:
     Question-Answering system for the Amharic Bible using late chunking embeddings
     """
     
-    def __init__(self, chroma_db_path: str = "./data/embeddings/chroma_db"):
-        """Initialize Q&A system"""
+    def __init__(self,
+                 chroma_db_path: str = "./data/embeddings/chroma_db",
+                 embeddings_file: Optional[str] = str(EMBEDDINGS_DIR / "fixed_structured_embeddings.jsonl")):
+        """
+        Initialize Q&A system
+        
+        Args:
+            chroma_db_path: ChromaDB persistence directory
+            embeddings_file: Verse embeddings (JSONL or artifact) used for per-book
+                search; a canonically ordered artifact makes each book a slice.
+                None (or a missing file) searches ChromaDB instead
+        """
         self.db = ChromaBibleDB(chroma_db_path)
         self.db.create_collection()
         self.llm_manager = llm_manager
+        self.embeddings_file = embeddings_file
         
     async def ask_question(self, 
                           question: str, 
                           max_results: int = 5,
                           book_filter: Optional[List[str]] = None,
-                          testament_filter: Optional[str] = None) -> Dict[str, Any]:
+                          testament_filter: Optional[str] = None,
+                          search_results: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Ask a question about the Bible and get contextual answers
+        
+        search_results can carry passages already retrieved for the question
+        (e.g. by a batched search), in which case no search is run.
         """
         
         try:
             # Step 1: Semantic search for relevant passages
-            search_results = self.db.semantic_search(
-                query=question,
-                n_results=max_results,
-                book_filter=book_filter,
-                testament_filter=testament_filter
-            )
+            if search_results is None:
+                query_embeddings = self._service_embeddings([question])
+                search_results = self.db.semantic_search(
+                    query=question,
+                    n_results=max_results,
+                    book_filter=book_filter,
+                    testament_filter=testament_filter,
+                    query_embedding=None if query_embeddings is None else query_embeddings[0]
+                )
             
             if not search_results:
                 return {
@@ -106,6 +129,25 @@ Answer in English but preserve important Amharic terms. Be thorough but concise.
                 "success": False
             }
     
+    def _service_embeddings(self, questions: List[str]) -> Optional[np.ndarray]:
+        """
+        Question vectors from the search service's resident model, so no model is loaded here
+        
+        None (encode in-process) without a configured service, or when the
+        service's model is not the one that produced the collection.
+        """
+        client = get_search_client()
+        if client is None:
+            return None
+        
+        try:
+            if client.model() != self.db.embedding_model():
+                return None
+            return client.encode(questions)
+        except Exception as e:
+            logger.warning(f"Search service could not embed the questions, encoding in-process: {e}")
+            return None
+    
     def _create_basic_answer(self, question: str, results: List[Dict]) -> str:
         """Create basic answer when LLM is unavailable"""
         
@@ -126,7 +168,15 @@ Answer in English but preserve important Amharic terms. Be thorough but concise.
     async def ask_multiple_questions(self, questions: List[str]) -> List[Dict[str, Any]]:
         """Process multiple questions efficiently"""
         
-        tasks = [self.ask_question(q) for q in questions]
+        # One batched retrieval for all questions, then answers in parallel
+        try:
+            passages = self.db.semantic_search_many(
+                questions, n_results=5, query_embeddings=self._service_embeddings(questions))
+        except Exception as e:
+            logger.warning(f"Batched search failed, searching per question: {e}")
+            passages = [None] * len(questions)
+        
+        tasks = [self.ask_question(q, search_results=p) for q, p in zip(questions, passages)]
         results = await asyncio.gather(*tasks, return_exceptions=True)
         
         # Handle any exceptions
@@ -147,6 +197,38 @@ Answer in English but preserve important Amharic terms. Be thorough but concise.
     def search_by_book(self, book_name: str, max_results: int = 10) -> List[Dict[str, Any]]:
         """Search for passages from a specific book"""
         
+        client = get_search_client()
+        if client is not None:
+            # The search service already holds the model and the book row sets
+            return [
+                {
+                    'document': hit['record'].get('text', ''),
+                    'metadata': hit['record'],
+                    'distance': 1 - hit['similarity'],
+                    'similarity': hit['similarity'],
+                    'books': [book_name]
+                }
+                for hit in client.search(book_name, max_results, min_similarity=None, book_filter=[book_name])
+            ]
+        
+        index = load_bible_index(self.embeddings_file) if self.embeddings_file else None
+        if index is not None and book_name in index.filters.book_rows:
+            # Only the book's rows are scored (a zero-copy slice in canonical order)
+            rows = index.filters.select([book_name])
+            # Queries must be embedded by the model that produced the index
+            model_name = (index.manifest or {}).get('model', settings.EMBEDDING_MODEL)
+            query_embedding = get_query_encoder(model_name).encode_one(book_name)
+            return [
+                {
+                    'document': index.records[row_id].get('text', ''),
+                    'metadata': index.records[row_id],
+                    'distance': 1 - similarity,
+                    'similarity': similarity,
+                    'books': [book_name]
+                }
+                for row_id, similarity in index.top_k(query_embedding, max_results, mask=rows)
+            ]
+        
         return self.db.semantic_search(
             query=book_name,
             n_results=max_results,
@@ -0,0 +1,185 @@
+"""
+Sparse BM25 index over Ge'ez-aware tokens of the Bible records
+Term weights are precomputed into a SciPy CSR matrix, so scoring a query
+is a single sparse matrix-vector product
+"""
+
+import re
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from scipy import sparse
+
+from src.preprocessing.amharic_cleaner import amharic_cleaner
+from src.retrieval.filters import rows_of
+
+logger = logging.getLogger(__name__)
+
+# Ethiopic and Latin words; Ethiopic punctuation (U+1361-U+1368) is not \w
+_WORD_PATTERN = re.compile(r"\w+")
+
+# Ge'ez numerals (U+1369-U+137C) and Arabic digits are verse numbers, not terms
+_NUMERAL_PATTERN = re.compile(r"^[\d፩-፼]+$")
+
+# Common Amharic proclitics / enclitics stripped to add a stem form of a word
+_PREFIXES = ("እንደ", "ስለ", "ወደ", "በ", "ለ", "ከ", "የ")
+_SUFFIXES = ("ን", "ም", "ና")
+
+
+def _stem(token: str) -> str:
+    """Token with one common prefix and suffix removed (unchanged when too short)"""
+
+    stem = token
+    for prefix in _PREFIXES:
+        if stem.startswith(prefix) and len(stem) - len(prefix) >= 2:
+            stem = stem[len(prefix):]
+            break
+    for suffix in _SUFFIXES:
+        if stem.endswith(suffix) and len(stem) - len(suffix) >= 2:
+            stem = stem[:-len(suffix)]
+            break
+    return stem
+
+
+def tokenize_amharic(text: str) -> List[str]:
+    """
+    Lexical terms of a text
+
+    Applies the AmharicCleaner normalization (NFC, Fidel variants), splits
+    on whitespace and Ethiopic punctuation, drops numerals and adds the
+    stem of words carrying a common prefix/suffix (በፍቅር -> በፍቅር, ፍቅር).
+    """
+    text = amharic_cleaner.normalize_unicode(text or "")
+    text = amharic_cleaner.handle_fidel_variations(text).lower()
+
+    tokens = []
+    for token in _WORD_PATTERN.findall(text):
+        if _NUMERAL_PATTERN.match(token):
+            continue
+        tokens.append(token)
+        stem = _stem(token)
+        if stem != token:
+            tokens.append(stem)
+
+    return tokens
+
+
+class BM25Index:
+    """
+    Okapi BM25 over the record texts of a Bible index
+
+    The (rows, vocabulary) CSR matrix holds the full BM25 weight of every
+    term occurrence (idf and length normalization included), so a query's
+    scores are weights @ query_term_counts.
+    """
+
+    def __init__(self,
+                 records: List[Dict[str, Any]],
+                 text_key: str = "text",
+                 k1: float = 1.5,
+                 b: float = 0.75):
+        """
+        Args:
+            records: Row metadata aligned with the dense index rows
+            text_key: Record field holding the text
+            k1: Term-frequency saturation
+            b: Document-length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+
+        indptr = [0]
+        indices: List[int] = []
+        counts: List[int] = []
+
+        for record in records:
+            term_counts: Dict[int, int] = {}
+            for token in tokenize_amharic(record.get(text_key, "")):
+                term_id = self.vocabulary.setdefault(token, len(self.vocabulary))
+                term_counts[term_id] = term_counts.get(term_id, 0) + 1
+
+            indices.extend(term_counts)
+            counts.extend(term_counts.values())
+            indptr.append(len(indices))
+
+        n_rows = len(records)
+        tf = sparse.csr_matrix(
+            (np.asarray(counts, dtype=np.float32), np.asarray(indices, dtype=np.int32), np.asarray(indptr, dtype=np.int64)),
+            shape=(n_rows, len(self.vocabulary))
+        )
+
+        doc_lengths = np.asarray(tf.sum(axis=1)).reshape(-1)
+        avg_length = doc_lengths.mean() if n_rows and doc_lengths.mean() > 0 else 1.0
+        doc_freq = np.bincount(tf.indices, minlength=len(self.vocabulary))
+        self.idf = np.log(1.0 + (n_rows - doc_freq + 0.5) / (doc_freq + 0.5)).astype(np.float32)
+
+        # BM25 weight of every stored (row, term) entry
+        row_norm = k1 * (1.0 - b + b * doc_lengths / avg_length)
+        row_of_entry = np.repeat(np.arange(n_rows), np.diff(tf.indptr))
+        tf.data = (self.idf[tf.indices] * tf.data * (k1 + 1.0) / (tf.data + row_norm[row_of_entry])).astype(np.float32)
+
+        self.weights = tf
+        logger.info(f"Built BM25 index: {n_rows} rows, {len(self.vocabulary)} terms, {tf.nnz} entries")
+
+    def __len__(self) -> int:
+        return self.weights.shape[0]
+
+    def query_vector(self, query: str) -> np.ndarray:
+        """Term-count vector of a query over the index vocabulary"""
+
+        vector = np.zeros(len(self.vocabulary), dtype=np.float32)
+        for token in tokenize_amharic(query):
+            term_id = self.vocabulary.get(token)
+            if term_id is not None:
+                vector[term_id] += 1.0
+        return vector
+
+    def score(self, query: str, rows=None) -> np.ndarray:
+        """BM25 score of the query against all rows (or the given row ids / slice)"""
+
+        weights = self.weights if rows is None else self.weights[rows]
+        return weights @ self.query_vector(query)
+
+    def top_k(self,
+              query: str,
+              k: int = 5,
+              mask=None) -> List[Tuple[int, float]]:
+        """
+        Rows with the highest BM25 score
+
+        Args:
+            query: Query text
+            k: Number of results
+            mask: Optional selection of eligible rows (see BibleFilterIndex.select)
+
+        Returns:
+            List of (row_id, score) sorted by descending score; rows sharing
+            no term with the query are left out
+        """
+        if isinstance(mask, slice):
+            rows = np.arange(mask.start, mask.stop)
+        elif mask is not None:
+            rows = rows_of(mask)
+        else:
+            rows = None
+
+        if k <= 0 or (rows is not None and len(rows) == 0):
+            return []
+
+        scores = self.score(query, mask if isinstance(mask, slice) else rows)
+
+        hits = np.flatnonzero(scores > 0)
+        if len(hits) > k:
+            hits = hits[np.argpartition(-scores[hits], k - 1)[:k]]
+        hits = hits[np.argsort(-scores[hits], kind="stable")]
+
+        return [
+            (int(rows[position]) if rows is not None else int(position), float(scores[position]))
+            for position in hits
+        ]
+
@@ -0,0 +1,268 @@
+"""
+Cascaded two-stage search: a small model retrieves candidates, the index model ranks them
+The first stage scans row-aligned vectors of a cheap model (all-MiniLM-L6-v2,
+384-d); only its top candidates are re-scored against the precomputed
+vectors of the index model (paraphrase-multilingual-mpnet-base-v2, 768-d)
+"""
+
+import threading
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from src.retrieval.vector_index import BibleVectorIndex
+from src.retrieval.filters import rows_of
+from src.retrieval.query_encoder import get_query_encoder
+
+logger = logging.getLogger(__name__)
+
+# Cascades are shared between tools living in the same process (kept in base.searchers)
+_CASCADE_LOCK = threading.Lock()
+
+
+class CascadeBibleIndex:
+    """
+    First-stage vectors of a small model in front of an exact index
+
+    The query is embedded with both models: the small one drives the scan
+    over all eligible rows, the index model's embedding re-scores the
+    `candidates` best rows. Similarities and min_similarity are those of the
+    index model, so results are comparable with dense search.
+    """
+
+    def __init__(self,
+                 base: BibleVectorIndex,
+                 first_stage: np.ndarray,
+                 model_name: str,
+                 candidates: int = 200):
+        """
+        Args:
+            base: Exact index (index model vectors, records, filters)
+            first_stage: (rows, dimension) L2-normalized small-model vectors aligned with base rows
+            model_name: Small model that produced first_stage (and embeds the queries)
+            candidates: Rows passed from the first stage to re-scoring
+        """
+        if len(first_stage) != len(base):
+            raise ValueError(f"First-stage vectors have {len(first_stage)} rows, index has {len(base)}")
+
+        self.base = base
+        self.first_stage = first_stage
+        self.model_name = model_name
+        self.candidates = candidates
+        self.encoder = get_query_encoder(model_name)
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def _first_stage_scores(self, queries: np.ndarray, mask) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """(queries, eligible rows) first-stage scores and the eligible row ids (None for all rows)"""
+
+        if isinstance(mask, slice):
+            return queries @ self.first_stage[mask].T, np.arange(mask.start, mask.stop)
+
+        if mask is not None:
+            rows = rows_of(mask)
+            return queries @ self.first_stage[rows].T, rows
+
+        return queries @ self.first_stage.T, None
+
+    def _rescore(self,
+                 query_embedding: np.ndarray,
+                 scores: np.ndarray,
+                 rows: Optional[np.ndarray],
+                 k: int,
+                 min_similarity: Optional[float]) -> List[Tuple[int, float]]:
+        """Re-score a query's first-stage candidates with the index model"""
+
+        if len(scores) == 0:
+            return []
+
+        candidates = min(max(self.candidates, k), len(scores))
+        if candidates < len(scores):
+            positions = np.argpartition(-scores, candidates - 1)[:candidates]
+        else:
+            positions = np.arange(len(scores))
+
+        candidate_rows = rows[positions] if rows is not None else positions
+        similarities = self.base.score(query_embedding, candidate_rows)
+        return self.base._select_top_k(similarities, k, min_similarity, candidate_rows)
+
+    def top_k_many_with_report(self,
+                               queries: List[str],
+                               query_embeddings: np.ndarray,
+                               k: int = 5,
+                               min_similarity: Optional[float] = None,
+                               mask=None) -> Tuple[List[List[Tuple[int, float]]], Dict[str, Any]]:
+        """
+        Cascaded top-k for a batch of queries
+
+        Args:
+            queries: Query texts (embedded with the small model)
+            query_embeddings: (queries, dimension) index-model query vectors
+            k, min_similarity, mask: As in BibleVectorIndex.top_k
+
+        Returns:
+            (one result list per query, per-stage report with timings in ms)
+        """
+        started = time.perf_counter()
+        first_stage_queries = self._normalize(self.encoder.encode(list(queries)))
+        encoded = time.perf_counter()
+
+        scores, rows = self._first_stage_scores(first_stage_queries, mask)
+        scanned = time.perf_counter()
+
+        query_embeddings = np.atleast_2d(query_embeddings)
+        results = [self._rescore(query_embedding, query_scores, rows, k, min_similarity)
+                   for query_embedding, query_scores in zip(query_embeddings, scores)]
+        rescored = time.perf_counter()
+
+        return results, {
+            'first_stage_model': self.model_name,
+            'queries': len(queries),
+            'rows_scanned': int(scores.shape[1]),
+            'candidates': min(max(self.candidates, k), int(scores.shape[1])),
+            'first_stage_encode_ms': 1000 * (encoded - started),
+            'first_stage_scan_ms': 1000 * (scanned - encoded),
+            'rescore_ms': 1000 * (rescored - scanned)
+        }
+
+    def top_k_with_report(self,
+                          query: str,
+                          query_embedding: np.ndarray,
+                          k: int = 5,
+                          min_similarity: Optional[float] = None,
+                          mask=None) -> Tuple[List[Tuple[int, float]], Dict[str, Any]]:
+        """Cascaded top-k of one query with its per-stage report"""
+
+        results, report = self.top_k_many_with_report([query], query_embedding, k, min_similarity, mask)
+        return results[0], report
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        vectors = np.atleast_2d(np.asarray(vectors, dtype=np.float32))
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    def recall_report(self, queries: List[str], query_embeddings: np.ndarray, k: int = 10) -> Dict[str, Any]:
+        """Recall@k of the cascade against exact index-model search, with stage timings"""
+
+        exact_started = time.perf_counter()
+        exact = self.base.top_k_many(query_embeddings, k)
+        exact_ms = 1000 * (time.perf_counter() - exact_started)
+
+        results, report = self.top_k_many_with_report(queries, query_embeddings, k)
+
+        hits = sum(len({row_id for row_id, _ in expected} & {row_id for row_id, _ in found})
+                   for expected, found in zip(exact, results))
+        total = sum(len(expected) for expected in exact)
+
+        return {
+            **report,
+            'k': k,
+            f'recall@{k}': hits / total if total else 0.0,
+            'exact_scan_ms': exact_ms,
+            'first_stage_bytes': int(self.first_stage.nbytes),
+            'index_bytes': len(self.base) * self.base.dimension * 4
+        }
+
+
+def encode_first_stage(base: BibleVectorIndex, model_name: str, batch_size: int = 64) -> np.ndarray:
+    """Embed every record text of the index with the small model (row-aligned)"""
+
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name)
+    # Reuse the loaded model for query encoding
+    get_query_encoder(model_name, model=model)
+
+    texts = [record.get('text', '') for record in base.records]
+    logger.info(f"Encoding {len(texts)} rows with first-stage model {model_name}")
+    return np.asarray(model.encode(texts, batch_size=batch_size, show_progress_bar=True), dtype=np.float32)
+
+
+def load_or_build_cascade(base: BibleVectorIndex,
+                          model_name: str,
+                          candidates: int = 200,
+                          build: bool = True) -> CascadeBibleIndex:
+    """
+    Cascade over an index, with the first-stage vectors stored in its artifact
+
+    Vectors missing from the artifact are encoded once and added to it; an
+    index without an artifact keeps them in memory only. Encoding the corpus
+    takes minutes, so request handlers pass build=False and get a ValueError
+    until the vectors are built with `python -m src.retrieval.cascade_index`.
+    Loading and building run under a lock, so concurrent callers never
+    encode the corpus twice.
+    """
+    cache_key = f"cascade:{model_name}"
+
+    with _CASCADE_LOCK:
+        cascade = base.searchers.get(cache_key)
+        if cascade is not None:
+            cascade.candidates = candidates
+            return cascade
+
+        stored = (base.manifest or {}).get('first_stage', {}).get(model_name)
+        if base.path is not None and stored:
+            first_stage = np.load(Path(base.path) / stored['file'], mmap_mode='r')
+        elif not build:
+            raise ValueError(f"No {model_name} first-stage vectors for this index; build them with "
+                             f"python -m src.retrieval.cascade_index (the embeddings need an artifact)")
+        else:
+            first_stage = CascadeBibleIndex._normalize(encode_first_stage(base, model_name))
+            if base.path is not None:
+                from src.embeddings.embedding_artifact import add_first_stage
+
+                base.manifest = add_first_stage(str(base.path), model_name, first_stage)
+                logger.info(f"Added {model_name} first-stage vectors to {base.path}")
+            else:
+                logger.info("First-stage vectors kept in memory (convert the embeddings to an artifact to persist them)")
+
+        cascade = CascadeBibleIndex(base, first_stage, model_name, candidates)
+        base.searchers[cache_key] = cascade
+        return cascade
+
+
+def main():
+    """Build the first-stage vectors for an embeddings file and compare the cascade with exact search"""
+
+    import argparse
+    from config.settings import settings
+    from src.retrieval.vector_index import load_bible_index
+
+    parser = argparse.ArgumentParser(description="Build cascade first-stage vectors and report recall")
+    parser.add_argument("embeddings", nargs="?", default="data/embeddings/fixed_structured_embeddings.jsonl")
+    parser.add_argument("--model", default=settings.CASCADE_MODEL, help="First-stage model")
+    parser.add_argument("--candidates", type=int, default=settings.CASCADE_CANDIDATES)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--sample", type=int, default=100, help="Record texts used as queries")
+    args = parser.parse_args()
+
+    base = load_bible_index(args.embeddings)
+    if base is None:
+        print(f"❌ Embeddings not found: {args.embeddings}")
+        return
+
+    cascade = load_or_build_cascade(base, args.model, args.candidates)
+
+    rng = np.random.default_rng(0)
+    sample = np.sort(rng.choice(len(base), size=min(args.sample, len(base)), replace=False))
+    queries = [base.records[row_id].get('text', '') for row_id in sample]
+    query_embeddings = get_query_encoder(settings.EMBEDDING_MODEL).encode(queries)
+
+    report = cascade.recall_report(queries, query_embeddings, k=args.k)
+    print("Cascade recall report:")
+    for key, value in report.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+"""
+Metadata filter engine for the Bible vector index
+Precomputes per-book, per-testament and per-chapter row sets so filters
+select eligible rows before any scoring happens
+
+A selection is None (all rows), a slice (contiguous rows, e.g. a book of a
+canonically ordered artifact), an array of row ids or a boolean mask.
+"""
+
+import numpy as np
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def rows_of(selection) -> np.ndarray:
+    """Row ids of a filter selection (slice, boolean mask or array of row ids)"""
+
+    if isinstance(selection, slice):
+        return np.arange(selection.start, selection.stop, dtype=np.int32)
+
+    selection = np.asarray(selection)
+    if selection.dtype == bool:
+        return np.flatnonzero(selection)
+    return selection
+
+
+def mask_of(selection, n_rows: int) -> np.ndarray:
+    """Boolean mask of a filter selection (slice, boolean mask or array of row ids)"""
+
+    if not isinstance(selection, slice):
+        selection = np.asarray(selection)
+        if selection.dtype == bool:
+            return selection
+
+    mask = np.zeros(n_rows, dtype=bool)
+    mask[selection] = True
+    return mask
+
+
+class BibleFilterIndex:
+    """
+    Precomputed row sets for book / testament / chapter filters
+
+    Each book, testament and (book, chapter) pair maps to a sorted int32
+    array of row ids, and each testament also keeps a bitmap for cheap
+    intersection. Combined selections are memoized, so a repeated filter
+    such as "Gospels only" costs one dictionary lookup, and selections that
+    cover a contiguous block of rows (books and testaments of a canonically
+    ordered artifact) are returned as slices.
+    """
+
+    def __init__(self, records: List[Dict[str, Any]], cache_size: int = 256, layout: Optional[Dict[str, Any]] = None):
+        """
+        Args:
+            records: Row metadata of the index (book, chapter, testament)
+            cache_size: Number of combined selections kept
+            layout: Artifact manifest "layout" (row ranges of a canonically
+                ordered artifact); used instead of scanning the records when
+                it covers every row
+        """
+        self.n_rows = len(records)
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple, Any]" = OrderedDict()
+
+        row_sets = self._rows_from_layout(layout) if layout else None
+        if row_sets is None:
+            row_sets = self._rows_from_records(records)
+
+        self.book_rows, self.chapter_rows, self.testament_rows = row_sets
+        self.testament_bitmaps = {name: mask_of(rows, self.n_rows) for name, rows in self.testament_rows.items()}
+
+    def _rows_from_layout(self, layout: Dict[str, Any]) -> Optional[Tuple[Dict, Dict, Dict]]:
+        """Row sets from the layout's [start, end) ranges (None unless books, chapters and testaments cover every row)"""
+
+        sections = [layout.get(name) or {} for name in ('books', 'chapters', 'testaments')]
+        if any(sum(end - start for start, end in ranges.values()) != self.n_rows for ranges in sections):
+            return None
+
+        def rows(start: int, end: int) -> np.ndarray:
+            return np.arange(start, end, dtype=np.int32)
+
+        books, chapters, testaments = sections
+        chapter_rows = {}
+        for key, (start, end) in chapters.items():
+            book, chapter = key.rsplit(':', 1)
+            # Chapter filters only cover integer chapters (as when scanning records)
+            if chapter.lstrip('-').isdigit():
+                chapter_rows[(book, int(chapter))] = rows(start, end)
+
+        return ({book: rows(*span) for book, span in books.items()},
+                chapter_rows,
+                {name: rows(*span) for name, span in testaments.items()})
+
+    @staticmethod
+    def _rows_from_records(records: List[Dict[str, Any]]) -> Tuple[Dict, Dict, Dict]:
+        """Row sets from one pass over the records"""
+
+        book_rows: Dict[str, List[int]] = {}
+        chapter_rows: Dict[Tuple[str, int], List[int]] = {}
+        testament_rows: Dict[str, List[int]] = {}
+
+        for row_id, record in enumerate(records):
+            book = record.get("book")
+            if isinstance(book, str):
+                book_rows.setdefault(book, []).append(row_id)
+                chapter = record.get("chapter")
+                if isinstance(chapter, int):
+                    chapter_rows.setdefault((book, chapter), []).append(row_id)
+
+            testament = record.get("testament")
+            if testament is not None:
+                testament_rows.setdefault(testament, []).append(row_id)
+
+        return ({book: np.asarray(rows, dtype=np.int32) for book, rows in book_rows.items()},
+                {key: np.asarray(rows, dtype=np.int32) for key, rows in chapter_rows.items()},
+                {name: np.asarray(rows, dtype=np.int32) for name, rows in testament_rows.items()})
+
+    @property
+    def books(self) -> List[str]:
+        return list(self.book_rows)
+
+    def select(self,
+               books: Optional[Iterable[str]] = None,
+               testament: Optional[str] = None,
+               chapters: Optional[Iterable[int]] = None):
+        """
+        Rows matching all given filters
+
+        Args:
+            books: Book names (any of)
+            testament: Testament name ('old' or 'new')
+            chapters: Chapter numbers (any of) within the selected books
+
+        Returns:
+            A slice for contiguous rows, otherwise sorted int32 row ids;
+            None when no filter is given (every row is eligible)
+        """
+        books = tuple(sorted(set(books))) if books else None
+        chapters = tuple(sorted({int(chapter) for chapter in chapters})) if chapters else None
+
+        if books is None and testament is None and chapters is None:
+            return None
+
+        key = (books, testament, chapters)
+        if key in self._cache:
+            self._cache.move_to_end(key)
+            return self._cache[key]
+
+        rows = self._as_slice(self._select(books, testament, chapters))
+
+        self._cache[key] = rows
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+        return rows
+
+    @staticmethod
+    def _as_slice(rows: np.ndarray):
+        """Contiguous row ids as a slice (zero-copy on the matrix), anything else unchanged"""
+
+        if len(rows) and int(rows[-1]) - int(rows[0]) + 1 == len(rows):
+            return slice(int(rows[0]), int(rows[-1]) + 1)
+        return rows
+
+    def _select(self,
+                books: Optional[Tuple[str, ...]],
+                testament: Optional[str],
+                chapters: Optional[Tuple[int, ...]]) -> np.ndarray:
+        """Compute a selection from the precomputed row sets"""
+
+        empty = np.empty(0, dtype=np.int32)
+
+        if books is not None:
+            if chapters is not None:
+                parts = [self.chapter_rows.get((book, chapter), empty) for book in books for chapter in chapters]
+            else:
+                parts = [self.book_rows.get(book, empty) for book in books]
+            rows = np.sort(np.concatenate(parts)) if parts else empty
+
+        elif chapters is not None:
+            parts = [rows for (_, chapter), rows in self.chapter_rows.items() if chapter in chapters]
+            rows = np.sort(np.concatenate(parts)) if parts else empty
+
+        else:
+            # Testament only: the precomputed rows are the answer
+            return self.testament_rows.get(testament, empty)
+
+        if testament is not None:
+            bitmap = self.testament_bitmaps.get(testament)
+            rows = rows[bitmap[rows]] if bitmap is not None else empty
+
+        return rows
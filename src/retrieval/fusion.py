@@ -0,0 +1,80 @@
+"""
+Rank fusion of result lists from different retrievers
+Reciprocal-rank fusion only looks at ranks, so dense cosine similarities
+and BM25 scores can be combined without calibrating them
+"""
+
+import numpy as np
+from typing import List, Dict, Hashable, Optional, Sequence, Tuple
+
+
+def reciprocal_rank_fusion(rankings: Sequence[Sequence[Tuple[Hashable, float]]],
+                           k: int = 60,
+                           weights: Optional[Sequence[float]] = None,
+                           limit: Optional[int] = None) -> List[Tuple[Hashable, float]]:
+    """
+    Fuse ranked result lists with RRF: score(d) = sum_i w_i / (k + rank_i(d))
+
+    Args:
+        rankings: Result lists of (item_id, score), each sorted best first
+        k: RRF smoothing constant (60 in the original paper)
+        weights: Optional weight per ranking (default 1.0 each)
+        limit: Number of fused results to return (all when None)
+
+    Returns:
+        List of (item_id, fused_score) sorted by descending fused score;
+        ties keep the order in which items were first seen
+    """
+    weights = weights or [1.0] * len(rankings)
+    fused: Dict[Hashable, float] = {}
+
+    for ranking, weight in zip(rankings, weights):
+        for rank, (item_id, _) in enumerate(ranking, start=1):
+            fused[item_id] = fused.get(item_id, 0.0) + weight / (k + rank)
+
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    return ordered[:limit] if limit is not None else ordered
+
+
+def hybrid_top_k(index,
+                 searcher,
+                 query: str,
+                 query_embedding: np.ndarray,
+                 k: int = 5,
+                 min_similarity: Optional[float] = None,
+                 mask=None,
+                 candidates: int = 50,
+                 rrf_k: int = 60) -> Tuple[List[Tuple[int, float]], List[float]]:
+    """
+    Dense and BM25 candidates of a BibleVectorIndex fused with RRF
+
+    min_similarity only applies to the dense candidates, so exact keyword
+    matches (names, short words) are kept even when their embedding
+    similarity is low.
+
+    Args:
+        index: BibleVectorIndex (BM25 index and exact re-scoring)
+        searcher: Dense searcher over the index rows
+        query: Query text for BM25
+        query_embedding: Query vector for the dense searcher
+        k: Number of fused results
+        min_similarity: Dense similarity threshold
+        mask: Optional selection of eligible rows
+        candidates: Candidates taken from each ranking
+        rrf_k: RRF smoothing constant
+
+    Returns:
+        (row_id, cosine similarity) matches in fused order and their fusion scores
+    """
+    candidates = max(candidates, k)
+    dense = searcher.top_k(query_embedding, candidates, min_similarity, mask)
+    lexical = index.lexical.top_k(query, candidates, mask)
+
+    fused = reciprocal_rank_fusion([dense, lexical], k=rrf_k, limit=k)
+    if not fused:
+        return [], []
+
+    rows = np.asarray([row_id for row_id, _ in fused], dtype=np.int64)
+    similarities = index.score(query_embedding, rows)
+    matches = [(int(row_id), float(similarity)) for row_id, similarity in zip(rows, similarities)]
+    return matches, [fusion_score for _, fusion_score in fused]
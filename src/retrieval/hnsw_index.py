@@ -0,0 +1,281 @@
+"""
+HNSW approximate nearest-neighbor index for verse-level Bible search
+Built on top of BibleVectorIndex; requires the optional hnswlib package
+"""
+
+import json
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from src.retrieval.vector_index import BibleVectorIndex
+
+try:
+    import hnswlib
+    HAS_HNSWLIB = True
+except ImportError:
+    HAS_HNSWLIB = False
+
+logger = logging.getLogger(__name__)
+
+HNSW_INDEX_FILE = "hnsw.bin"
+HNSW_PARAMS_FILE = "hnsw.json"
+
+
+class HNSWBibleIndex:
+    """
+    HNSW graph index over the rows of a BibleVectorIndex
+
+    Unfiltered queries walk the graph; filtered queries fall back to exact
+    scoring of the eligible rows on the base index.
+    """
+
+    def __init__(self,
+                 base: BibleVectorIndex,
+                 M: int = 16,
+                 ef_construction: int = 200,
+                 ef_search: int = 64):
+        """
+        Args:
+            base: Exact index holding the normalized matrix and records
+            M: Graph out-degree (higher = better recall, more memory)
+            ef_construction: Candidate list size while building
+            ef_search: Candidate list size while querying (must be >= k)
+        """
+        if not HAS_HNSWLIB:
+            raise ImportError("hnswlib is required for HNSW search: pip install hnswlib")
+
+        self.base = base
+        self.M = M
+        self.ef_construction = ef_construction
+        self.ef_search = ef_search
+        self.graph = None
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def build(self) -> "HNSWBibleIndex":
+        """Build the graph from the base matrix"""
+
+        start = time.perf_counter()
+
+        self.graph = hnswlib.Index(space='ip', dim=self.base.dimension)
+        self.graph.init_index(max_elements=len(self.base), M=self.M, ef_construction=self.ef_construction)
+        self.graph.add_items(np.asarray(self.base.matrix), np.arange(len(self.base)))
+        self.graph.set_ef(self.ef_search)
+
+        logger.info(f"Built HNSW index over {len(self.base)} rows in {time.perf_counter() - start:.1f}s "
+                    f"(M={self.M}, ef_construction={self.ef_construction})")
+        return self
+
+    def set_ef_search(self, ef_search: int) -> None:
+        """Change the query-time candidate list size"""
+        self.ef_search = ef_search
+        if self.graph is not None:
+            self.graph.set_ef(ef_search)
+
+    def save(self, index_dir: str) -> None:
+        """Persist the graph and its parameters"""
+
+        path = Path(index_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        self.graph.save_index(str(path / HNSW_INDEX_FILE))
+        with open(path / HNSW_PARAMS_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'M': self.M,
+                'ef_construction': self.ef_construction,
+                'ef_search': self.ef_search,
+                'rows': len(self.base),
+                'dimension': self.base.dimension,
+                'base_version': self.base.version
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls, base: BibleVectorIndex, index_dir: str, ef_search: Optional[int] = None) -> Optional["HNSWBibleIndex"]:
+        """Load a persisted graph; returns None when it is missing or stale"""
+
+        path = Path(index_dir)
+        if not (path / HNSW_INDEX_FILE).exists() or not (path / HNSW_PARAMS_FILE).exists():
+            return None
+
+        with open(path / HNSW_PARAMS_FILE, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+
+        if (params['rows'] != len(base) or params['dimension'] != base.dimension or
+                params.get('base_version') != base.version):
+            logger.info(f"Stale HNSW index in {path}, rebuild required")
+            return None
+
+        index = cls(base, params['M'], params['ef_construction'], ef_search or params['ef_search'])
+        index.graph = hnswlib.Index(space='ip', dim=base.dimension)
+        index.graph.load_index(str(path / HNSW_INDEX_FILE), max_elements=len(base))
+        index.graph.set_ef(index.ef_search)
+        return index
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Approximate top-k; same contract as BibleVectorIndex.top_k"""
+
+        if mask is not None:
+            return self.base.top_k(query_embedding, k, min_similarity, mask)
+
+        k = min(k, len(self.base))
+        if k <= 0:
+            return []
+
+        return self._knn(self.base.normalize_query(query_embedding)[None, :], k, min_similarity)[0]
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """Batched top-k: one knn_query call for all queries"""
+
+        if mask is not None:
+            return self.base.top_k_many(query_embeddings, k, min_similarity, mask)
+
+        queries = self.base.normalize_queries(query_embeddings)
+        k = min(k, len(self.base))
+        if k <= 0:
+            return [[] for _ in range(len(queries))]
+
+        return self._knn(queries, k, min_similarity)
+
+    def _knn(self, queries: np.ndarray, k: int, min_similarity: Optional[float]) -> List[List[Tuple[int, float]]]:
+        """Graph search for normalized (queries, dimension) vectors"""
+
+        if self.ef_search < k:
+            self.graph.set_ef(k)
+
+        labels, distances = self.graph.knn_query(queries, k=k)
+
+        if self.ef_search < k:
+            self.graph.set_ef(self.ef_search)
+
+        all_results = []
+        for query_labels, query_distances in zip(labels, distances):
+            results = []
+            for row_id, distance in zip(query_labels, query_distances):
+                # Inner-product space reports 1 - <q, x>
+                similarity = float(1.0 - distance)
+                if min_similarity is not None and similarity < min_similarity:
+                    break
+                results.append((int(row_id), similarity))
+            all_results.append(results)
+
+        return all_results
+
+    def recall_report(self, queries: Optional[np.ndarray] = None, k: int = 10, sample_size: int = 200) -> Dict[str, Any]:
+        """
+        Compare HNSW results against exact search
+
+        Args:
+            queries: Query vectors; defaults to a random sample of corpus rows
+            k: Cut-off for recall@k
+            sample_size: Number of corpus rows to sample when no queries given
+
+        Returns:
+            Recall@k and mean per-query latency of both searches
+        """
+        if queries is None:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(self.base), size=min(sample_size, len(self.base)), replace=False)
+            queries = np.asarray(self.base.matrix[np.sort(sample)])
+
+        hits = 0
+        hnsw_time = 0.0
+        exact_time = 0.0
+
+        for query in queries:
+            start = time.perf_counter()
+            approximate = {row_id for row_id, _ in self.top_k(query, k)}
+            hnsw_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            exact = {row_id for row_id, _ in self.base.top_k(query, k)}
+            exact_time += time.perf_counter() - start
+
+            hits += len(approximate & exact)
+
+        total = len(queries) * min(k, len(self.base))
+
+        return {
+            'queries': len(queries),
+            'k': k,
+            f'recall@{k}': hits / total if total else 0.0,
+            'hnsw_avg_ms': 1000 * hnsw_time / max(len(queries), 1),
+            'exact_avg_ms': 1000 * exact_time / max(len(queries), 1),
+            'params': {'M': self.M, 'ef_construction': self.ef_construction, 'ef_search': self.ef_search}
+        }
+
+
+def load_or_build_hnsw(base: BibleVectorIndex,
+                       index_dir: Optional[str] = None,
+                       M: int = 16,
+                       ef_construction: int = 200,
+                       ef_search: int = 64) -> HNSWBibleIndex:
+    """Load a persisted HNSW graph from index_dir or build (and persist) a new one"""
+
+    if index_dir:
+        index = HNSWBibleIndex.load(base, index_dir, ef_search)
+        if index is not None and index.M == M and index.ef_construction == ef_construction:
+            return index
+
+    index = HNSWBibleIndex(base, M, ef_construction, ef_search).build()
+
+    if index_dir:
+        index.save(index_dir)
+        logger.info(f"Saved HNSW index to {index_dir}")
+
+    return index
+
+
+def main():
+    """Build (or load) the HNSW index for the verse embeddings and report recall"""
+
+    import argparse
+    from config.settings import settings
+    from src.retrieval.vector_index import load_bible_index
+
+    parser = argparse.ArgumentParser(description="Build an HNSW index and compare it with exact search")
+    parser.add_argument("embeddings", nargs="?", default="data/embeddings/fixed_structured_embeddings.jsonl")
+    parser.add_argument("--M", type=int, default=settings.HNSW_M)
+    parser.add_argument("--ef-construction", type=int, default=settings.HNSW_EF_CONSTRUCTION)
+    parser.add_argument("--ef-search", type=int, default=settings.HNSW_EF_SEARCH)
+    parser.add_argument("--k", type=int, default=10)
+    args = parser.parse_args()
+
+    base = load_bible_index(args.embeddings)
+    if base is None:
+        print(f"❌ Embeddings not found: {args.embeddings}")
+        return
+
+    index = load_or_build_hnsw(
+        base,
+        index_dir=str(base.path) if base.path else None,
+        M=args.M,
+        ef_construction=args.ef_construction,
+        ef_search=args.ef_search
+    )
+
+    report = index.recall_report(k=args.k)
+    print("HNSW recall report:")
+    for key, value in report.items():
+        print(f"  {key}: {value}")
+
+
+if __name__ == "__main__":
+    main()
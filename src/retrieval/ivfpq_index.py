@@ -0,0 +1,358 @@
+"""
+IVF-PQ compressed index for Bible embeddings
+Inverted file of coarse centroids + product-quantized residuals (uint8 codes),
+trained with NumPy k-means and optionally re-ranked against exact vectors
+"""
+
+import json
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from src.retrieval.vector_index import BibleVectorIndex
+from src.retrieval.filters import rows_of
+
+logger = logging.getLogger(__name__)
+
+IVFPQ_INDEX_FILE = "ivfpq.npz"
+IVFPQ_PARAMS_FILE = "ivfpq.json"
+
+
+def kmeans(data: np.ndarray, n_clusters: int, n_iter: int = 20, seed: int = 0, batch_size: int = 8192) -> np.ndarray:
+    """
+    Lloyd's k-means in NumPy
+
+    Args:
+        data: (n, d) float32 training vectors
+        n_clusters: Number of centroids
+        n_iter: Number of iterations
+        seed: Random seed for initialization
+        batch_size: Rows assigned per distance block
+
+    Returns:
+        (n_clusters, d) float32 centroids
+    """
+    rng = np.random.default_rng(seed)
+    data = np.asarray(data, dtype=np.float32)
+    n_clusters = min(n_clusters, len(data))
+
+    centroids = data[rng.choice(len(data), size=n_clusters, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignments = assign_clusters(data, centroids, batch_size)
+
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignments, data)
+        counts = np.bincount(assignments, minlength=n_clusters)
+
+        empty = counts == 0
+        centroids[~empty] = sums[~empty] / counts[~empty, None]
+
+        # Re-seed empty clusters on random training points
+        if empty.any():
+            centroids[empty] = data[rng.choice(len(data), size=int(empty.sum()), replace=False)]
+
+    return centroids
+
+
+def assign_clusters(data: np.ndarray, centroids: np.ndarray, batch_size: int = 8192) -> np.ndarray:
+    """Nearest centroid (L2) for every row, computed in blocks"""
+
+    centroid_norms = (centroids ** 2).sum(axis=1)
+    assignments = np.empty(len(data), dtype=np.int64)
+
+    for start in range(0, len(data), batch_size):
+        block = data[start:start + batch_size]
+        # ||x - c||^2 = ||x||^2 - 2 x.c + ||c||^2, and ||x||^2 does not change the argmin
+        distances = centroid_norms[None, :] - 2.0 * (block @ centroids.T)
+        assignments[start:start + batch_size] = distances.argmin(axis=1)
+
+    return assignments
+
+
+class IVFPQBibleIndex:
+    """
+    Inverted-file + product-quantization index over normalized embeddings
+
+    Each row is stored as its coarse list id plus m uint8 PQ codes of the
+    residual to the list centroid. Inner products are estimated with one
+    (m x ksub) lookup table per query; the top candidates can be re-scored
+    against the exact (memory-mapped) vectors of the base index.
+    """
+
+    def __init__(self,
+                 base: BibleVectorIndex,
+                 nlist: int = 64,
+                 m: int = 16,
+                 nbits: int = 8,
+                 nprobe: int = 8,
+                 rerank: int = 100):
+        """
+        Args:
+            base: Exact index holding records and (memory-mapped) vectors
+            nlist: Number of coarse centroids (inverted lists)
+            m: Number of PQ sub-quantizers; must divide the dimension
+            nbits: Bits per sub-quantizer code (at most 8 for uint8 codes)
+            nprobe: Inverted lists visited per query
+            rerank: Candidates re-scored exactly (0 disables re-ranking)
+        """
+        if base.dimension % m != 0:
+            raise ValueError(f"PQ sub-quantizers ({m}) must divide the dimension ({base.dimension})")
+        if not 1 <= nbits <= 8:
+            raise ValueError("nbits must be between 1 and 8 for uint8 codes")
+
+        self.base = base
+        self.nlist = nlist
+        self.m = m
+        self.nbits = nbits
+        self.nprobe = nprobe
+        self.rerank = rerank
+
+        self.coarse_centroids: Optional[np.ndarray] = None   # (nlist, d)
+        self.codebooks: Optional[np.ndarray] = None          # (m, ksub, d / m)
+        self.codes: Optional[np.ndarray] = None              # (n, m) uint8, grouped by list
+        self.row_ids: Optional[np.ndarray] = None            # (n,) original row of each code
+        self.list_offsets: Optional[np.ndarray] = None       # (nlist + 1,) start of each list
+        self._positions: Optional[np.ndarray] = None         # (n,) code position of each row
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    @property
+    def subvector_dim(self) -> int:
+        return self.base.dimension // self.m
+
+    def build(self, train_size: int = 20000, n_iter: int = 20, batch_size: int = 8192) -> "IVFPQBibleIndex":
+        """Train the quantizers on a sample of rows and encode every row"""
+
+        start = time.perf_counter()
+        rng = np.random.default_rng(0)
+        n_rows = len(self.base)
+
+        sample = np.sort(rng.choice(n_rows, size=min(train_size, n_rows), replace=False))
+        training = np.asarray(self.base.matrix[sample], dtype=np.float32)
+
+        # Coarse quantizer
+        self.coarse_centroids = kmeans(training, self.nlist, n_iter)
+        self.nlist = len(self.coarse_centroids)
+
+        # Product quantizer trained on residuals
+        residuals = training - self.coarse_centroids[assign_clusters(training, self.coarse_centroids)]
+        ksub = min(2 ** self.nbits, len(training))
+        dsub = self.subvector_dim
+        self.codebooks = np.stack([
+            kmeans(residuals[:, j * dsub:(j + 1) * dsub], ksub, n_iter, seed=j)
+            for j in range(self.m)
+        ])
+
+        # Encode all rows block by block so the base matrix can stay memory-mapped
+        list_ids = np.empty(n_rows, dtype=np.int64)
+        codes = np.empty((n_rows, self.m), dtype=np.uint8)
+
+        for block_start in range(0, n_rows, batch_size):
+            block = np.asarray(self.base.matrix[block_start:block_start + batch_size], dtype=np.float32)
+            block_lists = assign_clusters(block, self.coarse_centroids)
+            list_ids[block_start:block_start + len(block)] = block_lists
+            codes[block_start:block_start + len(block)] = self._encode(block - self.coarse_centroids[block_lists])
+
+        # Group codes by inverted list
+        order = np.argsort(list_ids, kind="stable")
+        self.codes = np.ascontiguousarray(codes[order])
+        self.row_ids = order.astype(np.int32)
+        self._positions = None
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(list_ids, minlength=self.nlist))])
+
+        logger.info(f"Built IVF-PQ index over {n_rows} rows in {time.perf_counter() - start:.1f}s "
+                    f"(nlist={self.nlist}, m={self.m}, {self.memory_report()['compression_ratio']:.1f}x compression)")
+        return self
+
+    def _encode(self, residuals: np.ndarray) -> np.ndarray:
+        """PQ codes of residual vectors"""
+
+        dsub = self.subvector_dim
+        codes = np.empty((len(residuals), self.m), dtype=np.uint8)
+
+        for j in range(self.m):
+            codes[:, j] = assign_clusters(residuals[:, j * dsub:(j + 1) * dsub], self.codebooks[j])
+
+        return codes
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Approximate top-k; same contract as BibleVectorIndex.top_k
+
+        Without a filter the nprobe closest inverted lists are visited. With
+        one, the codes of exactly the eligible rows are scored (whatever list
+        they sit in), so a narrow filter never comes back short.
+        """
+
+        if k <= 0:
+            return []
+
+        query = self.base.normalize_query(query_embedding)
+        coarse_scores = self.coarse_centroids @ query
+
+        if mask is not None:
+            if self._positions is None:
+                self._positions = np.argsort(self.row_ids).astype(np.int32)
+            rows = rows_of(mask)
+            positions = self._positions[rows]
+        else:
+            # Visit the nprobe closest inverted lists
+            nprobe = min(self.nprobe, self.nlist)
+            probe_lists = np.argpartition(-coarse_scores, nprobe - 1)[:nprobe]
+
+            positions = np.concatenate([
+                np.arange(self.list_offsets[list_id], self.list_offsets[list_id + 1])
+                for list_id in probe_lists
+            ])
+            rows = self.row_ids[positions]
+
+        if len(positions) == 0:
+            return []
+
+        # <q, c + r> = <q, c> + sum_j <q_j, codebook_j[code_j]>
+        dsub = self.subvector_dim
+        lookup = np.einsum('jkd,jd->jk', self.codebooks, query.reshape(self.m, dsub))
+        list_of_position = np.searchsorted(self.list_offsets, positions, side='right') - 1
+        scores = coarse_scores[list_of_position] + lookup[np.arange(self.m), self.codes[positions]].sum(axis=1)
+
+        if self.rerank > 0:
+            n_candidates = min(max(self.rerank, k), len(scores))
+            candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+            candidate_rows = np.sort(rows[candidates])
+            exact_scores = np.asarray(self.base.matrix[candidate_rows], dtype=np.float32) @ query
+            return self.base._select_top_k(exact_scores, k, min_similarity, candidate_rows)
+
+        return self.base._select_top_k(scores.astype(np.float32), k, min_similarity, rows)
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Bytes held by the compressed index versus the float32 matrix"""
+
+        compressed = (self.codes.nbytes + self.row_ids.nbytes + self.list_offsets.nbytes +
+                      self.coarse_centroids.nbytes + self.codebooks.nbytes)
+        full = len(self.base) * self.base.dimension * 4
+
+        return {
+            'rows': len(self.base),
+            'float32_bytes': full,
+            'ivfpq_bytes': int(compressed),
+            'compression_ratio': full / compressed if compressed else 0.0
+        }
+
+    def recall_report(self, queries: Optional[np.ndarray] = None, k: int = 10, sample_size: int = 200) -> Dict[str, Any]:
+        """Recall@k against exact search (defaults to a sample of corpus rows as queries)"""
+
+        if queries is None:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(self.base), size=min(sample_size, len(self.base)), replace=False)
+            queries = np.asarray(self.base.matrix[np.sort(sample)])
+
+        hits = 0
+        elapsed = 0.0
+
+        for query in queries:
+            start = time.perf_counter()
+            approximate = {row_id for row_id, _ in self.top_k(query, k)}
+            elapsed += time.perf_counter() - start
+            hits += len(approximate & {row_id for row_id, _ in self.base.top_k(query, k)})
+
+        total = len(queries) * min(k, len(self.base))
+
+        return {
+            'queries': len(queries),
+            'k': k,
+            f'recall@{k}': hits / total if total else 0.0,
+            'ivfpq_avg_ms': 1000 * elapsed / max(len(queries), 1),
+            'params': {'nlist': self.nlist, 'm': self.m, 'nbits': self.nbits,
+                       'nprobe': self.nprobe, 'rerank': self.rerank},
+            **self.memory_report()
+        }
+
+    def save(self, index_dir: str) -> None:
+        """Persist quantizers and codes"""
+
+        path = Path(index_dir)
+        path.mkdir(parents=True, exist_ok=True)
+
+        np.savez(
+            path / IVFPQ_INDEX_FILE,
+            coarse_centroids=self.coarse_centroids,
+            codebooks=self.codebooks,
+            codes=self.codes,
+            row_ids=self.row_ids,
+            list_offsets=self.list_offsets
+        )
+        with open(path / IVFPQ_PARAMS_FILE, 'w', encoding='utf-8') as f:
+            json.dump({
+                'nlist': self.nlist,
+                'm': self.m,
+                'nbits': self.nbits,
+                'rows': len(self.base),
+                'dimension': self.base.dimension,
+                'base_version': self.base.version
+            }, f, indent=2)
+
+    @classmethod
+    def load(cls,
+             base: BibleVectorIndex,
+             index_dir: str,
+             nprobe: int = 8,
+             rerank: int = 100) -> Optional["IVFPQBibleIndex"]:
+        """Load a persisted index; returns None when it is missing or stale"""
+
+        path = Path(index_dir)
+        if not (path / IVFPQ_INDEX_FILE).exists() or not (path / IVFPQ_PARAMS_FILE).exists():
+            return None
+
+        with open(path / IVFPQ_PARAMS_FILE, 'r', encoding='utf-8') as f:
+            params = json.load(f)
+
+        if (params['rows'] != len(base) or params['dimension'] != base.dimension or
+                params.get('base_version') != base.version):
+            logger.info(f"Stale IVF-PQ index in {path}, rebuild required")
+            return None
+
+        index = cls(base, params['nlist'], params['m'], params['nbits'], nprobe, rerank)
+        with np.load(path / IVFPQ_INDEX_FILE) as data:
+            index.coarse_centroids = data['coarse_centroids']
+            index.codebooks = data['codebooks']
+            index.codes = data['codes']
+            index.row_ids = data['row_ids']
+            index.list_offsets = data['list_offsets']
+
+        return index
+
+
+def load_or_build_ivfpq(base: BibleVectorIndex,
+                        index_dir: Optional[str] = None,
+                        nlist: int = 64,
+                        m: int = 16,
+                        nprobe: int = 8,
+                        rerank: int = 100) -> IVFPQBibleIndex:
+    """Load a persisted IVF-PQ index from index_dir or build (and persist) a new one"""
+
+    if index_dir:
+        index = IVFPQBibleIndex.load(base, index_dir, nprobe, rerank)
+        if index is not None and index.m == m and index.nlist <= nlist:
+            return index
+
+    index = IVFPQBibleIndex(base, nlist, m, nprobe=nprobe, rerank=rerank).build()
+
+    if index_dir:
+        index.save(index_dir)
+        logger.info(f"Saved IVF-PQ index to {index_dir}")
+
+    return index
@@ -0,0 +1,121 @@
+"""
+Async micro-batcher for concurrent search requests
+Requests arriving within a short window are collected into one batch that
+runs in a worker thread (one encode call, one matrix-matrix product), so
+concurrent callers share the work and the event loop stays responsive
+"""
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import List, Any, Callable, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Collects concurrent submissions and runs them as batches
+
+    The first request of a batch waits at most max_wait_ms for others to
+    join (or until max_batch_size are queued). Batches run one at a time on
+    a dedicated worker thread; requests arriving while a batch runs queue up
+    and form the next one, so batches grow with load while each request
+    waits for at most one running batch plus the collection window.
+    """
+
+    def __init__(self,
+                 run_batch: Callable[[List[Any]], List[Any]],
+                 max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0):
+        """
+        Args:
+            run_batch: Blocking function mapping a list of requests to one result per request;
+                an exception instance in a request's position fails only that request
+            max_batch_size: Largest batch handed to run_batch
+            max_wait_ms: How long the first request of a batch waits for company
+        """
+        self.run_batch = run_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-batch")
+
+        self.batches = 0
+        self.requests = 0
+
+    def _ensure_worker(self) -> None:
+        """Start the collector task on the running loop (again after a loop change)"""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._worker = loop.create_task(self._collect())
+
+    async def submit(self, request: Any) -> Any:
+        """Queue a request and wait for its own result (its own or the whole batch's exception is re-raised)"""
+
+        self._ensure_worker()
+        future = self._loop.create_future()
+        await self._queue.put((request, future))
+        return await future
+
+    async def _collect(self) -> None:
+        """Form batches from the queue and run them in the worker thread"""
+
+        while True:
+            batch: List[Tuple[Any, asyncio.Future]] = [await self._queue.get()]
+
+            deadline = self._loop.time() + self.max_wait
+            while len(batch) < self.max_batch_size:
+                if not self._queue.empty():
+                    # Requests that queued up while the previous batch ran join without waiting
+                    batch.append(self._queue.get_nowait())
+                    continue
+                timeout = deadline - self._loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            # Callers that gave up (cancelled) are dropped from the batch
+            batch = [(request, future) for request, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            try:
+                results = await self._loop.run_in_executor(
+                    self._executor, self.run_batch, [request for request, _ in batch])
+            except Exception as e:
+                logger.error(f"Search batch of {len(batch)} failed: {e}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            self.batches += 1
+            self.requests += len(batch)
+            for (_, future), result in zip(batch, results):
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+
+    def stats(self) -> dict:
+        """Number of batches run and mean batch size"""
+        return {
+            "batches": self.batches,
+            "requests": self.requests,
+            "mean_batch_size": self.requests / self.batches if self.batches else 0.0
+        }
@@ -0,0 +1,583 @@
+"""
+Quantized search backends over embedding artifacts
+Candidates are scored on compact codes (int8, sign bits or PCA-reduced vectors),
+then re-scored against higher-precision vectors
+"""
+
+import time
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from src.retrieval.vector_index import BibleVectorIndex
+from src.retrieval.filters import rows_of
+from src.embeddings.quantization import hamming_distances
+
+logger = logging.getLogger(__name__)
+
+
+def _has_copy(base: BibleVectorIndex, kind: str) -> bool:
+    """Whether the artifact holds a `kind` copy with one row per row of base"""
+
+    manifest = base.manifest or {}
+    entry = manifest.get('quantization', {}).get(kind)
+    # Copies written before they recorded their rows are per artifact row
+    return entry is not None and entry.get('rows', manifest.get('rows')) == len(base)
+
+
+class Int8BibleIndex:
+    """
+    Int8 scalar-quantized first stage with float16 re-scoring
+
+    For per-dimension calibration x ~= codes * scale + offset, so
+    <q, x> ~= <q * scale, codes> + <q, offset>. The top `rerank`
+    candidates are re-scored against float16 originals that stay on
+    disk (memory-mapped) until touched.
+    """
+
+    def __init__(self,
+                 base: BibleVectorIndex,
+                 codes: np.ndarray,
+                 scale: np.ndarray,
+                 offset: np.ndarray,
+                 rescore_vectors: np.ndarray,
+                 rerank: int = 256,
+                 block_size: int = 16384):
+        """
+        Args:
+            base: Exact index providing records and query normalization
+            codes: (rows, dimension) int8 codes
+            scale: Per-dimension scale
+            offset: Per-dimension offset
+            rescore_vectors: (rows, dimension) float16 normalized vectors (memory-mapped)
+            rerank: Number of int8 candidates re-scored in float
+            block_size: Rows dequantized per scoring block
+        """
+        if codes.shape != (len(base), base.dimension):
+            raise ValueError(f"Int8 codes {codes.shape} do not match index ({len(base)}, {base.dimension})")
+
+        self.base = base
+        self.codes = codes
+        self.scale = np.asarray(scale, dtype=np.float32)
+        self.offset = np.asarray(offset, dtype=np.float32)
+        self.rescore_vectors = rescore_vectors
+        self.rerank = rerank
+        self.block_size = block_size
+
+    @classmethod
+    def from_artifact(cls, base: BibleVectorIndex, rerank: int = 256) -> "Int8BibleIndex":
+        """Open the int8 copy written alongside the base index artifact"""
+
+        quantization = (base.manifest or {}).get('quantization', {}).get('int8')
+        if base.path is None or not quantization:
+            raise ValueError("Artifact has no int8 quantization; write it with quantize=['int8']")
+
+        path = Path(base.path)
+        return cls(
+            base,
+            codes=np.load(path / quantization['codes']),
+            scale=np.load(path / quantization['scale']),
+            offset=np.load(path / quantization['offset']),
+            rescore_vectors=np.load(path / quantization['rescore'], mmap_mode='r'),
+            rerank=rerank
+        )
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def approximate_scores(self, query: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Int8 estimate of <query, x> for all rows (or the given row ids / slice)
+
+        A (queries, dimension) batch of queries gives (rows, queries) scores,
+        computed with one matrix-matrix product per block.
+        """
+        scaled_query = (query * self.scale).T
+        bias = query @ self.offset
+        codes = self.codes if rows is None else self.codes[rows]
+
+        scores = np.empty((len(codes),) + scaled_query.shape[1:], dtype=np.float32)
+        for start in range(0, len(codes), self.block_size):
+            block = codes[start:start + self.block_size]
+            scores[start:start + len(block)] = block.astype(np.float32) @ scaled_query
+
+        return scores + bias
+
+    def top_k_with_report(self,
+                          query_embedding: np.ndarray,
+                          k: int = 5,
+                          min_similarity: Optional[float] = None,
+                          mask: Optional[np.ndarray] = None) -> Tuple[List[Tuple[int, float]], Dict[str, Any]]:
+        """
+        Top-k with a report of how much float re-scoring changed the int8 ranking
+
+        Returns:
+            (results, report) where report['int8_recall'] is the fraction of the
+            re-scored top-k that the int8 scores alone would also have returned
+        """
+        query = self.base.normalize_query(query_embedding)
+
+        rows = None
+        if mask is not None:
+            rows = rows_of(mask)
+            if len(rows) == 0:
+                return [], {'rerank_candidates': 0, 'int8_recall': 1.0}
+
+        # Contiguous selections score a view of the codes
+        scores = self.approximate_scores(query, mask if isinstance(mask, slice) else rows)
+        row_ids = rows if rows is not None else np.arange(len(scores))
+        return self._rescore(query, scores, row_ids, k, min_similarity)
+
+    def _rescore(self,
+                 query: np.ndarray,
+                 scores: np.ndarray,
+                 row_ids: np.ndarray,
+                 k: int,
+                 min_similarity: Optional[float]) -> Tuple[List[Tuple[int, float]], Dict[str, Any]]:
+        """Float16 re-scoring of the best int8 candidates, with the recall report"""
+
+        n_candidates = min(max(self.rerank, k), len(scores))
+        if n_candidates <= 0:
+            return [], {'rerank_candidates': 0, 'int8_recall': 1.0}
+
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        int8_top = set(row_ids[candidates[:k]].tolist())
+
+        # Float16 re-scoring of the candidates (sorted rows keep mmap reads sequential)
+        candidate_rows = np.sort(row_ids[candidates])
+        exact_scores = np.asarray(self.rescore_vectors[candidate_rows], dtype=np.float32) @ query
+        results = self.base._select_top_k(exact_scores, k, min_similarity, candidate_rows)
+
+        final_top = {row_id for row_id, _ in results}
+        report = {
+            'rerank_candidates': int(n_candidates),
+            'int8_recall': len(final_top & int8_top) / len(final_top) if final_top else 1.0
+        }
+        return results, report
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Quantized top-k; same contract as BibleVectorIndex.top_k"""
+        return self.top_k_with_report(query_embedding, k, min_similarity, mask)[0]
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """Batched top-k: one int8 matrix-matrix pass, then per-query re-scoring"""
+
+        queries = self.base.normalize_queries(query_embeddings)
+
+        rows = None
+        if mask is not None:
+            rows = rows_of(mask)
+            if len(rows) == 0:
+                return [[] for _ in range(len(queries))]
+
+        scores = self.approximate_scores(queries, mask if isinstance(mask, slice) else rows)
+        row_ids = rows if rows is not None else np.arange(len(scores))
+
+        return [self._rescore(query, scores[:, i], row_ids, k, min_similarity)[0]
+                for i, query in enumerate(queries)]
+
+    def recall_report(self, queries: Optional[np.ndarray] = None, k: int = 10, sample_size: int = 200) -> Dict[str, Any]:
+        """Recall@k against exact float32 search, with and without re-scoring"""
+
+        if queries is None:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(self.base), size=min(sample_size, len(self.base)), replace=False)
+            queries = np.asarray(self.base.matrix[np.sort(sample)])
+
+        rescored_hits = 0
+        int8_hits = 0
+        elapsed = 0.0
+
+        for query in queries:
+            exact = {row_id for row_id, _ in self.base.top_k(query, k)}
+
+            start = time.perf_counter()
+            results = self.top_k(query, k)
+            elapsed += time.perf_counter() - start
+
+            int8_only = self.base._select_top_k(self.approximate_scores(self.base.normalize_query(query)), k, None)
+
+            rescored_hits += len(exact & {row_id for row_id, _ in results})
+            int8_hits += len(exact & {row_id for row_id, _ in int8_only})
+
+        total = len(queries) * min(k, len(self.base))
+
+        return {
+            'queries': len(queries),
+            'k': k,
+            f'recall@{k}': rescored_hits / total if total else 0.0,
+            f'int8_only_recall@{k}': int8_hits / total if total else 0.0,
+            'avg_ms': 1000 * elapsed / max(len(queries), 1),
+            'rerank': self.rerank,
+            'int8_bytes': int(self.codes.nbytes),
+            'float32_bytes': len(self.base) * self.base.dimension * 4
+        }
+
+
+def load_or_build_int8(base: BibleVectorIndex, rerank: int = 256) -> Int8BibleIndex:
+    """Open the int8 copy of an artifact-backed index, writing it first when missing"""
+
+    if base.path is None:
+        raise ValueError("Int8 search needs an artifact-backed index (see embedding_artifact.py)")
+
+    if not _has_copy(base, 'int8'):
+        from src.embeddings.embedding_artifact import add_quantization
+
+        base.manifest = add_quantization(str(base.path), ["int8"])
+        logger.info(f"Added int8 quantization to {base.path}")
+
+    return Int8BibleIndex.from_artifact(base, rerank)
+
+
+class BinaryBibleIndex:
+    """
+    1-bit sign-quantized first stage with exact cosine re-ranking
+
+    Every row is reduced to packed sign bits (a 768-dim vector becomes 96
+    bytes), scanned by Hamming distance; the `rerank` closest rows are
+    re-scored against the exact (memory-mapped) vectors of the base index.
+    """
+
+    def __init__(self,
+                 base: BibleVectorIndex,
+                 codes: np.ndarray,
+                 threshold: np.ndarray,
+                 rerank: int = 500):
+        """
+        Args:
+            base: Exact index holding records and (memory-mapped) vectors
+            codes: (rows, ceil(dimension / 8)) packed uint8 sign bits
+            threshold: Per-dimension threshold the bits were taken against
+            rerank: Number of Hamming candidates re-scored exactly
+        """
+        if len(codes) != len(base):
+            raise ValueError(f"Binary codes cover {len(codes)} rows, index has {len(base)}")
+
+        self.base = base
+        self.codes = np.ascontiguousarray(codes)
+        self.threshold = np.asarray(threshold, dtype=np.float32)
+        self.rerank = rerank
+
+    @classmethod
+    def from_artifact(cls, base: BibleVectorIndex, rerank: int = 500) -> "BinaryBibleIndex":
+        """Open the packed sign bits written alongside the base index artifact"""
+
+        quantization = (base.manifest or {}).get('quantization', {}).get('binary')
+        if base.path is None or not quantization:
+            raise ValueError("Artifact has no binary quantization; write it with quantize=['binary']")
+
+        path = Path(base.path)
+        return cls(
+            base,
+            codes=np.load(path / quantization['codes']),
+            threshold=np.load(path / quantization['threshold']),
+            rerank=rerank
+        )
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def encode_queries(self, queries: np.ndarray) -> np.ndarray:
+        """Packed sign bits of normalized query vectors"""
+        return np.packbits(np.atleast_2d(queries) > self.threshold, axis=-1)
+
+    def _rerank(self,
+                query: np.ndarray,
+                distances: np.ndarray,
+                row_ids: np.ndarray,
+                k: int,
+                min_similarity: Optional[float]) -> List[Tuple[int, float]]:
+        """Exact cosine over the rows closest in Hamming distance"""
+
+        n_candidates = min(max(self.rerank, k), len(distances))
+        if n_candidates <= 0:
+            return []
+
+        candidates = np.argpartition(distances, n_candidates - 1)[:n_candidates]
+        candidate_rows = np.sort(row_ids[candidates])
+        exact_scores = np.asarray(self.base.matrix[candidate_rows], dtype=np.float32) @ query
+        return self.base._select_top_k(exact_scores, k, min_similarity, candidate_rows)
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Hamming prefilter + exact re-rank; same contract as BibleVectorIndex.top_k"""
+
+        query = self.base.normalize_query(query_embedding)
+
+        if mask is not None:
+            row_ids = rows_of(mask)
+            codes = self.codes[mask] if isinstance(mask, slice) else self.codes[row_ids]
+        else:
+            row_ids = np.arange(len(self.codes))
+            codes = self.codes
+
+        distances = hamming_distances(codes, self.encode_queries(query)[0])
+        return self._rerank(query, distances, row_ids, k, min_similarity)
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """Batched top-k: one Hamming pass over the codes for all queries"""
+
+        queries = self.base.normalize_queries(query_embeddings)
+
+        if mask is not None:
+            row_ids = rows_of(mask)
+            codes = self.codes[mask] if isinstance(mask, slice) else self.codes[row_ids]
+        else:
+            row_ids = np.arange(len(self.codes))
+            codes = self.codes
+
+        distances = hamming_distances(codes, self.encode_queries(queries))
+        return [self._rerank(query, distances[i], row_ids, k, min_similarity)
+                for i, query in enumerate(queries)]
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Bytes held by the packed codes versus the float32 matrix"""
+
+        full = len(self.base) * self.base.dimension * 4
+        return {
+            'rows': len(self.base),
+            'bytes_per_vector': int(self.codes.shape[1]),
+            'binary_bytes': int(self.codes.nbytes),
+            'float32_bytes': full,
+            'compression_ratio': full / self.codes.nbytes if self.codes.nbytes else 0.0
+        }
+
+    def recall_report(self, queries: Optional[np.ndarray] = None, k: int = 10, sample_size: int = 200) -> Dict[str, Any]:
+        """Recall@k against exact search (defaults to a sample of corpus rows as queries)"""
+
+        if queries is None:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(self.base), size=min(sample_size, len(self.base)), replace=False)
+            queries = np.asarray(self.base.matrix[np.sort(sample)])
+
+        hits = 0
+        elapsed = 0.0
+
+        for query in queries:
+            start = time.perf_counter()
+            approximate = {row_id for row_id, _ in self.top_k(query, k)}
+            elapsed += time.perf_counter() - start
+            hits += len(approximate & {row_id for row_id, _ in self.base.top_k(query, k)})
+
+        total = len(queries) * min(k, len(self.base))
+
+        return {
+            'queries': len(queries),
+            'k': k,
+            f'recall@{k}': hits / total if total else 0.0,
+            'avg_ms': 1000 * elapsed / max(len(queries), 1),
+            'rerank': self.rerank,
+            **self.memory_report()
+        }
+
+
+def load_or_build_binary(base: BibleVectorIndex, rerank: int = 500) -> BinaryBibleIndex:
+    """Open the binary copy of an artifact-backed index, writing it first when missing"""
+
+    if base.path is None:
+        raise ValueError("Binary search needs an artifact-backed index (see embedding_artifact.py)")
+
+    if not _has_copy(base, 'binary'):
+        from src.embeddings.embedding_artifact import add_quantization
+
+        base.manifest = add_quantization(str(base.path), ["binary"])
+        logger.info(f"Added binary quantization to {base.path}")
+
+    return BinaryBibleIndex.from_artifact(base, rerank)
+
+
+class PCABibleIndex:
+    """
+    PCA-reduced first stage with exact cosine re-ranking
+
+    Rows are stored as their coordinates on the top principal components
+    (64 or 128 instead of 768 floats). The query is projected once, the
+    reduced rows are scanned with it and the `rerank` best rows are
+    re-scored against the full vectors of the base index. The projected
+    mean adds the same constant to every row's estimate, so it is left out.
+    """
+
+    def __init__(self,
+                 base: BibleVectorIndex,
+                 reduced: np.ndarray,
+                 components: np.ndarray,
+                 rerank: int = 200,
+                 explained_variance: Optional[float] = None):
+        """
+        Args:
+            base: Exact index holding records and the full vectors
+            reduced: (rows, components) PCA coordinates of the normalized rows
+            components: (components, dimension) projection matrix
+            rerank: Number of reduced-space candidates re-scored exactly
+            explained_variance: Variance share kept by the components (reported only)
+        """
+        if len(reduced) != len(base) or components.shape != (reduced.shape[1], base.dimension):
+            raise ValueError(f"PCA copy {reduced.shape} / {components.shape} does not match index "
+                             f"({len(base)}, {base.dimension})")
+
+        self.base = base
+        self.reduced = np.ascontiguousarray(reduced, dtype=np.float32)
+        self.components = np.asarray(components, dtype=np.float32)
+        self.rerank = rerank
+        self.explained_variance = explained_variance
+
+    @classmethod
+    def from_artifact(cls, base: BibleVectorIndex, dimension: int = 128, rerank: int = 200) -> "PCABibleIndex":
+        """Open the pca<dimension> copy written alongside the base index artifact"""
+
+        kind = f"pca{dimension}"
+        quantization = (base.manifest or {}).get('quantization', {}).get(kind)
+        if base.path is None or not quantization:
+            raise ValueError(f"Artifact has no {kind} copy; write it with quantize=['{kind}']")
+
+        path = Path(base.path)
+        return cls(
+            base,
+            reduced=np.load(path / quantization['codes']),
+            components=np.load(path / quantization['components']),
+            rerank=rerank,
+            explained_variance=quantization.get('explained_variance')
+        )
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def _reduced_scores(self, queries: np.ndarray, mask) -> Tuple[np.ndarray, np.ndarray]:
+        """(queries, eligible rows) reduced-space scores and the eligible row ids"""
+
+        # One projection per query, not per row
+        projected = queries @ self.components.T
+
+        if isinstance(mask, slice):
+            return projected @ self.reduced[mask].T, np.arange(mask.start, mask.stop)
+
+        if mask is not None:
+            rows = rows_of(mask)
+            return projected @ self.reduced[rows].T, rows
+
+        return projected @ self.reduced.T, np.arange(len(self.reduced))
+
+    def _rerank(self,
+                query: np.ndarray,
+                scores: np.ndarray,
+                row_ids: np.ndarray,
+                k: int,
+                min_similarity: Optional[float]) -> List[Tuple[int, float]]:
+        """Exact cosine over the best reduced-space candidates"""
+
+        n_candidates = min(max(self.rerank, k), len(scores))
+        if n_candidates <= 0:
+            return []
+
+        candidates = np.argpartition(-scores, n_candidates - 1)[:n_candidates]
+        candidate_rows = np.sort(row_ids[candidates])
+        return self.base._select_top_k(self.base.score(query, candidate_rows), k, min_similarity, candidate_rows)
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Reduced-space prefilter + exact re-rank; same contract as BibleVectorIndex.top_k"""
+        return self.top_k_many(query_embedding, k, min_similarity, mask)[0]
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """Batched top-k: one reduced-space matrix-matrix pass, then per-query re-ranking"""
+
+        queries = self.base.normalize_queries(query_embeddings)
+        scores, row_ids = self._reduced_scores(queries, mask)
+
+        return [self._rerank(query, scores[i], row_ids, k, min_similarity)
+                for i, query in enumerate(queries)]
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Bytes held by the reduced copy versus the float32 matrix"""
+
+        full = len(self.base) * self.base.dimension * 4
+        return {
+            'rows': len(self.base),
+            'components': int(self.reduced.shape[1]),
+            'explained_variance': self.explained_variance,
+            'pca_bytes': int(self.reduced.nbytes + self.components.nbytes),
+            'float32_bytes': full,
+            'compression_ratio': full / self.reduced.nbytes if self.reduced.nbytes else 0.0
+        }
+
+    def recall_report(self, queries: Optional[np.ndarray] = None, k: int = 10, sample_size: int = 200) -> Dict[str, Any]:
+        """Recall@k against exact search (defaults to a sample of corpus rows as queries)"""
+
+        if queries is None:
+            rng = np.random.default_rng(0)
+            sample = rng.choice(len(self.base), size=min(sample_size, len(self.base)), replace=False)
+            queries = np.asarray(self.base.matrix[np.sort(sample)])
+
+        hits = 0
+        elapsed = 0.0
+
+        for query in queries:
+            start = time.perf_counter()
+            approximate = {row_id for row_id, _ in self.top_k(query, k)}
+            elapsed += time.perf_counter() - start
+            hits += len(approximate & {row_id for row_id, _ in self.base.top_k(query, k)})
+
+        total = len(queries) * min(k, len(self.base))
+
+        return {
+            'queries': len(queries),
+            'k': k,
+            f'recall@{k}': hits / total if total else 0.0,
+            'avg_ms': 1000 * elapsed / max(len(queries), 1),
+            'rerank': self.rerank,
+            **self.memory_report()
+        }
+
+
+def load_or_build_pca(base: BibleVectorIndex, dimension: int = 128, rerank: int = 200) -> PCABibleIndex:
+    """Open a PCA-reduced copy of an artifact-backed index, fitting and writing it first when missing"""
+
+    if base.path is None:
+        raise ValueError("PCA search needs an artifact-backed index (see embedding_artifact.py)")
+
+    kind = f"pca{dimension}"
+    if not _has_copy(base, kind):
+        from src.embeddings.embedding_artifact import add_quantization
+
+        base.manifest = add_quantization(str(base.path), [kind])
+        logger.info(f"Added {kind} copy to {base.path}")
+
+    return PCABibleIndex.from_artifact(base, dimension, rerank)
@@ -0,0 +1,221 @@
+"""
+Query encoder with an LRU cache of query embeddings
+Keys are the model name plus the query after Amharic normalization
+(NFC, Fidel variants, whitespace), so recurring queries and trivially
+different spellings of them skip model.encode
+"""
+
+import atexit
+import threading
+import numpy as np
+from collections import OrderedDict
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from config.settings import settings
+from src.preprocessing.amharic_cleaner import amharic_cleaner
+
+logger = logging.getLogger(__name__)
+
+# Encoders shared between tools living in the same process (keyed by model name)
+_ENCODERS: Dict[str, "QueryEncoder"] = {}
+_ENCODERS_LOCK = threading.Lock()
+
+
+def normalize_query_text(text: str) -> str:
+    """Canonical form of a query used for cache keys"""
+
+    text = amharic_cleaner.normalize_unicode(text)
+    text = amharic_cleaner.handle_fidel_variations(text)
+    return amharic_cleaner.clean_whitespace(text)
+
+
+class QueryEncoder:
+    """
+    Encodes queries with a SentenceTransformer, caching the embeddings
+
+    The cache is a bounded LRU; misses of one encode() call are embedded
+    together in a single model.encode batch. It can be persisted to an .npz
+    file and reloaded on start-up.
+    """
+
+    def __init__(self,
+                 model_name: str,
+                 model=None,
+                 cache_size: int = 1024,
+                 cache_file: Optional[str] = None):
+        """
+        Args:
+            model_name: Model identifier (part of every cache key)
+            model: Loaded SentenceTransformer; loaded lazily from model_name when omitted
+            cache_size: Maximum number of cached query embeddings (0 disables caching)
+            cache_file: Optional .npz file the cache is loaded from and saved to
+        """
+        self.model_name = model_name
+        self.model = model
+        self.cache_size = cache_size
+        self.cache_file = Path(cache_file) if cache_file else None
+
+        self.hits = 0
+        self.misses = 0
+        self._cache: "OrderedDict[Tuple[str, str], np.ndarray]" = OrderedDict()
+        self._lock = threading.Lock()
+
+        if self.cache_file is not None and self.cache_file.exists():
+            self.load()
+
+    def _get_model(self):
+        """Lazy load the embedding model"""
+        if self.model is None:
+            from sentence_transformers import SentenceTransformer
+            self.model = SentenceTransformer(self.model_name)
+        return self.model
+
+    def encode(self, queries: List[str]) -> np.ndarray:
+        """
+        Embed queries, serving repeated ones from the cache
+
+        Returns:
+            (len(queries), dimension) float32 matrix
+        """
+        keys = [(self.model_name, normalize_query_text(query)) for query in queries]
+        vectors: List[Optional[np.ndarray]] = [None] * len(queries)
+        missing: Dict[Tuple[str, str], List[int]] = {}
+
+        with self._lock:
+            for position, key in enumerate(keys):
+                if key in self._cache:
+                    self._cache.move_to_end(key)
+                    vectors[position] = self._cache[key]
+                    self.hits += 1
+                elif key in missing:
+                    # Same query twice in one batch: encoded once
+                    missing[key].append(position)
+                    self.hits += 1
+                else:
+                    missing[key] = [position]
+                    self.misses += 1
+
+        if missing:
+            # One batch for every distinct miss (first spelling seen is encoded)
+            texts = [queries[positions[0]] for positions in missing.values()]
+            encoded = np.asarray(self._get_model().encode(texts), dtype=np.float32)
+
+            with self._lock:
+                for (key, positions), vector in zip(missing.items(), encoded):
+                    for position in positions:
+                        vectors[position] = vector
+                    if self.cache_size > 0:
+                        self._cache[key] = vector
+                        self._cache.move_to_end(key)
+
+                while len(self._cache) > self.cache_size:
+                    self._cache.popitem(last=False)
+
+        return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+    def encode_one(self, query: str) -> np.ndarray:
+        """Embedding of a single query"""
+        return self.encode([query])[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and cache occupancy"""
+
+        lookups = self.hits + self.misses
+        return {
+            'model': self.model_name,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._cache),
+            'max_size': self.cache_size
+        }
+
+    def clear(self) -> None:
+        """Drop all cached embeddings and reset the counters"""
+
+        with self._lock:
+            self._cache.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def save(self, cache_file: Optional[str] = None) -> None:
+        """Persist the cached embeddings (most recently used last)"""
+
+        path = Path(cache_file) if cache_file else self.cache_file
+        if path is None:
+            return
+
+        with self._lock:
+            items = list(self._cache.items())
+
+        if not items:
+            return
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.savez(
+            path,
+            models=np.asarray([key[0] for key, _ in items]),
+            queries=np.asarray([key[1] for key, _ in items]),
+            embeddings=np.vstack([vector for _, vector in items])
+        )
+        logger.info(f"Saved {len(items)} query embeddings to {path}")
+
+    def load(self, cache_file: Optional[str] = None) -> None:
+        """Load cached embeddings written by save() for this model"""
+
+        path = Path(cache_file) if cache_file else self.cache_file
+        try:
+            with np.load(path) as data:
+                entries = zip(data['models'].tolist(), data['queries'].tolist(), data['embeddings'])
+                with self._lock:
+                    for model_name, query, vector in entries:
+                        if model_name == self.model_name:
+                            self._cache[(model_name, query)] = vector
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        except Exception as e:
+            logger.warning(f"Could not load query cache {path}: {e}")
+            return
+
+        logger.info(f"Loaded {len(self._cache)} query embeddings from {path}")
+
+
+def cache_file_for(cache_file: str, model_name: str) -> Path:
+    """Per-model cache file derived from QUERY_CACHE_FILE (query_cache.npz -> query_cache.<model>.npz)"""
+    path = Path(cache_file)
+    return path.with_name(f"{path.stem}.{model_name.replace('/', '__')}{path.suffix or '.npz'}")
+
+
+def get_query_encoder(model_name: Optional[str] = None, model=None) -> QueryEncoder:
+    """
+    Shared (per process) cached encoder for a model
+
+    Every model persists to its own file next to settings.QUERY_CACHE_FILE,
+    so encoders saved at exit do not overwrite each other's entries.
+
+    Args:
+        model_name: Defaults to settings.EMBEDDING_MODEL
+        model: Already loaded SentenceTransformer to reuse
+    """
+    model_name = model_name or settings.EMBEDDING_MODEL
+
+    with _ENCODERS_LOCK:
+        encoder = _ENCODERS.get(model_name)
+        if encoder is None:
+            encoder = QueryEncoder(
+                model_name,
+                model=model,
+                cache_size=settings.QUERY_CACHE_SIZE,
+                cache_file=cache_file_for(settings.QUERY_CACHE_FILE, model_name) if settings.QUERY_CACHE_FILE else None
+            )
+            if encoder.cache_file is not None:
+                atexit.register(encoder.save)
+            _ENCODERS[model_name] = encoder
+        elif encoder.model is None and model is not None:
+            encoder.model = model
+
+    return encoder
@@ -0,0 +1,231 @@
+"""
+Deterministic resolver for Amharic scripture references
+Parses strings such as "የማቴዎስ ወንጌል 5:1-16", "ማቴ ፭፥፩-፲፮" or "1ቆሮ 13:1-13"
+and looks the verses up in the verse reference index, no embedding search
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from src.preprocessing.amharic_cleaner import amharic_cleaner
+from src.preprocessing.complete_book_extractor import CompleteBookExtractor
+from src.embeddings.canonical_layout import canonical_book_order
+
+logger = logging.getLogger(__name__)
+
+# Words that only classify a book ("Book of", "Prophecy of", "Gospel", "to the ... people", "Letter")
+_TITLE_WORDS = {"መጽሐፈ", "መጽሐፀ", "ኦሪት", "ትንቢተ", "ወንጌል", "ሰዎች", "ወደ", "መልእክት"}
+
+# Spellings used by the liturgical reading tables that match no book title
+_EXTRA_ALIASES = {
+    "ዘኅልቀት": "ኦሪት ዘጸአት",
+    "ዕሳይያስ": "ትንቢተ ኢሳይያስ",
+    "ተዋሕዶ": "መጽሐፈ መክብብ",
+}
+
+_GEEZ_DIGITS = {
+    '፩': 1, '፪': 2, '፫': 3, '፬': 4, '፭': 5, '፮': 6, '፯': 7, '፰': 8, '፱': 9,
+    '፲': 10, '፳': 20, '፴': 30, '፵': 40, '፶': 50, '፷': 60, '፸': 70, '፹': 80, '፺': 90
+}
+
+_NUMBER = r"[0-9፩-፼]+"
+
+# <book> <chapter>[:<verse>[-[<chapter>:]<verse>]]; ፥ and ፡ are Ethiopic chapter/verse separators
+_REFERENCE_PATTERN = re.compile(
+    rf"^\s*(?P<book>.+?)\s*(?P<chapter>{_NUMBER})"
+    rf"(?:\s*[:፥፡]\s*(?P<start>{_NUMBER})"
+    rf"(?:\s*[-–—]\s*(?:(?P<end_chapter>{_NUMBER})\s*[:፥፡]\s*)?(?P<end>{_NUMBER}))?)?\s*$"
+)
+
+
+def geez_to_int(numeral: str) -> int:
+    """
+    Value of an Arabic or Ge'ez numeral ("12", "፲፪", "፻፳")
+
+    Ge'ez numerals are additive within a group of hundreds; ፻ multiplies
+    the group before it (or 1) by 100 and ፼ by 10000.
+    """
+    if re.fullmatch(r"[0-9]+", numeral):
+        return int(numeral)
+
+    total = 0
+    group = 0
+    for char in numeral:
+        if char == '፻':
+            group = (group or 1) * 100
+        elif char == '፼':
+            total = (total + (group or 1)) * 10000
+            group = 0
+        elif char in _GEEZ_DIGITS:
+            group += _GEEZ_DIGITS[char]
+        else:
+            raise ValueError(f"Not a numeral: {numeral}")
+
+    return total + group
+
+
+def _book_key(name: str) -> str:
+    """Matching key of a book name: normalized, dots and title words removed, ordinal as a digit"""
+
+    name = amharic_cleaner.handle_fidel_variations(amharic_cleaner.normalize_unicode(name))
+    name = name.replace('.', ' ')
+
+    words = []
+    for word in name.split():
+        if word in _TITLE_WORDS:
+            continue
+        ordinal = re.match(rf"^({_NUMBER})ኛ?$", word)
+        if ordinal:
+            words.append(str(geez_to_int(ordinal.group(1))))
+            continue
+        ordinal = re.match(rf"^({_NUMBER})ኛ?(.+)$", word)
+        if ordinal:
+            # Abbreviations glue the ordinal to the name ("1ቆሮ")
+            words.append(str(geez_to_int(ordinal.group(1))))
+            word = ordinal.group(2)
+        if word.startswith("የ") and len(word) > 2:
+            # Possessive prefix of "የማቴዎስ ወንጌል" etc.
+            word = word[1:]
+        words.append(word)
+
+    return " ".join(words)
+
+
+@dataclass(frozen=True)
+class ScriptureReference:
+    """A parsed reference; verses are inclusive, None means the whole chapter"""
+    book: str
+    chapter: int
+    start_verse: Optional[int] = None
+    end_verse: Optional[int] = None
+    end_chapter: Optional[int] = None
+
+    def __str__(self) -> str:
+        reference = f"{self.book} {self.chapter}"
+        if self.start_verse is not None:
+            reference += f":{self.start_verse}"
+            if self.end_chapter is not None and self.end_chapter != self.chapter:
+                reference += f"-{self.end_chapter}:{self.end_verse}"
+            elif self.end_verse is not None and self.end_verse != self.start_verse:
+                reference += f"-{self.end_verse}"
+        return reference
+
+
+class ReferenceResolver:
+    """
+    Parses scripture references and resolves them to verse records
+
+    Book names are matched on a normalized key, so full titles
+    ("መጽሐፈ ዘፍጥረት" / "ኦሪት ዘፍጥረት"), the CompleteBookExtractor table of
+    contents abbreviations ("ዘፍ", "1ቆሮ") and Fidel variants all map to the
+    book name stored in the index. Resolved references are memoized.
+    """
+
+    def __init__(self, index=None, book_names: Optional[Iterable[str]] = None, cache_size: int = 1024):
+        """
+        Args:
+            index: BibleVectorIndex whose verse index serves the text (parse-only when None)
+            book_names: Book names to resolve to; defaults to the index books
+            cache_size: Number of resolved references kept
+        """
+        self.index = index
+
+        canonical = list(canonical_book_order())
+        stored = list(book_names) if book_names is not None else (index.filters.books if index is not None else [])
+
+        # Canonical titles first, then the names actually stored in the index win
+        self.aliases: Dict[str, str] = {}
+        for name in canonical + stored:
+            self.aliases[_book_key(name)] = name
+
+        for abbreviation, title in CompleteBookExtractor().book_mapping.items():
+            book = self.aliases.get(_book_key(title))
+            if book is not None:
+                self.aliases.setdefault(_book_key(abbreviation), book)
+                self.aliases.setdefault(abbreviation.replace('.', ''), book)
+
+        for alias, title in _EXTRA_ALIASES.items():
+            book = self.aliases.get(_book_key(title))
+            if book is not None:
+                self.aliases.setdefault(_book_key(alias), book)
+
+        self.resolve = lru_cache(maxsize=cache_size)(self._resolve)
+
+    def book_name(self, name: str) -> Optional[str]:
+        """Stored book name for a title, abbreviation or variant spelling"""
+
+        key = _book_key(name)
+        return self.aliases.get(key) or self.aliases.get(key.replace(' ', ''))
+
+    def parse(self, reference: str) -> Optional[ScriptureReference]:
+        """Parse "<book> <chapter>[:<verse>[-<verse>]]" (None when malformed or the book is unknown)"""
+
+        match = _REFERENCE_PATTERN.match(amharic_cleaner.normalize_unicode(reference))
+        if not match:
+            return None
+
+        book = self.book_name(match.group("book"))
+        if book is None:
+            return None
+
+        chapter = geez_to_int(match.group("chapter"))
+        start = match.group("start")
+        end = match.group("end")
+        end_chapter = match.group("end_chapter")
+
+        return ScriptureReference(
+            book=book,
+            chapter=chapter,
+            start_verse=geez_to_int(start) if start else None,
+            end_verse=geez_to_int(end) if end else (geez_to_int(start) if start else None),
+            end_chapter=geez_to_int(end_chapter) if end_chapter else None
+        )
+
+    def _rows(self, parsed: ScriptureReference) -> List[int]:
+        """Row ids of a parsed reference in verse order"""
+
+        verses = self.index.verses
+        end_chapter = parsed.end_chapter or parsed.chapter
+
+        rows: List[int] = []
+        for chapter in range(parsed.chapter, end_chapter + 1):
+            start = parsed.start_verse if chapter == parsed.chapter and parsed.start_verse else 1
+            end = parsed.end_verse if chapter == end_chapter else None
+            selection = verses.verse_range(parsed.book, chapter, start, end)
+            if isinstance(selection, slice):
+                rows.extend(range(selection.start, selection.stop))
+            else:
+                rows.extend(int(row_id) for row_id in selection)
+        return rows
+
+    def _resolve(self, reference: str) -> Optional[Dict[str, Any]]:
+        """
+        Verses of a reference
+
+        Returns:
+            Dictionary with the parsed reference, the verse records and their
+            joined text; None when the reference cannot be parsed or has no
+            verses in the index
+        """
+        parsed = self.parse(reference)
+        if parsed is None or self.index is None:
+            return None
+
+        rows = self._rows(parsed)
+        if not rows:
+            return None
+
+        records = [self.index.records[row_id] for row_id in rows]
+        return {
+            "reference": str(parsed),
+            "parsed": parsed,
+            "rows": rows,
+            "verses": records,
+            "text": " ".join(record.get("text", "") for record in records)
+        }
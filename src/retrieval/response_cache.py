@@ -0,0 +1,157 @@
+"""
+Versioned cache of complete search responses
+Keys cover the normalized query, search parameters and the version of the
+data searched (embedding artifact or Chroma collection), so a rebuilt
+index never serves stale results
+"""
+
+import copy
+import json
+import time
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple, Callable
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from config.settings import settings
+from src.retrieval.query_encoder import normalize_query_text
+
+logger = logging.getLogger(__name__)
+
+_SHARED_CACHE: Optional["ResponseCache"] = None
+_SHARED_LOCK = threading.Lock()
+
+
+class ResponseCache:
+    """
+    LRU + TTL cache of search responses, partitioned by namespace
+
+    Each namespace (e.g. "bible_search", "chroma") remembers the data
+    version of its latest lookup; when a lookup arrives with a new version
+    the namespace's older entries are dropped.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600.0):
+        """
+        Args:
+            max_size: Maximum number of cached responses (0 disables caching)
+            ttl_seconds: Lifetime of an entry (0 = no expiry)
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, Tuple[float, Any]]" = OrderedDict()
+        self._versions: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace: str, version: Any, query: str, **params) -> Tuple[str, str, str, str]:
+        """Cache key for a query, its parameters and the data version"""
+
+        return (
+            namespace,
+            str(version),
+            normalize_query_text(query),
+            json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+        )
+
+    def _check_version(self, namespace: str, version: str) -> None:
+        """Drop a namespace's entries once its data version changes (lock held)"""
+
+        if self._versions.get(namespace) == version:
+            return
+
+        if namespace in self._versions:
+            stale = [key for key in self._entries if key[0] == namespace]
+            for key in stale:
+                del self._entries[key]
+            logger.info(f"Invalidated {len(stale)} cached '{namespace}' responses (new data version)")
+
+        self._versions[namespace] = version
+
+    def get(self, key: Tuple) -> Optional[Any]:
+        """Cached response (a copy) or None"""
+
+        with self._lock:
+            self._check_version(key[0], key[1])
+
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl_seconds and time.monotonic() - entry[0] > self.ttl_seconds:
+                del self._entries[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            value = entry[1]
+
+        return copy.deepcopy(value)
+
+    def put(self, key: Tuple, value: Any) -> None:
+        """Store a response"""
+
+        if self.max_size <= 0:
+            return
+
+        value = copy.deepcopy(value)
+
+        with self._lock:
+            self._check_version(key[0], key[1])
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get_or_compute(self, key: Tuple, compute: Callable[[], Any]) -> Any:
+        """Cached response, computing and storing it on a miss"""
+
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            if value is not None:
+                self.put(key, value)
+        return value
+
+    def invalidate(self, namespace: Optional[str] = None) -> None:
+        """Drop all entries (or those of one namespace)"""
+
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+                self._versions.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == namespace]:
+                    del self._entries[key]
+                self._versions.pop(namespace, None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy"""
+
+        lookups = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'size': len(self._entries),
+            'max_size': self.max_size,
+            'ttl_seconds': self.ttl_seconds
+        }
+
+
+def get_response_cache() -> ResponseCache:
+    """Response cache shared by all search paths of the process"""
+
+    global _SHARED_CACHE
+    with _SHARED_LOCK:
+        if _SHARED_CACHE is None:
+            _SHARED_CACHE = ResponseCache(settings.RESPONSE_CACHE_SIZE, settings.RESPONSE_CACHE_TTL)
+    return _SHARED_CACHE
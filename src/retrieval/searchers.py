@@ -0,0 +1,229 @@
+"""
+Search backend selection for the Bible vector index
+Every searcher exposes records and top_k(query, k, min_similarity, mask)
+"""
+
+import numpy as np
+from typing import List, Dict, Any, Optional, Tuple
+import logging
+
+from config.settings import settings
+from src.retrieval.vector_index import BibleVectorIndex
+from src.retrieval.filters import rows_of, mask_of
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_TYPES = ("exact", "hnsw", "ivfpq", "int8", "binary", "pca", "sharded")
+
+# Backends built over the unique vectors of a deduplicated index
+VECTOR_INDEX_TYPES = ("hnsw", "ivfpq", "int8", "binary", "pca")
+
+class VectorExpandingSearcher:
+    """
+    Searcher over the unique vectors of a deduplicated index, answering in rows
+
+    Late-chunked chunks of a passage share one vector, so the inner backend
+    indexes each vector once. A filter becomes the set of vectors with an
+    eligible row, and every vector hit expands to its eligible rows (with
+    the vector's similarity) until k rows are collected; k vector hits
+    always cover k rows.
+    """
+
+    def __init__(self, base: BibleVectorIndex, inner):
+        """
+        Args:
+            base: Deduplicated index (records, vector_ids)
+            inner: Searcher built over base.unique
+        """
+        self.base = base
+        self.inner = inner
+
+        # Rows of each vector, in row order (CSR layout)
+        self.vector_rows = np.argsort(base.vector_ids, kind="stable")
+        self.vector_offsets = np.concatenate(([0], np.cumsum(np.bincount(base.vector_ids, minlength=len(base.vectors)))))
+
+        if hasattr(inner, "top_k_with_report"):
+            self.top_k_with_report = self._top_k_with_report
+
+    @property
+    def records(self) -> List[Dict[str, Any]]:
+        return self.base.records
+
+    def __len__(self) -> int:
+        return len(self.base)
+
+    def _vector_selection(self, mask) -> Tuple[Optional[np.ndarray], Optional[np.ndarray]]:
+        """Vector ids with an eligible row and the boolean row mask (both None without a filter)"""
+
+        if mask is None:
+            return None, None
+        return np.unique(self.base.vector_ids[rows_of(mask)]), mask_of(mask, len(self.base))
+
+    def _expand(self, hits: List[Tuple[int, float]], k: int, eligible: Optional[np.ndarray]) -> List[Tuple[int, float]]:
+        """Row results of vector hits"""
+
+        results = []
+        for vector_id, similarity in hits:
+            for row_id in self.vector_rows[self.vector_offsets[vector_id]:self.vector_offsets[vector_id + 1]]:
+                if eligible is None or eligible[row_id]:
+                    results.append((int(row_id), similarity))
+                    if len(results) == k:
+                        return results
+        return results
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask=None) -> List[Tuple[int, float]]:
+        """Top-k rows; same contract as BibleVectorIndex.top_k"""
+
+        vectors, eligible = self._vector_selection(mask)
+        if vectors is not None and len(vectors) == 0:
+            return []
+        return self._expand(self.inner.top_k(query_embedding, k, min_similarity, vectors), k, eligible)
+
+    def _top_k_with_report(self,
+                           query_embedding: np.ndarray,
+                           k: int = 5,
+                           min_similarity: Optional[float] = None,
+                           mask=None) -> Tuple[List[Tuple[int, float]], Dict[str, Any]]:
+        """Top-k rows with the inner backend's report"""
+
+        vectors, eligible = self._vector_selection(mask)
+        if vectors is not None and len(vectors) == 0:
+            return [], {}
+        hits, report = self.inner.top_k_with_report(query_embedding, k, min_similarity, vectors)
+        return self._expand(hits, k, eligible), report
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask=None) -> List[List[Tuple[int, float]]]:
+        """Batched top-k rows (the inner backend's batched search when it has one)"""
+
+        vectors, eligible = self._vector_selection(mask)
+        if vectors is not None and len(vectors) == 0:
+            return [[] for _ in np.atleast_2d(query_embeddings)]
+        return [self._expand(hits, k, eligible)
+                for hits in top_k_many(self.inner, query_embeddings, k, min_similarity, vectors)]
+
+
+def available_index_types() -> Tuple[str, ...]:
+    """Index types whose dependencies are installed"""
+
+    from src.retrieval.hnsw_index import HAS_HNSWLIB
+
+    return tuple(index_type for index_type in SEARCH_INDEX_TYPES
+                 if index_type != "hnsw" or HAS_HNSWLIB)
+
+
+def create_searcher(index: BibleVectorIndex, index_type: str = None):
+    """
+    Wrap a BibleVectorIndex in the requested search backend
+
+    Args:
+        index: Exact index holding the embeddings and records
+        index_type: "exact", "hnsw", "ivfpq", "int8", "binary", "pca" or "sharded" (defaults to settings.SEARCH_INDEX_TYPE)
+
+    Returns:
+        A searcher with the BibleVectorIndex.top_k contract
+    """
+    index_type = (index_type or settings.SEARCH_INDEX_TYPE).lower()
+
+    # Searchers are shared between tools living in the same process; they are kept on
+    # the index, so a reloaded index gets new ones and the old ones go with it
+    if index_type in index.searchers:
+        return index.searchers[index_type]
+
+    if index.vector_ids is not None and index_type in VECTOR_INDEX_TYPES:
+        # Graphs and quantized copies hold each shared vector once; hits are expanded to rows
+        searcher = VectorExpandingSearcher(index, create_searcher(index.unique, index_type))
+
+    elif index_type == "exact":
+        searcher = index
+
+    elif index_type == "hnsw":
+        from src.retrieval.hnsw_index import load_or_build_hnsw
+
+        searcher = load_or_build_hnsw(
+            index,
+            index_dir=str(index.path) if index.path else None,
+            M=settings.HNSW_M,
+            ef_construction=settings.HNSW_EF_CONSTRUCTION,
+            ef_search=settings.HNSW_EF_SEARCH
+        )
+
+    elif index_type == "ivfpq":
+        from src.retrieval.ivfpq_index import load_or_build_ivfpq
+
+        searcher = load_or_build_ivfpq(
+            index,
+            index_dir=str(index.path) if index.path else None,
+            nlist=settings.IVF_NLIST,
+            m=settings.PQ_M,
+            nprobe=settings.IVF_NPROBE,
+            rerank=settings.IVFPQ_RERANK
+        )
+
+    elif index_type == "int8":
+        from src.retrieval.quantized_index import load_or_build_int8
+
+        searcher = load_or_build_int8(index, rerank=settings.INT8_RERANK)
+
+    elif index_type == "binary":
+        from src.retrieval.quantized_index import load_or_build_binary
+
+        searcher = load_or_build_binary(index, rerank=settings.BINARY_RERANK)
+
+    elif index_type == "pca":
+        from src.retrieval.quantized_index import load_or_build_pca
+
+        searcher = load_or_build_pca(index, dimension=settings.PCA_DIMENSION, rerank=settings.PCA_RERANK)
+
+    elif index_type == "sharded":
+        from src.retrieval.sharded_index import load_sharded
+
+        searcher = load_sharded(
+            index,
+            by=settings.SHARD_BY,
+            shards_dir=settings.SHARD_DIR or None,
+            names=[name.strip() for name in settings.SHARD_NAMES.split(",") if name.strip()] or None,
+            max_workers=settings.SHARD_WORKERS or None
+        )
+
+    else:
+        raise ValueError(f"Unknown search index type: {index_type} (expected one of {SEARCH_INDEX_TYPES})")
+
+    index.searchers[index_type] = searcher
+    return searcher
+
+
+def rows_view(index: BibleVectorIndex, searcher):
+    """
+    Index-like object whose records, filters, verses, BM25 index and cache version match the searcher's row ids
+
+    Persisted shards carry their own records (a rebuilt shard's text differs
+    from the base index's); every other backend answers in the base index's rows.
+    """
+    if all(hasattr(searcher, name) for name in ("filters", "verses", "lexical", "score", "cache_version")):
+        return searcher
+    return index
+
+
+def top_k_many(searcher,
+               query_embeddings: np.ndarray,
+               k: int = 5,
+               min_similarity: Optional[float] = None,
+               mask=None) -> List[List[Tuple[int, float]]]:
+    """
+    Top-k for a batch of queries on any searcher
+
+    Uses the searcher's batched top_k_many (one matrix-matrix product or
+    batched first stage) when it has one, otherwise runs top_k per query.
+    """
+    if hasattr(searcher, "top_k_many"):
+        return searcher.top_k_many(query_embeddings, k, min_similarity, mask)
+
+    return [searcher.top_k(query, k, min_similarity, mask) for query in np.atleast_2d(query_embeddings)]
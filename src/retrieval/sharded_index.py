@@ -0,0 +1,503 @@
+"""
+Book/testament-sharded Bible index with parallel shard search
+Each shard is an independent BibleVectorIndex; queries fan out over a
+thread pool (NumPy releases the GIL in the matrix products) and the
+per-shard top-k lists are merged with a heap
+"""
+
+import heapq
+import json
+import os
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from config.settings import BIBLE_BOOKS
+from src.embeddings.canonical_layout import canonical_book_order
+from src.embeddings.embedding_artifact import save_embedding_artifact
+from src.retrieval.vector_index import BibleVectorIndex
+from src.retrieval.filters import BibleFilterIndex, rows_of, mask_of
+
+logger = logging.getLogger(__name__)
+
+SHARDS_FILE = "shards.json"
+
+SHARD_STRATEGIES = ("testament", "book_group")
+
+# Canonical book positions (AmharicBiblicalParser.book_order) of each book group
+BOOK_GROUPS = {
+    "pentateuch": (1, 5),
+    "history": (6, 21),
+    "wisdom": (22, 28),
+    "prophets": (29, 46),
+    "gospels": (47, 50),
+    "acts_pauline": (51, 65),
+    "catholic_letters": (66, 73),
+}
+
+# Testament shards are named after the BIBLE_BOOKS sections
+TESTAMENT_SHARDS = dict(zip(("old", "new"), BIBLE_BOOKS))
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+
+
+def _executor(max_workers: Optional[int] = None) -> ThreadPoolExecutor:
+    """Thread pool shared by all sharded indexes of the process"""
+
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        _EXECUTOR = ThreadPoolExecutor(max_workers=max_workers or os.cpu_count() or 4,
+                                       thread_name_prefix="bible-shard")
+    return _EXECUTOR
+
+
+def shard_name(record: Dict[str, Any], by: str = "testament") -> str:
+    """Shard a record belongs to"""
+
+    if by == "testament":
+        return TESTAMENT_SHARDS.get(record.get("testament"), "other")
+
+    if by == "book_group":
+        position = canonical_book_order().get(record.get("book"))
+        if position is not None:
+            for name, (first, last) in BOOK_GROUPS.items():
+                if first <= position <= last:
+                    return name
+        return "other"
+
+    raise ValueError(f"Unknown shard strategy: {by} (expected one of {SHARD_STRATEGIES})")
+
+
+class IndexShard:
+    """A BibleVectorIndex holding a subset of the global rows"""
+
+    def __init__(self, name: str, index: BibleVectorIndex, row_ids: np.ndarray):
+        """
+        Args:
+            name: Shard name
+            index: Index over the shard rows
+            row_ids: Global row id of each shard row (ascending)
+        """
+        self.name = name
+        self.index = index
+        self.row_ids = np.asarray(row_ids, dtype=np.int64)
+
+        # Contiguous shards translate selections with slice arithmetic
+        self.span: Optional[Tuple[int, int]] = None
+        if len(self.row_ids) and int(self.row_ids[-1]) - int(self.row_ids[0]) + 1 == len(self.row_ids):
+            self.span = (int(self.row_ids[0]), int(self.row_ids[-1]) + 1)
+
+    def __len__(self) -> int:
+        return len(self.row_ids)
+
+    def local_selection(self, selection, n_rows: int):
+        """
+        Shard-local form of a global selection
+
+        Returns:
+            None (all shard rows), a slice or a row-id array in shard
+            coordinates; False when the selection misses the shard entirely
+        """
+        if selection is None:
+            return None
+
+        if self.span is not None:
+            start, stop = self.span
+            if isinstance(selection, slice):
+                lo, hi = max(selection.start, start), min(selection.stop, stop)
+                return slice(lo - start, hi - start) if lo < hi else False
+
+            rows = rows_of(selection)
+            lo, hi = np.searchsorted(rows, [start, stop])
+            return rows[lo:hi] - start if hi > lo else False
+
+        local = mask_of(selection, n_rows)[self.row_ids]
+        return np.flatnonzero(local) if local.any() else False
+
+    def top_k(self, query_embedding, k, min_similarity, selection) -> List[Tuple[int, float]]:
+        """Shard top-k with global row ids"""
+
+        return [(int(self.row_ids[row_id]), similarity)
+                for row_id, similarity in self.index.top_k(query_embedding, k, min_similarity, selection)]
+
+    def top_k_many(self, query_embeddings, k, min_similarity, selection) -> List[List[Tuple[int, float]]]:
+        """Batched shard top-k with global row ids"""
+
+        return [[(int(self.row_ids[row_id]), similarity) for row_id, similarity in matches]
+                for matches in self.index.top_k_many(query_embeddings, k, min_similarity, selection)]
+
+
+class ShardedBibleIndex:
+    """
+    Bible index split into testament or book-group shards
+
+    Exposes the searcher contract (records, top_k, top_k_many) over global
+    row ids. Shards can be built in memory as views of an existing index or
+    stored as one artifact per shard, so a deployment can open only the
+    shards it needs and a fixed book only requires rebuilding its shard.
+    """
+
+    def __init__(self,
+                 shards: Sequence[IndexShard],
+                 max_workers: Optional[int] = None,
+                 total_rows: int = 0,
+                 version: Optional[str] = None):
+        """
+        Args:
+            shards: Shards in global row order
+            max_workers: Thread pool size (defaults to the CPU count)
+            total_rows: Global row count when only some shards are loaded
+                (rows of the other shards have no record)
+            version: Identifier of the shard data for response caches
+        """
+        self.shards = list(shards)
+        self.max_workers = max_workers
+        self.n_rows = sum(len(shard) for shard in self.shards)
+        self.version = version
+
+        n_global = max(total_rows, max((int(shard.row_ids.max()) + 1 for shard in self.shards if len(shard)), default=0))
+        self.records: List[Dict[str, Any]] = [None] * n_global
+        # Shard and local row of every global row (-1 for rows without a loaded shard)
+        self._shard_of = np.full(n_global, -1, dtype=np.int32)
+        self._local_of = np.full(n_global, -1, dtype=np.int64)
+        for position, shard in enumerate(self.shards):
+            for local_id, row_id in enumerate(shard.row_ids):
+                self.records[row_id] = shard.index.records[local_id]
+            self._shard_of[shard.row_ids] = position
+            self._local_of[shard.row_ids] = np.arange(len(shard))
+
+        self._filters: Optional[BibleFilterIndex] = None
+        self._verses = None
+        self._lexical = None
+
+    @classmethod
+    def from_index(cls, index: BibleVectorIndex, by: str = "testament", max_workers: Optional[int] = None) -> "ShardedBibleIndex":
+        """
+        Shard an index in memory (contiguous shards are views of its matrix, not copies)
+
+        Shards of a deduplicated index keep the distinct vectors of their rows
+        with their own vector ids, so shared vectors are not expanded.
+        """
+
+        names = [shard_name(record, by) for record in index.records]
+
+        shards = []
+        for name in dict.fromkeys(names):
+            row_ids = np.flatnonzero(np.asarray(names) == name)
+            contiguous = int(row_ids[-1]) - int(row_ids[0]) + 1 == len(row_ids)
+            rows = slice(int(row_ids[0]), int(row_ids[-1]) + 1) if contiguous else row_ids
+            records = index.records[rows] if isinstance(rows, slice) else [index.records[row_id] for row_id in row_ids]
+            if index.vector_ids is None:
+                shard_index = BibleVectorIndex(index.matrix[rows], records, norms=index.norms[rows], version=index.version)
+            else:
+                vectors, vector_ids = np.unique(index.vector_ids[rows], return_inverse=True)
+                shard_index = BibleVectorIndex(index.vectors[vectors], records, norms=index.vector_norms[vectors],
+                                               version=index.version, vector_ids=vector_ids.reshape(-1))
+            shards.append(IndexShard(name, shard_index, row_ids))
+
+        logger.info(f"Sharded {len(index)} rows by {by}: " +
+                    ", ".join(f"{shard.name}={len(shard)}" for shard in shards))
+        return cls(shards, max_workers, version=index.cache_version)
+
+    @classmethod
+    def open(cls, shards_dir: str, names: Optional[Sequence[str]] = None, max_workers: Optional[int] = None) -> "ShardedBibleIndex":
+        """
+        Open shards written by save_shards
+
+        Shards saved with their global row ids keep them, so results line up
+        with the source index even when only some shards are loaded; older
+        catalogs number the loaded rows consecutively. Records, filters and
+        verses come from the shards themselves, so rebuilt shards are served
+        with their new text.
+
+        Args:
+            shards_dir: Directory holding shards.json and one artifact per shard
+            names: Shards to load (all when None)
+            max_workers: Thread pool size
+        """
+        path = Path(shards_dir)
+        catalog = read_catalog(str(path))
+        global_rows = all('rows_file' in entry for entry in catalog['shards'])
+
+        shards = []
+        offset = 0
+        for entry in catalog['shards']:
+            if names is not None and entry['name'] not in names:
+                continue
+            shard_index = BibleVectorIndex.from_artifact(str(path / entry['artifact']))
+            if global_rows:
+                row_ids = np.load(path / entry['rows_file'])
+            else:
+                row_ids = np.arange(offset, offset + len(shard_index))
+                offset += len(shard_index)
+            shards.append(IndexShard(entry['name'], shard_index, row_ids))
+
+        total_rows = sum(entry['rows'] for entry in catalog['shards']) if global_rows else 0
+        logger.info(f"Opened {len(shards)} of {len(catalog['shards'])} shards from {path}")
+        version = f"shards:{catalog.get('source_version')}:{catalog.get('updated_at', catalog.get('created_at'))}"
+        return cls(shards, max_workers, total_rows, version)
+
+    def __len__(self) -> int:
+        return self.n_rows
+
+    @property
+    def filters(self) -> BibleFilterIndex:
+        """Book / testament / chapter row sets over the global rows, built on first use"""
+        if self._filters is None:
+            # Rows of shards that were not loaded have no record
+            self._filters = BibleFilterIndex([record or {} for record in self.records])
+        return self._filters
+
+    @property
+    def verses(self):
+        """(book, chapter, verse) -> global row index over the shard records, built on first use"""
+        if self._verses is None:
+            from src.retrieval.verse_index import VerseReferenceIndex
+            self._verses = VerseReferenceIndex([record or {} for record in self.records])
+        return self._verses
+
+    @property
+    def lexical(self):
+        """BM25 index over the shard record texts, built on first use"""
+        if self._lexical is None:
+            from src.retrieval.bm25_index import BM25Index
+            self._lexical = BM25Index([record or {} for record in self.records])
+        return self._lexical
+
+    @property
+    def cache_version(self) -> str:
+        """Identifier of the shard data for response caches"""
+        return self.version if self.version is not None else f"memory:{id(self)}"
+
+    def score(self, query_embedding: np.ndarray, rows) -> np.ndarray:
+        """Cosine similarity of the query against the given global rows (rows without a shard score 0.0)"""
+
+        rows = rows_of(rows)
+        scores = np.zeros(len(rows), dtype=np.float32)
+        shard_of = self._shard_of[rows]
+        for position, shard in enumerate(self.shards):
+            selected = shard_of == position
+            if selected.any():
+                scores[selected] = shard.index.score(query_embedding, self._local_of[rows[selected]])
+        return scores
+
+    def shard(self, name: str) -> Optional[IndexShard]:
+        """Shard by name"""
+        return next((shard for shard in self.shards if shard.name == name), None)
+
+    def _fan_out(self, search, selection) -> List[Any]:
+        """Run search(shard, local_selection) on every shard the selection touches"""
+
+        targets = []
+        for shard in self.shards:
+            local = shard.local_selection(selection, len(self.records))
+            if local is not False:
+                targets.append((shard, local))
+
+        if len(targets) <= 1:
+            return [search(shard, local) for shard, local in targets]
+
+        pool = _executor(self.max_workers)
+        return list(pool.map(lambda target: search(*target), targets))
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask=None) -> List[Tuple[int, float]]:
+        """Top-k over all shards the selection touches (same contract as BibleVectorIndex.top_k)"""
+
+        per_shard = self._fan_out(
+            lambda shard, local: shard.top_k(query_embedding, k, min_similarity, local), mask)
+        return heapq.nlargest(k, (match for matches in per_shard for match in matches), key=lambda match: match[1])
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask=None) -> List[List[Tuple[int, float]]]:
+        """Batched top-k: one matrix-matrix product per shard, merged per query"""
+
+        n_queries = len(np.atleast_2d(query_embeddings))
+        per_shard = self._fan_out(
+            lambda shard, local: shard.top_k_many(query_embeddings, k, min_similarity, local), mask)
+
+        return [
+            heapq.nlargest(k, (match for matches in per_shard for match in matches[query]), key=lambda match: match[1])
+            for query in range(n_queries)
+        ]
+
+
+def read_catalog(shards_dir: str) -> Dict[str, Any]:
+    """Read the shards.json catalog of a shards directory"""
+    with open(Path(shards_dir) / SHARDS_FILE, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def shards_path_for(index: BibleVectorIndex, by: str = "testament") -> Optional[Path]:
+    """Default shards directory of an artifact-backed index (shards.<by> inside the artifact)"""
+    return Path(index.path) / f"shards.{by}" if index.path is not None else None
+
+
+def load_sharded(index: BibleVectorIndex,
+                 by: str = "testament",
+                 shards_dir: Optional[str] = None,
+                 names: Optional[Sequence[str]] = None,
+                 max_workers: Optional[int] = None) -> ShardedBibleIndex:
+    """
+    Sharded searcher over an index, from persisted shards when they exist
+
+    Shards written by save_shards for this version of the index are opened
+    (only `names` when given), so a deployment loads just the shard
+    matrices it searches. Otherwise the index is sharded in memory.
+    """
+    path = Path(shards_dir) if shards_dir else shards_path_for(index, by)
+
+    if path is not None and (path / SHARDS_FILE).exists():
+        catalog = read_catalog(str(path))
+        if catalog.get('by') == by and catalog.get('source_version') == str(index.version):
+            return ShardedBibleIndex.open(str(path), names, max_workers)
+        logger.warning(f"Shards in {path} do not match the index (by={catalog.get('by')}, "
+                       f"version={catalog.get('source_version')}); sharding in memory. "
+                       f"Rewrite them with python -m src.retrieval.sharded_index")
+
+    if names:
+        logger.warning("Shard names only apply to persisted shards; all shards are searched")
+    return ShardedBibleIndex.from_index(index, by, max_workers)
+
+
+def save_shards(index: BibleVectorIndex,
+                output_dir: Optional[str] = None,
+                by: str = "testament",
+                model_name: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Write an index as one artifact per shard plus a shards.json catalog
+
+    Each shard also stores the global row ids of its rows (<name>.rows.npy),
+    and the catalog records the index version it was cut from.
+
+    Args:
+        index: Index to shard
+        output_dir: Shards directory (defaults to shards.<by> inside the index artifact)
+        by: Shard strategy (see SHARD_STRATEGIES)
+        model_name: Model recorded in the shard artifacts (defaults to the index manifest's)
+
+    Returns:
+        The catalog written to disk
+    """
+    sharded = ShardedBibleIndex.from_index(index, by)
+    model_name = model_name or (index.manifest or {}).get('model', 'unknown')
+
+    if output_dir is None and index.path is None:
+        raise ValueError("save_shards needs an output_dir for an index without an artifact")
+
+    path = Path(output_dir) if output_dir else shards_path_for(index, by)
+    path.mkdir(parents=True, exist_ok=True)
+
+    entries = []
+    for shard in sharded.shards:
+        artifact = f"{shard.name}.artifact"
+        save_embedding_artifact(
+            str(path / artifact),
+            np.asarray(shard.index.vectors) * shard.index.vector_norms[:, None],
+            shard.index.records,
+            model_name,
+            source=str(index.path) if index.path else None,
+            vector_ids=shard.index.vector_ids,
+            # Rows stay in shard order so they line up with the stored global row ids
+            canonical_order=False
+        )
+        rows_file = f"{shard.name}.rows.npy"
+        np.save(path / rows_file, shard.row_ids)
+        entries.append({'name': shard.name, 'artifact': artifact, 'rows': len(shard), 'rows_file': rows_file})
+
+    catalog = {
+        'by': by,
+        'model': model_name,
+        'source_version': str(index.version) if index.version is not None else None,
+        'shards': entries,
+        'created_at': datetime.now().isoformat()
+    }
+    with open(path / SHARDS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"Saved {len(entries)} shards to {path}")
+    return catalog
+
+
+def rebuild_shard(shards_dir: str,
+                  name: str,
+                  embeddings: np.ndarray,
+                  records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Replace one shard (e.g. after a book's parse was fixed) without touching the others
+
+    Args:
+        shards_dir: Directory written by save_shards
+        name: Shard to replace
+        embeddings: (rows, dimension) embeddings of the shard's records
+        records: The shard's records
+
+    Returns:
+        The updated catalog
+    """
+    path = Path(shards_dir)
+    catalog = read_catalog(str(path))
+
+    entry = next((entry for entry in catalog['shards'] if entry['name'] == name), None)
+    if entry is None:
+        raise ValueError(f"Unknown shard: {name}")
+
+    misplaced = {shard_name(record, catalog['by']) for record in records} - {name}
+    if misplaced:
+        raise ValueError(f"Records for shard {name} belong to other shards: {sorted(misplaced)}")
+
+    save_embedding_artifact(str(path / entry['artifact']), embeddings, records, catalog['model'], canonical_order=False)
+    if 'rows_file' in entry and len(records) != entry['rows']:
+        # The shard keeps its global row ids as far as they go; extra rows get ids past every
+        # shard's, so the other shards stay aligned with the source index
+        row_ids = np.load(path / entry['rows_file'])[:len(records)]
+        next_id = max(int(np.load(path / shard_entry['rows_file']).max(initial=-1)) + 1
+                      for shard_entry in catalog['shards'])
+        row_ids = np.concatenate([row_ids, np.arange(next_id, next_id + len(records) - len(row_ids))]).astype(np.int64)
+        np.save(path / entry['rows_file'], row_ids)
+        logger.info(f"Shard {name} changed size ({entry['rows']} -> {len(records)} rows)")
+    entry['rows'] = len(records)
+    catalog['updated_at'] = datetime.now().isoformat()
+
+    with open(path / SHARDS_FILE, 'w', encoding='utf-8') as f:
+        json.dump(catalog, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"Rebuilt shard {name}: {len(records)} rows")
+    return catalog
+
+
+def main():
+    """Write the shards of an embeddings file so the sharded searcher opens them instead of re-sharding"""
+
+    import argparse
+    from src.retrieval.vector_index import load_bible_index
+
+    parser = argparse.ArgumentParser(description="Write per-shard artifacts of a Bible index")
+    parser.add_argument("embeddings", nargs="?", default="data/embeddings/fixed_structured_embeddings.jsonl")
+    parser.add_argument("--by", default="testament", choices=SHARD_STRATEGIES)
+    parser.add_argument("--output", default=None, help="Shards directory (defaults to shards.<by> inside the artifact)")
+    args = parser.parse_args()
+
+    index = load_bible_index(args.embeddings)
+    if index is None:
+        print(f"❌ Embeddings not found: {args.embeddings}")
+        return
+
+    catalog = save_shards(index, args.output, by=args.by)
+    for entry in catalog['shards']:
+        print(f"  {entry['name']}: {entry['rows']} rows")
+
+
+if __name__ == "__main__":
+    main()
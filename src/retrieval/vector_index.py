@@ -0,0 +1,422 @@
+"""
+Shared vectorized similarity index for Amharic Bible embeddings
+Loads embeddings once into a contiguous L2-normalized float32 matrix
+"""
+
+import json
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple, Iterable
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from src.embeddings.embedding_artifact import (load_embedding_artifact, fresh_artifact_for, artifact_path_for,
+                                               vectors_path_for, MANIFEST_FILE)
+from src.retrieval.filters import BibleFilterIndex, rows_of
+from src.chunking.corpus_text import corpus_path_for, with_corpus
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Indexes shared between tools living in the same process (keyed by resolved path),
+# with the file stamp they were loaded at
+_INDEX_CACHE: Dict[str, Tuple["BibleVectorIndex", Tuple]] = {}
+
+
+class BibleVectorIndex:
+    """
+    Exact cosine-similarity index over Bible chunk embeddings
+
+    Rows are stored L2-normalized so a query is scored with a single
+    matrix-vector product and the top-k are picked with argpartition.
+
+    Late-chunked data shares one vector between all chunks of a passage;
+    with vector_ids the index keeps each distinct vector once, scores the
+    unique vectors and expands the scores to their rows.
+    """
+
+    def __init__(self,
+                 embeddings: np.ndarray,
+                 records: List[Dict[str, Any]],
+                 norms: Optional[np.ndarray] = None,
+                 version: Optional[str] = None,
+                 vector_ids: Optional[np.ndarray] = None):
+        """
+        Build the index from an embedding matrix and per-row metadata
+
+        Args:
+            embeddings: (rows, dimension) array of raw embeddings, or
+                (vectors, dimension) unique vectors when vector_ids is given
+            records: Chunk metadata (without the embedding) aligned with rows
+            norms: Original norms of the embeddings; when given, embeddings are
+                taken as already L2-normalized and used as-is (no copy, mmap-friendly)
+            version: Identifier of the embeddings the index was built from
+            vector_ids: Row -> embeddings row mapping for deduplicated data
+        """
+        if vector_ids is not None:
+            vector_ids = np.asarray(vector_ids, dtype=np.int64)
+            if len(vector_ids) != len(records):
+                raise ValueError(f"Got {len(vector_ids)} vector ids for {len(records)} records")
+        elif len(records) != len(embeddings):
+            raise ValueError(f"Got {len(embeddings)} embeddings for {len(records)} records")
+
+        matrix = np.ascontiguousarray(embeddings, dtype=np.float32)
+        if matrix.ndim != 2:
+            matrix = matrix.reshape(len(embeddings), -1)
+
+        if norms is not None:
+            vector_norms = np.asarray(norms, dtype=np.float32)
+            self.vectors = matrix
+        else:
+            # Precompute norms once; zero vectors stay zero and score 0.0
+            vector_norms = np.linalg.norm(matrix, axis=1).astype(np.float32)
+            safe_norms = np.where(vector_norms == 0, 1.0, vector_norms).astype(np.float32)
+            self.vectors = matrix / safe_norms[:, None]
+
+        self.vector_ids = vector_ids
+        self.vector_norms = vector_norms
+        self.norms = vector_norms if vector_ids is None else vector_norms[vector_ids]
+        self._matrix: Optional[np.ndarray] = None
+        self._unique: Optional["BibleVectorIndex"] = None
+
+        self.records = records
+        self.version = version
+        self.manifest: Optional[Dict[str, Any]] = None
+        self.path: Optional[Path] = None
+        self._filters: Optional[BibleFilterIndex] = None
+        self._lexical = None
+        self._verses = None
+        # Searchers built over this index (create_searcher, load_or_build_cascade), released with it
+        self.searchers: Dict[str, Any] = {}
+
+    @classmethod
+    def from_chunks(cls, chunks: Iterable[Dict[str, Any]], embedding_key: str = "embedding") -> "BibleVectorIndex":
+        """Build an index from chunk dicts carrying an embedding list"""
+
+        vectors = []
+        records = []
+
+        for chunk in chunks:
+            embedding = chunk.get(embedding_key)
+            if embedding is None:
+                continue
+
+            vectors.append(embedding)
+            records.append({key: value for key, value in chunk.items() if key != embedding_key})
+
+        if not vectors:
+            raise ValueError("No embeddings found in chunks")
+
+        return cls(np.asarray(vectors, dtype=np.float32), records)
+
+    @classmethod
+    def from_jsonl(cls, jsonl_file: str, embedding_key: str = "embedding") -> "BibleVectorIndex":
+        """Build an index from a JSONL file of embedded chunks (or deduplicated chunks + vectors file)"""
+
+        def iter_chunks():
+            with open(jsonl_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+        vectors_file = vectors_path_for(jsonl_file)
+        if vectors_file.exists():
+            records = list(iter_chunks())
+            index = cls(np.load(vectors_file), records,
+                        vector_ids=np.asarray([record['vector_id'] for record in records]))
+        else:
+            index = cls.from_chunks(iter_chunks(), embedding_key)
+        # Text of 'text_span' records is decoded from the corpus blob on access
+        index.records = with_corpus(index.records, corpus_path_for(jsonl_file))
+        index.version = f"jsonl:{Path(jsonl_file).stat().st_mtime_ns}"
+        logger.info(f"Indexed {len(index)} embeddings from {jsonl_file}")
+        return index
+
+    @classmethod
+    def from_artifact(cls, artifact_dir: str, mmap: bool = True) -> "BibleVectorIndex":
+        """Open an index over a binary embedding artifact (memory-mapped by default)"""
+
+        artifact = load_embedding_artifact(artifact_dir, mmap=mmap)
+        index = cls(
+            artifact.embeddings,
+            with_corpus(artifact.records, artifact.corpus_file),
+            norms=artifact.norms,
+            version=artifact.manifest.get('created_at'),
+            vector_ids=artifact.vector_ids
+        )
+        index.manifest = artifact.manifest
+        index.path = artifact.path
+        logger.info(f"Opened {len(index)} embeddings from artifact {artifact_dir}")
+        return index
+
+    def __len__(self) -> int:
+        return len(self.records)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.vectors.shape[1])
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """
+        Normalized (rows, dimension) matrix
+
+        Deduplicated vectors are expanded on first use, one copy per row; the
+        search backends avoid that by searching `unique` instead.
+        """
+        if self.vector_ids is None:
+            return self.vectors
+        if self._matrix is None:
+            self._matrix = self.vectors[self.vector_ids]
+        return self._matrix
+
+    @property
+    def unique(self) -> "BibleVectorIndex":
+        """
+        Index with one row per distinct vector (the index itself without vector_ids)
+
+        Approximate and quantized searchers are built over it and their hits
+        expanded to rows (see searchers.VectorExpandingSearcher), so graphs,
+        codes and re-scoring copies hold each shared vector once.
+        """
+        if self.vector_ids is None:
+            return self
+        if self._unique is None:
+            unique = BibleVectorIndex(
+                self.vectors,
+                [{'vector_id': vector_id} for vector_id in range(len(self.vectors))],
+                norms=self.vector_norms,
+                version=f"{self.version}:vectors" if self.version is not None else None
+            )
+            unique.manifest = self.manifest
+            unique.path = self.path
+            self._unique = unique
+        return self._unique
+
+    def _scoring_block(self, rows=None) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+        """
+        Vectors to score for a row selection and the map expanding their scores to rows
+
+        Without vector_ids this is simply the selected rows of the matrix
+        (expand is None). Otherwise only the distinct vectors of the selected
+        rows are returned, with scores[expand] giving one score per row.
+        """
+        if self.vector_ids is None:
+            return (self.vectors if rows is None else self.vectors[rows]), None
+
+        if rows is None:
+            return self.vectors, self.vector_ids
+
+        unique, expand = np.unique(self.vector_ids[rows], return_inverse=True)
+        return self.vectors[unique], expand.reshape(-1)
+
+    @property
+    def filters(self) -> BibleFilterIndex:
+        """Book / testament / chapter row sets, built on first use (from the artifact layout when it has one)"""
+        if self._filters is None:
+            self._filters = BibleFilterIndex(self.records, layout=(self.manifest or {}).get('layout'))
+        return self._filters
+
+    @property
+    def verses(self):
+        """(book, chapter, verse) -> row index, built on first use"""
+        if self._verses is None:
+            from src.retrieval.verse_index import VerseReferenceIndex
+            self._verses = VerseReferenceIndex(self.records)
+        return self._verses
+
+    @property
+    def lexical(self):
+        """BM25 index over the record texts, built on first use"""
+        if self._lexical is None:
+            from src.retrieval.bm25_index import BM25Index
+            self._lexical = BM25Index(self.records)
+        return self._lexical
+
+    @property
+    def cache_version(self) -> str:
+        """Identifier of the indexed data for response caches"""
+        return str(self.version) if self.version is not None else f"memory:{id(self)}"
+
+    def normalize_query(self, query_embedding: np.ndarray) -> np.ndarray:
+        """Return the query as a unit-length float32 vector"""
+
+        query = np.asarray(query_embedding, dtype=np.float32).reshape(-1)
+        norm = np.linalg.norm(query)
+
+        if norm == 0:
+            return query
+
+        return query / norm
+
+    def normalize_queries(self, query_embeddings: np.ndarray) -> np.ndarray:
+        """Return a batch of queries as a (queries, dimension) matrix of unit-length rows"""
+
+        queries = np.asarray(query_embeddings, dtype=np.float32).reshape(-1, self.dimension)
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        return queries / np.where(norms == 0, 1.0, norms)
+
+    def score(self, query_embedding: np.ndarray, rows: Optional[np.ndarray] = None) -> np.ndarray:
+        """Cosine similarity of the query against all rows (or the given row ids / slice)"""
+
+        query = self.normalize_query(query_embedding)
+        block, expand = self._scoring_block(rows)
+        scores = block @ query
+
+        return scores if expand is None else scores[expand]
+
+    def top_k(self,
+              query_embedding: np.ndarray,
+              k: int = 5,
+              min_similarity: Optional[float] = None,
+              mask: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """
+        Find the k most similar rows
+
+        Args:
+            query_embedding: Raw query vector
+            k: Number of results
+            min_similarity: Drop results scoring below this threshold
+            mask: Optional selection of eligible rows: a slice, a boolean
+                array or an array of row ids (see BibleFilterIndex.select)
+
+        Returns:
+            List of (row_id, similarity) sorted by descending similarity
+        """
+
+        if isinstance(mask, slice):
+            # Contiguous rows: score a view of the matrix, no gather
+            scores = self.score(query_embedding, mask)
+            return self._select_top_k(scores, k, min_similarity, range(mask.start, mask.stop))
+
+        rows = None
+        if mask is not None:
+            rows = rows_of(mask)
+            if len(rows) == 0:
+                return []
+
+        scores = self.score(query_embedding, rows)
+        return self._select_top_k(scores, k, min_similarity, rows)
+
+    def top_k_many(self,
+                   query_embeddings: np.ndarray,
+                   k: int = 5,
+                   min_similarity: Optional[float] = None,
+                   mask: Optional[np.ndarray] = None) -> List[List[Tuple[int, float]]]:
+        """
+        Top-k for a batch of queries with one matrix-matrix product
+
+        Args:
+            query_embeddings: (queries, dimension) raw query vectors
+            k, min_similarity, mask: As in top_k, shared by every query
+
+        Returns:
+            One top_k result list per query
+        """
+        queries = self.normalize_queries(query_embeddings)
+
+        if isinstance(mask, slice):
+            rows = range(mask.start, mask.stop)
+            block, expand = self._scoring_block(mask)
+        elif mask is not None:
+            rows = rows_of(mask)
+            if len(rows) == 0:
+                return [[] for _ in range(len(queries))]
+            block, expand = self._scoring_block(rows)
+        else:
+            rows = None
+            block, expand = self._scoring_block()
+
+        # (queries, rows): every query's scores are one contiguous row
+        scores = queries @ block.T
+        if expand is not None:
+            scores = scores[:, expand]
+        return [self._select_top_k(query_scores, k, min_similarity, rows) for query_scores in scores]
+
+    def _select_top_k(self,
+                      scores: np.ndarray,
+                      k: int,
+                      min_similarity: Optional[float],
+                      rows: Optional[np.ndarray] = None) -> List[Tuple[int, float]]:
+        """Pick the top-k entries of a score vector with argpartition"""
+
+        if k <= 0 or len(scores) == 0:
+            return []
+
+        k = min(k, len(scores))
+
+        if k < len(scores):
+            candidates = np.argpartition(-scores, k - 1)[:k]
+        else:
+            candidates = np.arange(len(scores))
+
+        ordered = candidates[np.argsort(-scores[candidates], kind="stable")]
+
+        results = []
+        for position in ordered:
+            similarity = float(scores[position])
+            if min_similarity is not None and similarity < min_similarity:
+                break
+
+            row_id = int(rows[position]) if rows is not None else int(position)
+            results.append((row_id, similarity))
+
+        return results
+
+    def search(self,
+               query_embedding: np.ndarray,
+               k: int = 5,
+               min_similarity: Optional[float] = None,
+               mask: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """Top-k search returning copies of the matching records with a similarity field"""
+
+        return [
+            {**self.records[row_id], "similarity": similarity}
+            for row_id, similarity in self.top_k(query_embedding, k, min_similarity, mask)
+        ]
+
+
+def _data_stamp(path: Path) -> Tuple:
+    """Modification times of an embeddings file and of its artifact's manifest, swapped in last (None when missing)"""
+
+    stamps = []
+    for file in (artifact_path_for(str(path)) / MANIFEST_FILE, path):
+        try:
+            stamps.append(file.stat().st_mtime_ns if file.is_file() else None)
+        except OSError:
+            stamps.append(None)
+    return tuple(stamps)
+
+
+def load_bible_index(embeddings_file: str) -> Optional[BibleVectorIndex]:
+    """
+    Load the shared index for an embeddings file
+
+    A binary artifact next to the JSONL file (or passed directly) is
+    memory-mapped; the JSONL file is only parsed when no artifact exists or
+    the JSONL file was regenerated after it. The index is loaded once per
+    process and reloaded when the file or the artifact matrix is rewritten
+    (by another process, e.g. a re-run embedder), which also gives it a
+    new cache_version.
+    """
+
+    path = Path(embeddings_file)
+    cache_key = str(path.resolve())
+    stamp = _data_stamp(path)
+
+    cached = _INDEX_CACHE.get(cache_key)
+    if cached is not None and cached[1] == stamp:
+        return cached[0]
+
+    artifact_dir = fresh_artifact_for(str(path))
+    if artifact_dir is not None:
+        index = BibleVectorIndex.from_artifact(str(artifact_dir))
+    elif path.exists():
+        logger.info(f"No binary artifact for {path}, parsing JSONL "
+                    f"(convert with src/embeddings/embedding_artifact.py)")
+        index = BibleVectorIndex.from_jsonl(str(path))
+    else:
+        logger.warning(f"Embeddings file not found: {path}")
+        return None
+
+    _INDEX_CACHE[cache_key] = (index, stamp)
+    return index
@@ -0,0 +1,142 @@
+"""
+Verse reference index for direct verse and range retrieval
+Maps canonical (book_id, chapter, verse) keys to row ids once at load, so
+looking up a verse, a verse range or the neighbors of a hit needs no scan
+"""
+
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from src.embeddings.canonical_layout import canonical_book_order
+
+logger = logging.getLogger(__name__)
+
+
+def _verse_span(record: Dict[str, Any]) -> Optional[Tuple[int, int]]:
+    """First and last verse covered by a record (verse_number or verse_range)"""
+
+    verse = record.get("verse_number")
+    if isinstance(verse, int) and verse > 0:
+        return verse, verse
+
+    verse_range = record.get("verse_range")
+    if isinstance(verse_range, (list, tuple)) and len(verse_range) == 2:
+        try:
+            start, end = int(verse_range[0]), int(verse_range[1])
+        except (TypeError, ValueError):
+            return None
+        if 0 < start <= end:
+            return start, end
+
+    return None
+
+
+class VerseReferenceIndex:
+    """
+    (book_id, chapter, verse) -> row id index over the records of a Bible index
+
+    Book ids follow the canonical book order. Each chapter also keeps its rows
+    sorted by first verse, so a verse range only compares that chapter's
+    spans and comes back as a slice when the rows are contiguous (always
+    the case for canonically ordered artifacts).
+    """
+
+    def __init__(self, records: List[Dict[str, Any]]):
+        """
+        Args:
+            records: Row metadata (book, chapter, verse_number or verse_range)
+        """
+        self.book_ids: Dict[str, int] = dict(canonical_book_order())
+        self.verse_rows: Dict[Tuple[int, int, int], int] = {}
+
+        chapter_spans: Dict[Tuple[int, int], List[Tuple[int, int, int]]] = {}
+
+        for row_id, record in enumerate(records):
+            book = record.get("book")
+            chapter = record.get("chapter")
+            span = _verse_span(record)
+            if not isinstance(book, str) or not isinstance(chapter, int) or span is None:
+                continue
+
+            book_id = self.book_ids.setdefault(book, len(self.book_ids) + 1)
+            chapter_spans.setdefault((book_id, chapter), []).append((span[0], span[1], row_id))
+
+            for verse in range(span[0], span[1] + 1):
+                # First row covering a verse wins (chunks may overlap)
+                self.verse_rows.setdefault((book_id, chapter, verse), row_id)
+
+        # Per chapter: first verse, last verse and row id of each row, ordered by first verse
+        self.chapters: Dict[Tuple[int, int], Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+        self.row_chapter: Dict[int, Tuple[Tuple[int, int], int]] = {}
+
+        for key, spans in chapter_spans.items():
+            spans.sort()
+            starts = np.asarray([span[0] for span in spans], dtype=np.int32)
+            ends = np.asarray([span[1] for span in spans], dtype=np.int32)
+            rows = np.asarray([span[2] for span in spans], dtype=np.int32)
+            self.chapters[key] = (starts, ends, rows)
+            for position, row_id in enumerate(rows):
+                self.row_chapter[int(row_id)] = (key, position)
+
+        logger.info(f"Built verse index: {len(self.verse_rows)} verses in {len(self.chapters)} chapters")
+
+    def book_id(self, book: str) -> Optional[int]:
+        """Canonical id of a book name (None when the index has no such book)"""
+        return self.book_ids.get(book)
+
+    def lookup(self, book: str, chapter: int, verse: int) -> Optional[int]:
+        """Row id holding a verse, or None"""
+
+        book_id = self.book_ids.get(book)
+        if book_id is None:
+            return None
+        return self.verse_rows.get((book_id, int(chapter), int(verse)))
+
+    def verse_count(self, book: str, chapter: int) -> int:
+        """Last verse number indexed for a chapter (0 when unknown)"""
+
+        entry = self.chapters.get((self.book_ids.get(book), int(chapter)))
+        return int(entry[1].max()) if entry is not None and len(entry[1]) else 0
+
+    def verse_range(self, book: str, chapter: int, start: int = 1, end: Optional[int] = None):
+        """
+        Rows covering verses start..end (inclusive) of a chapter
+
+        Args:
+            book: Book name
+            chapter: Chapter number
+            start: First verse
+            end: Last verse (defaults to the end of the chapter)
+
+        Returns:
+            A slice when the rows are contiguous, otherwise an int32 array of
+            row ids in verse order; an empty array when nothing matches
+        """
+        entry = self.chapters.get((self.book_ids.get(book), int(chapter)))
+        if entry is None:
+            return np.empty(0, dtype=np.int32)
+
+        starts, ends, rows = entry
+        end = int(ends.max()) if end is None else int(end)
+
+        # Rows whose span overlaps [start, end]; at most one chapter's worth of entries
+        selected = rows[(starts <= end) & (ends >= int(start))]
+
+        if len(selected) and np.all(np.diff(selected) == 1):
+            return slice(int(selected[0]), int(selected[-1]) + 1)
+        return selected
+
+    def neighbors(self, row_id: int, before: int = 1, after: int = 1) -> List[int]:
+        """Row ids of the verses around a row within its chapter (the row itself included)"""
+
+        entry = self.row_chapter.get(int(row_id))
+        if entry is None:
+            return [int(row_id)]
+
+        key, position = entry
+        rows = self.chapters[key][2]
+        return [int(row) for row in rows[max(0, position - before):position + after + 1]]
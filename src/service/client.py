@@ -0,0 +1,132 @@
+"""
+Thin client for the local Bible search service
+Keeps one pooled keep-alive HTTP connection set per service URL
+"""
+
+import threading
+import numpy as np
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+import httpx
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+_CLIENTS: Dict[str, "SearchServiceClient"] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+class SearchServiceClient:
+    """Synchronous client for src/service/search_service.py"""
+
+    def __init__(self, base_url: str, timeout: float = 30.0, max_connections: int = 10):
+        """
+        Args:
+            base_url: Service URL, e.g. http://127.0.0.1:8000
+            timeout: Request timeout in seconds
+            max_connections: Size of the connection pool
+        """
+        self.base_url = base_url.rstrip("/")
+        self.http = httpx.Client(
+            base_url=self.base_url,
+            timeout=timeout,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        )
+        self._model: Optional[str] = None
+
+    def _get(self, path: str, **params) -> Dict[str, Any]:
+        response = self.http.get(path, params={key: value for key, value in params.items() if value is not None})
+        response.raise_for_status()
+        return response.json()
+
+    def _post(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        response = self.http.post(path, json=payload)
+        response.raise_for_status()
+        return response.json()
+
+    def health(self) -> Dict[str, Any]:
+        """Service status: rows, books, model, index type and data version"""
+        return self._get("/health")
+
+    def search_many(self,
+                    queries: List[str],
+                    max_results: int = 5,
+                    min_similarity: Optional[float] = 0.3,
+                    book_filter: Optional[List[str]] = None,
+                    testament_filter: Optional[str] = None,
+                    chapter_filter: Optional[List[int]] = None,
+                    mode: str = "dense",
+                    context_verses: int = 0) -> List[List[Dict[str, Any]]]:
+        """
+        Search several queries in one request
+
+        Returns:
+            One list of hits ({row_id, similarity, record[, fusion_score][, context]}) per query
+        """
+        return self._post("/search", {
+            "queries": list(queries),
+            "max_results": max_results,
+            "min_similarity": min_similarity,
+            "book_filter": book_filter,
+            "testament_filter": testament_filter,
+            "chapter_filter": chapter_filter,
+            "mode": mode,
+            "context_verses": context_verses
+        })["results"]
+
+    def search(self, query: str, max_results: int = 5, **kwargs) -> List[Dict[str, Any]]:
+        """Hits of a single query (keyword arguments as in search_many)"""
+        return self.search_many([query], max_results, **kwargs)[0]
+
+    def model(self) -> str:
+        """Embedding model of the service (asked once; the service keeps its model while it runs)"""
+        if self._model is None:
+            self._model = self.health()["model"]
+        return self._model
+
+    def encode(self, queries: List[str]) -> np.ndarray:
+        """Embed queries with the service's resident model"""
+        return np.asarray(self._post("/encode", {"queries": list(queries)})["embeddings"], dtype=np.float32)
+
+    def verse(self, book: str, chapter: int, verse: int, context_verses: int = 0) -> Optional[Dict[str, Any]]:
+        """A verse record with its chapter's verse count and surrounding verses (None when missing)"""
+        try:
+            return self._get(f"/verse/{book}/{chapter}/{verse}", context_verses=context_verses)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    def passage(self, reference: str) -> Optional[Dict[str, Any]]:
+        """Verses and text of a scripture reference (None when it cannot be resolved)"""
+        try:
+            return self._get("/passage", reference=reference)
+        except httpx.HTTPStatusError as e:
+            if e.response.status_code == 404:
+                return None
+            raise
+
+    def close(self) -> None:
+        self.http.close()
+
+
+def get_search_client(base_url: Optional[str] = None) -> Optional[SearchServiceClient]:
+    """
+    Shared client for the configured search service
+
+    Returns None when no service URL is configured (settings.SEARCH_SERVICE_URL),
+    in which case callers load the index and model in-process.
+    """
+    base_url = base_url or settings.SEARCH_SERVICE_URL
+    if not base_url:
+        return None
+
+    with _CLIENTS_LOCK:
+        if base_url not in _CLIENTS:
+            _CLIENTS[base_url] = SearchServiceClient(base_url, timeout=settings.SEARCH_SERVICE_TIMEOUT)
+        return _CLIENTS[base_url]
@@ -0,0 +1,227 @@
+"""
+Local Bible search service
+One long-running process owns the embedding model and the vector index;
+the Streamlit app, the MCP server and the Q&A system query it over HTTP
+(see src/service/client.py) instead of loading their own copies
+
+Run with: python -m src.service.search_service
+"""
+
+import copy
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+from fastapi import FastAPI, HTTPException
+from pydantic import BaseModel, Field
+import uvicorn
+
+from config.settings import settings
+from src.retrieval.vector_index import load_bible_index
+from src.retrieval.searchers import create_searcher, rows_view, top_k_many
+from src.retrieval.query_encoder import get_query_encoder
+from src.retrieval.reference_resolver import ReferenceResolver
+from src.retrieval.fusion import hybrid_top_k
+from src.retrieval.cascade_index import load_or_build_cascade
+
+logger = logging.getLogger(__name__)
+
+
+class SearchRequest(BaseModel):
+    """Batch search request; every query shares the parameters"""
+    queries: List[str] = Field(..., min_length=1)
+    max_results: int = 5
+    min_similarity: Optional[float] = 0.3
+    book_filter: Optional[List[str]] = None
+    testament_filter: Optional[str] = None
+    chapter_filter: Optional[List[int]] = None
+    mode: str = "dense"
+    context_verses: int = 0
+
+
+class EncodeRequest(BaseModel):
+    """Queries to embed with the resident model"""
+    queries: List[str] = Field(..., min_length=1)
+
+
+class SearchState:
+    """Model, index and searcher owned by the service process"""
+
+    def __init__(self, embeddings_file: str, index_type: Optional[str] = None):
+        self.embeddings_file = embeddings_file
+        self.index_type = index_type or settings.SEARCH_INDEX_TYPE
+        self.started_at = time.time()
+
+        self.index = load_bible_index(embeddings_file)
+        if self.index is None:
+            raise FileNotFoundError(f"Bible embeddings not found: {embeddings_file}")
+
+        self.searcher = create_searcher(self.index, self.index_type)
+        # Records and filters in the searcher's row ids (a rebuilt shard may differ from the index)
+        self.rows = rows_view(self.index, self.searcher)
+        self.encoder = get_query_encoder(settings.EMBEDDING_MODEL)
+        self.resolver = ReferenceResolver(self.index)
+
+        # Load the model now so the first request does not pay for it
+        self.encoder.encode_one("ሰላም")
+
+    def refreshed(self) -> "SearchState":
+        """
+        This state, or a copy over the rebuilt index when load_bible_index reloaded the file
+
+        Requests work on the state returned here, so a reload never swaps the
+        index under a request that is already running.
+        """
+        index = load_bible_index(self.embeddings_file) or self.index
+        if index is self.index:
+            return self
+
+        state = copy.copy(self)
+        state.index = index
+        state.searcher = create_searcher(index, self.index_type)
+        state.rows = rows_view(index, state.searcher)
+        state.resolver = ReferenceResolver(index)
+        logger.info(f"Reloaded {self.embeddings_file}: {len(index)} rows (version {index.cache_version})")
+        return state
+
+    def context(self, row_id: int, context_verses: int, rows=None) -> List[Dict[str, Any]]:
+        """Records of the verses around a row of `rows` (default self.rows)"""
+
+        rows = self.rows if rows is None else rows
+        return [
+            rows.records[neighbor]
+            for neighbor in rows.verses.neighbors(row_id, context_verses, context_verses)
+            if neighbor != row_id
+        ]
+
+    def hits(self,
+             matches: List,
+             fusion_scores: Optional[List[float]] = None,
+             context_verses: int = 0,
+             rows=None) -> List[Dict[str, Any]]:
+        """Wire format of (row_id, similarity) matches in the rows of `rows` (default self.rows)"""
+
+        rows = self.rows if rows is None else rows
+        hits = []
+        for position, (row_id, similarity) in enumerate(matches):
+            hit = {"row_id": row_id, "similarity": similarity, "record": rows.records[row_id]}
+            if fusion_scores is not None:
+                hit["fusion_score"] = fusion_scores[position]
+            if context_verses > 0:
+                hit["context"] = self.context(row_id, context_verses, rows)
+            hits.append(hit)
+        return hits
+
+
+def create_app(embeddings_file: Optional[str] = None, index_type: Optional[str] = None) -> FastAPI:
+    """
+    Build the service application
+
+    Args:
+        embeddings_file: Verse embeddings (JSONL or artifact); defaults to settings.SEARCH_SERVICE_EMBEDDINGS
+        index_type: Search backend; defaults to settings.SEARCH_INDEX_TYPE
+    """
+    state: Dict[str, SearchState] = {}
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        state["search"] = SearchState(embeddings_file or settings.SEARCH_SERVICE_EMBEDDINGS, index_type)
+        logger.info(f"Search service ready: {len(state['search'].index)} rows ({state['search'].index_type})")
+        yield
+        state["search"].encoder.save()
+
+    app = FastAPI(title="Amharic Bible Search Service", lifespan=lifespan)
+
+    @app.get("/health")
+    def health() -> Dict[str, Any]:
+        search = state["search"] = state["search"].refreshed()
+        return {
+            "status": "ok",
+            "rows": len(search.index),
+            "chapters": len(search.index.filters.chapter_rows),
+            "books": search.index.filters.books,
+            "model": settings.EMBEDDING_MODEL,
+            "index_type": search.index_type,
+            "version": search.index.cache_version,
+            "uptime_seconds": time.time() - search.started_at,
+            "query_cache": search.encoder.stats()
+        }
+
+    @app.post("/search")
+    def search(request: SearchRequest) -> Dict[str, Any]:
+        search = state["search"] = state["search"].refreshed()
+        if request.mode not in ("dense", "hybrid", "cascade"):
+            raise HTTPException(status_code=400, detail=f"Unknown search mode: {request.mode}")
+
+        query_embeddings = search.encoder.encode(request.queries)
+
+        if request.mode == "cascade":
+            # The cascade answers in the base index's rows
+            mask = search.index.filters.select(request.book_filter, request.testament_filter, request.chapter_filter)
+            try:
+                cascade = load_or_build_cascade(search.index, settings.CASCADE_MODEL, settings.CASCADE_CANDIDATES, build=False)
+            except ValueError as e:
+                raise HTTPException(status_code=503, detail=str(e))
+            all_matches, report = cascade.top_k_many_with_report(
+                request.queries, query_embeddings, request.max_results, request.min_similarity, mask)
+            results = [search.hits(matches, context_verses=request.context_verses, rows=search.index) for matches in all_matches]
+            return {"results": results, "version": search.index.cache_version, "cascade": report}
+
+        mask = search.rows.filters.select(request.book_filter, request.testament_filter, request.chapter_filter)
+        if request.mode == "hybrid":
+            results = [
+                search.hits(*hybrid_top_k(
+                    search.rows, search.searcher, query, query_embedding,
+                    request.max_results, request.min_similarity, mask,
+                    candidates=settings.HYBRID_CANDIDATES, rrf_k=settings.RRF_K),
+                    context_verses=request.context_verses)
+                for query, query_embedding in zip(request.queries, query_embeddings)
+            ]
+        else:
+            all_matches = top_k_many(search.searcher, query_embeddings, request.max_results, request.min_similarity, mask)
+            results = [search.hits(matches, context_verses=request.context_verses) for matches in all_matches]
+
+        return {"results": results, "version": search.rows.cache_version}
+
+    @app.post("/encode")
+    def encode(request: EncodeRequest) -> Dict[str, Any]:
+        embeddings = state["search"].encoder.encode(request.queries)
+        return {"model": settings.EMBEDDING_MODEL, "embeddings": embeddings.tolist()}
+
+    @app.get("/verse/{book}/{chapter}/{verse}")
+    def verse(book: str, chapter: int, verse: int, context_verses: int = 0) -> Dict[str, Any]:
+        search = state["search"] = state["search"].refreshed()
+        row_id = search.index.verses.lookup(book, chapter, verse)
+        if row_id is None:
+            raise HTTPException(status_code=404, detail=f"Verse not found: {book} {chapter}:{verse}")
+
+        return {
+            "verse": search.index.records[row_id],
+            "verse_count": search.index.verses.verse_count(book, chapter),
+            "context": search.context(row_id, context_verses, search.index) if context_verses > 0 else []
+        }
+
+    @app.get("/passage")
+    def passage(reference: str) -> Dict[str, Any]:
+        search = state["search"] = state["search"].refreshed()
+        resolved = search.resolver.resolve(reference)
+        if resolved is None:
+            raise HTTPException(status_code=404, detail=f"Reference not found: {reference}")
+
+        return {"reference": resolved["reference"], "verses": resolved["verses"], "text": resolved["text"]}
+
+    return app
+
+
+def main():
+    """Serve the search API on settings.API_PORT"""
+    logging.basicConfig(level=settings.LOG_LEVEL)
+    uvicorn.run(create_app(), host=settings.SEARCH_SERVICE_HOST, port=settings.API_PORT, workers=1)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,14 +4,150 @@ ChromaDB Vector Database Manager for Amharic Bible Embeddings
 
 import chromadb
 from chromadb.config import Settings
+import hashlib
 import json
+import queue
+import threading
+import time
 import numpy as np
+from datetime import datetime
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, TextIO
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+from config.settings import settings
+from src.embeddings.embedding_artifact import (artifact_path_for, is_artifact, fresh_artifact_for, load_embedding_artifact,
+                                               read_manifest, vectors_path_for)
+from src.retrieval.response_cache import get_response_cache
+from src.retrieval.bm25_index import BM25Index
+from src.retrieval.fusion import reciprocal_rank_fusion
+from src.retrieval.query_encoder import get_query_encoder
+from src.vector_db.collection_stats import CollectionStats
+from src.chunking.corpus_text import CorpusText, corpus_path_for
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Per-book boolean metadata flags ("book_<name>": True) let Chroma filter by book natively
+BOOK_FLAG_PREFIX = "book_"
+
+# Metadata a new collection starts with; existing collections keep theirs (e.g. 'updated_at')
+COLLECTION_METADATA = {
+    "description": "Amharic Bible with Late Chunking Embeddings",
+    "embedding_model": "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
+    "chunking_method": "late_chunking",
+    "language": "amharic",
+    "bible_version": "Catholic Edition",
+    # Distances are 1 - cosine, so similarity = 1 - distance
+    "hnsw:space": "cosine"
+}
+
+# Metadata fields kept per stored chunk while diffing an ingest (hash + stats contribution)
+_DIFF_FIELDS = ('content_hash', 'books', 'testament', 'chapter', 'embedding_norm')
+
+# Metadata fields covered by the content hash; positional fields (chunk_id, passage_id)
+# stay out, so inserting a chunk does not change the hash of every later one
+_HASHED_FIELDS = ('books', 'testament', 'chapter', 'biblical_context', 'theological_themes')
+
+
+def book_flag(book: str) -> str:
+    """Metadata key flagging that a chunk covers the given book"""
+    return f"{BOOK_FLAG_PREFIX}{book}"
+
+
+def chunk_content_id(books: List[str], text: str) -> str:
+    """Stable Chroma id of a chunk: hash of its books and text (independent of its position in the file)"""
+    digest = hashlib.sha1(json.dumps([books, text], ensure_ascii=False).encode('utf-8')).hexdigest()
+    return f"chunk_{digest[:16]}"
+
+
+def chunk_content_hash(document: str, metadata: Dict[str, Any], embedding: np.ndarray) -> str:
+    """
+    Fingerprint of a chunk's content: its document, the _HASHED_FIELDS of its metadata and its embedding
+    
+    The embedding is hashed at float16 precision, so float32 noise does not
+    count as a change (switching between a JSONL file and its artifact may
+    still re-write the few rows whose values straddle a rounding boundary).
+    """
+    hashed = {field: metadata[field] for field in _HASHED_FIELDS if field in metadata}
+    digest = hashlib.sha1(json.dumps([document, hashed], ensure_ascii=False, sort_keys=True).encode('utf-8'))
+    digest.update(np.asarray(embedding, dtype=np.float16).tobytes())
+    return digest.hexdigest()
+
+
+# Chroma accepts NumPy embedding arrays from 0.5 on; older clients need nested lists
+_CHROMA_ACCEPTS_NUMPY = tuple(int(part) for part in chromadb.__version__.split('.')[:2] if part.isdigit()) >= (0, 5)
+
+
+def _chroma_embeddings(embeddings: np.ndarray):
+    """Embeddings argument for collection.add/upsert (the array itself when the client supports it)"""
+    return embeddings if _CHROMA_ACCEPTS_NUMPY else embeddings.tolist()
+
+
+def _cosine_similarity(query_embedding: np.ndarray, embedding) -> float:
+    """Cosine similarity of a query vector and a stored embedding"""
+    query_embedding = np.asarray(query_embedding, dtype=np.float32)
+    embedding = np.asarray(embedding, dtype=np.float32)
+    norms = np.linalg.norm(query_embedding) * np.linalg.norm(embedding)
+    return float(query_embedding @ embedding / norms) if norms else 0.0
+
+
+def _line_batches(lines: TextIO, batch_size: int) -> Iterator[List[str]]:
+    """Non-empty lines of a file in lists of batch_size"""
+    non_empty = (line for line in lines if line.strip())
+    while True:
+        batch = list(islice(non_empty, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def _prefetched(batches: Iterable[Any]) -> Iterator[Any]:
+    """
+    Produce the next item of an iterator in a background thread
+    
+    At most one item waits in the hand-off queue, so parsing runs one batch
+    ahead of the consumer without buffering the whole file.
+    """
+    handoff: queue.Queue = queue.Queue(maxsize=1)
+    done = object()
+    
+    def produce():
+        try:
+            for batch in batches:
+                handoff.put((batch, None))
+        except Exception as e:
+            handoff.put((None, e))
+        handoff.put((done, None))
+    
+    threading.Thread(target=produce, name="chroma-ingest-prefetch", daemon=True).start()
+    
+    while True:
+        batch, error = handoff.get()
+        if error is not None:
+            raise error
+        if batch is done:
+            return
+        yield batch
+
+
+class QueryEncoderEmbeddingFunction:
+    """
+    Chroma embedding function backed by the project's shared query encoder
+    
+    Texts Chroma embeds itself (query_texts) go through the same cached
+    SentenceTransformer and query-embedding cache as the rest of the project,
+    instead of Chroma's default model.
+    """
+    
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+    
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return get_query_encoder(self.model_name).encode(list(input)).tolist()
+
+
 class ChromaBibleDB:
     """ChromaDB manager for Amharic Bible embeddings with late chunking"""
     
@@ -34,69 +170,279 @@ class ChromaBibleDB:
         # Collection for bible embeddings
         self.collection_name = "amharic_bible_late_chunking"
         self.collection = None
+        self._book_flags: Optional[bool] = None
+        self._lexical: Optional[Tuple[str, BM25Index, List[Dict[str, Any]]]] = None
+        self._stats: Optional[CollectionStats] = None
         
     def create_collection(self, reset: bool = False) -> None:
         """Create or get the bible collection"""
         
         try:
-            if reset and self.collection_name in [c.name for c in self.client.list_collections()]:
+            # Collection objects (chromadb < 0.6) or names (0.6+)
+            existing = {getattr(collection, 'name', collection) for collection in self.client.list_collections()}
+            
+            if reset and self.collection_name in existing:
                 self.client.delete_collection(self.collection_name)
+                existing.discard(self.collection_name)
                 logger.info(f"Reset collection: {self.collection_name}")
             
-            self.collection = self.client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={
-                    "description": "Amharic Bible with Late Chunking Embeddings",
-                    "embedding_model": "sentence-transformers/paraphrase-multilingual-mpnet-base-v2",
-                    "chunking_method": "late_chunking",
-                    "language": "amharic",
-                    "bible_version": "Catholic Edition"
-                }
-            )
+            default_model = COLLECTION_METADATA["embedding_model"]
+            if self.collection_name in existing:
+                # get_or_create_collection(metadata=...) would replace the stored metadata
+                # (dropping 'updated_at', which the collection version is built from)
+                self.collection = self.client.get_collection(
+                    name=self.collection_name,
+                    embedding_function=QueryEncoderEmbeddingFunction(default_model)
+                )
+            else:
+                self.collection = self.client.create_collection(
+                    name=self.collection_name,
+                    metadata=dict(COLLECTION_METADATA),
+                    embedding_function=QueryEncoderEmbeddingFunction(default_model)
+                )
+            
+            # Queries must be embedded by the model that produced the stored vectors
+            model_name = self.embedding_model()
+            if model_name != default_model:
+                self.collection = self.client.get_collection(
+                    name=self.collection_name,
+                    embedding_function=QueryEncoderEmbeddingFunction(model_name)
+                )
             
+            self._book_flags = None
             logger.info(f"Collection ready: {self.collection_name}")
             
         except Exception as e:
             logger.error(f"Failed to create collection: {e}")
             raise
     
-    def add_bible_chunks(self, chunks_file: str) -> Dict[str, Any]:
+    def _iter_chunk_batches(self, chunks_file: str, batch_size: int) -> Iterator[Tuple[List[Dict[str, Any]], np.ndarray]]:
+        """
+        Chunk records and their (batch, dimension) float32 embeddings in fixed-size batches
+        
+        Prefers the binary artifact (memory-mapped matrix, metadata sidecar read
+        line by line) unless the JSONL file is newer; a JSONL file is parsed one batch at a time, resolving
+        'vector_id' references of deduplicated chunks through the memory-mapped
+        vectors file. Only one batch is held in memory; the text of chunks
+        stored as corpus 'text_span' offsets is decoded batch by batch.
+        """
+        artifact_dir = fresh_artifact_for(chunks_file)
+        
+        if artifact_dir is not None:
+            artifact = load_embedding_artifact(str(artifact_dir), mmap=True, load_records=False)
+            corpus = CorpusText(str(artifact.corpus_file)) if artifact.corpus_file else None
+            logger.info(f"Using binary artifact: {artifact_dir}")
+            
+            start = 0
+            with open(artifact.path / artifact.manifest['files']['metadata'], 'r', encoding='utf-8') as f:
+                for lines in _line_batches(f, batch_size):
+                    chunks = [json.loads(line) for line in lines]
+                    if corpus is not None:
+                        chunks = [corpus.materialize(chunk) for chunk in chunks]
+                    end = start + len(chunks)
+                    yield chunks, artifact.raw_embeddings(start, end).astype(np.float32, copy=False)
+                    start = end
+            return
+        
+        vectors_file = vectors_path_for(chunks_file)
+        vectors = np.load(vectors_file, mmap_mode='r') if vectors_file.exists() else None
+        corpus_file = corpus_path_for(chunks_file)
+        corpus = CorpusText(str(corpus_file)) if corpus_file.exists() else None
+        
+        with open(chunks_file, 'r', encoding='utf-8') as f:
+            for lines in _line_batches(f, batch_size):
+                chunks = [json.loads(line) for line in lines]
+                if corpus is not None:
+                    chunks = [corpus.materialize(chunk) for chunk in chunks]
+                if vectors is not None:
+                    embeddings = np.asarray(vectors[[chunk['vector_id'] for chunk in chunks]], dtype=np.float32)
+                else:
+                    embeddings = np.asarray([chunk.pop('embedding') for chunk in chunks], dtype=np.float32)
+                yield chunks, embeddings
+    
+    def add_bible_chunks(self,
+                         chunks_file: str,
+                         sync: bool = False,
+                         batch_size: int = 500,
+                         prefetch: bool = True,
+                         model_name: Optional[str] = None) -> Dict[str, Any]:
         """
         Add late-chunked bible embeddings to the vector database
+        
+        Accepts a JSONL chunks file or an embedding artifact directory; an
+        artifact next to the JSONL file is used when present. Chunks are keyed
+        by content-hash ids and upserted, so re-running an ingest never fails
+        on existing ids and only new or changed chunks are written.
+        
+        The file is streamed in batches of batch_size, so memory stays flat
+        regardless of corpus size; with prefetch the next batch is parsed in a
+        background thread while the current one is written.
+        
+        Args:
+            chunks_file: Chunks to ingest
+            sync: Also delete collection entries that are not in chunks_file,
+                making the collection mirror the file
+            batch_size: Chunks read and written per batch
+            prefetch: Overlap parsing of the next batch with the current write
+            model_name: Model that produced the embeddings; defaults to the
+                artifact manifest's model. It is recorded in the collection
+                metadata (with the dimension) and embeds later queries
+        
+        Returns:
+            Collection statistics plus a 'changes' report (added, updated,
+            deleted and unchanged ids) and ingest throughput
         """
         
         if not self.collection:
             self.create_collection()
         
-        # Load chunks
-        with open(chunks_file, 'r', encoding='utf-8') as f:
-            chunks = [json.loads(line) for line in f]
+        model_name = model_name or self._source_model(chunks_file)
+        
+        started = time.perf_counter()
+        stats = self._collection_stats()
+        stored = self._stored_index()
         
-        logger.info(f"Loading {len(chunks)} chunks into ChromaDB")
+        changes = {'added': [], 'updated': [], 'deleted': [], 'unchanged': 0}
+        seen: Dict[str, int] = {}
+        books_covered = set()
+        dimension = 0
+        total = 0
+        write_seconds = 0.0
+        
+        batches = self._iter_chunk_batches(chunks_file, batch_size)
+        if prefetch:
+            batches = _prefetched(batches)
+        
+        for batch_number, (chunks, embeddings) in enumerate(batches, 1):
+            ids, documents, metadatas = self._prepare_batch(chunks, embeddings, seen)
+            total += len(chunks)
+            dimension = dimension or int(embeddings.shape[1])
+            books_covered.update(chunk['book'] for chunk in chunks if 'book' in chunk)
+            
+            # Diff against what the collection already holds
+            write = []
+            for position, (chunk_id, metadata) in enumerate(zip(ids, metadatas)):
+                if chunk_id not in stored:
+                    changes['added'].append(chunk_id)
+                elif stored[chunk_id].get('content_hash') != metadata['content_hash']:
+                    changes['updated'].append(chunk_id)
+                    stats.remove([stored[chunk_id]])
+                else:
+                    changes['unchanged'] += 1
+                    continue
+                write.append(position)
+            
+            if write:
+                write_started = time.perf_counter()
+                self.collection.upsert(
+                    ids=[ids[position] for position in write],
+                    embeddings=_chroma_embeddings(embeddings[write]),
+                    documents=[documents[position] for position in write],
+                    metadatas=[metadatas[position] for position in write]
+                )
+                stats.add(metadatas[position] for position in write)
+                write_seconds += time.perf_counter() - write_started
+            
+            logger.info(f"Batch {batch_number}: {len(chunks)} chunks read, {len(write)} upserted")
+        
+        if sync:
+            # Ingested ids were seen in the file; whatever else is stored was removed from it
+            incoming = set(seen)
+            incoming.update(f"{chunk_id}_{n}" for chunk_id, count in seen.items() for n in range(2, count + 1))
+            changes['deleted'] = [doc_id for doc_id in stored if doc_id not in incoming]
+            for i in range(0, len(changes['deleted']), batch_size):
+                self.collection.delete(ids=changes['deleted'][i:i + batch_size])
+            stats.remove(stored[doc_id] for doc_id in changes['deleted'])
+        
+        if dimension:
+            self._record_model(model_name, dimension)
+        
+        if changes['added'] or changes['updated'] or changes['deleted']:
+            self._book_flags = None
+            self._mark_updated()
+            stats.save(self._collection_version())
+        
+        elapsed = time.perf_counter() - started
+        logger.info(f"Ingest changes: {len(changes['added'])} added, {len(changes['updated'])} updated, "
+                    f"{len(changes['deleted'])} deleted, {changes['unchanged']} unchanged "
+                    f"({total / elapsed if elapsed else 0:.0f} chunks/s)")
+        
+        # Get collection stats
+        stats = {
+            'total_chunks': self.collection.count(),
+            'collection_name': self.collection_name,
+            'embedding_dimension': dimension,
+            'books_covered': len(books_covered),
+            'persist_directory': str(self.persist_directory),
+            'changes': {
+                'added': len(changes['added']),
+                'updated': len(changes['updated']),
+                'deleted': len(changes['deleted']),
+                'unchanged': changes['unchanged'],
+                'ids': {key: changes[key] for key in ('added', 'updated', 'deleted')}
+            },
+            'throughput': {
+                'chunks_read': total,
+                'seconds': round(elapsed, 3),
+                'write_seconds': round(write_seconds, 3),
+                'chunks_per_second': round(total / elapsed, 1) if elapsed else 0.0
+            }
+        }
+        
+        logger.info(f"ChromaDB populated: {stats['total_chunks']} chunks")
+        return stats
+    
+    @staticmethod
+    def _source_model(chunks_file: str) -> Optional[str]:
+        """Model recorded in the artifact manifest of a chunks file (None for a plain JSONL file)"""
+        
+        artifact_dir = fresh_artifact_for(chunks_file)
+        return read_manifest(str(artifact_dir)).get('model') if artifact_dir is not None else None
+    
+    def _record_model(self, model_name: Optional[str], dimension: int) -> None:
+        """Store the embedding model and dimension of the ingested vectors and bind the query embedding function to it"""
+        
+        metadata = dict(self.collection.metadata or {})
+        if model_name is None:
+            model_name = metadata.get('embedding_model', settings.EMBEDDING_MODEL)
+            logger.warning(f"No embedding model recorded for the ingested chunks; assuming {model_name} "
+                           f"(pass add_bible_chunks(model_name=...))")
+        
+        if metadata.get('embedding_model') == model_name and metadata.get('embedding_dimension') == dimension:
+            return
+        
+        metadata.update(embedding_model=model_name, embedding_dimension=dimension)
+        self.collection.modify(metadata=metadata)
+        self.collection = self.client.get_collection(
+            name=self.collection_name,
+            embedding_function=QueryEncoderEmbeddingFunction(model_name)
+        )
+        logger.info(f"Collection {self.collection_name} embeds queries with {model_name} ({dimension}-d)")
+    
+    @staticmethod
+    def _prepare_batch(chunks: List[Dict[str, Any]],
+                       embeddings: np.ndarray,
+                       seen: Dict[str, int]) -> Tuple[List[str], List[str], List[Dict[str, Any]]]:
+        """Content-hash ids, documents and metadata of a batch of chunks"""
         
-        # Prepare data for ChromaDB
         ids = []
-        embeddings = []
         documents = []
         metadatas = []
         
-        for chunk in chunks:
-            # Create unique ID
-            chunk_id = f"chunk_{chunk['id']:05d}"
-            ids.append(chunk_id)
+        for position, chunk in enumerate(chunks):
+            # Rich metadata for filtering and retrieval
+            books = [chunk['book']] if isinstance(chunk.get('book'), str) else chunk.get('books', [])
             
-            # Extract embedding
-            embedding = chunk['embedding']
-            if isinstance(embedding, list):
-                embedding = np.array(embedding)
-            embeddings.append(embedding.tolist())
+            # Content-hash ID; repeated identical chunks get an occurrence suffix
+            chunk_id = chunk_content_id(books, chunk['text'])
+            seen[chunk_id] = seen.get(chunk_id, 0) + 1
+            if seen[chunk_id] > 1:
+                chunk_id = f"{chunk_id}_{seen[chunk_id]}"
+            ids.append(chunk_id)
             
             # Document text
             documents.append(chunk['text'])
             
-            # Rich metadata for filtering and retrieval
-            books = [chunk['book']] if isinstance(chunk['book'], str) else chunk.get('books', [])
-            
             metadata = {
                 'chunk_id': chunk['id'],
                 'passage_id': chunk.get('passage_id', 0),
@@ -108,105 +454,408 @@ class ChromaBibleDB:
                 'biblical_context': chunk.get('enhanced_context', {}).get('biblical_context', '')[:500],  # Truncate
                 'theological_themes': chunk.get('enhanced_context', {}).get('theological_themes', '')[:500]
             }
+            if isinstance(chunk.get('chapter'), int):
+                metadata['chapter'] = chunk['chapter']
+            metadata.update({book_flag(book): True for book in books})
+            metadata['content_hash'] = chunk_content_hash(chunk['text'], metadata, embeddings[position])
+            # Norm feeds the collection stats; it is covered by the embedding in the hash
+            metadata['embedding_norm'] = float(np.linalg.norm(embeddings[position]))
             metadatas.append(metadata)
         
-        # Add to ChromaDB in batches
-        batch_size = 500
-        for i in range(0, len(chunks), batch_size):
-            end_idx = min(i + batch_size, len(chunks))
-            
-            self.collection.add(
-                ids=ids[i:end_idx],
-                embeddings=embeddings[i:end_idx],
-                documents=documents[i:end_idx],
-                metadatas=metadatas[i:end_idx]
-            )
-            
-            logger.info(f"Added batch {i//batch_size + 1}: {end_idx - i} chunks")
+        return ids, documents, metadatas
+    
+    def _iter_stored_metadata(self, page_size: int = 5000) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """(id, metadata) of every stored chunk, fetched page by page"""
         
-        # Get collection stats
-        stats = {
-            'total_chunks': self.collection.count(),
-            'collection_name': self.collection_name,
-            'embedding_dimension': len(embeddings[0]) if embeddings else 0,
-            'books_covered': len(set([chunk['book'] for chunk in chunks if 'book' in chunk])),
-            'persist_directory': str(self.persist_directory)
+        offset = 0
+        while True:
+            page = self.collection.get(include=["metadatas"], limit=page_size, offset=offset)
+            for doc_id, metadata in zip(page['ids'], page['metadatas']):
+                yield doc_id, metadata or {}
+            if len(page['ids']) < page_size:
+                return
+            offset += page_size
+    
+    def _stored_index(self) -> Dict[str, Dict[str, Any]]:
+        """Content hash and stats fields of every stored chunk by id"""
+        return {
+            doc_id: {field: metadata[field] for field in _DIFF_FIELDS if field in metadata}
+            for doc_id, metadata in self._iter_stored_metadata()
         }
+    
+    def _collection_stats(self) -> CollectionStats:
+        """Sidecar statistics of the collection, recounted once if they do not match its version"""
         
-        logger.info(f"ChromaDB populated: {stats['total_chunks']} chunks")
-        return stats
+        if self._stats is None:
+            self._stats = CollectionStats(str(self.persist_directory / f"{self.collection_name}_stats.json"))
+        
+        version = self._collection_version()
+        if not self._stats.is_current(version):
+            logger.info(f"Recounting collection stats for {self.collection_name}")
+            self._stats.rebuild(metadata for _, metadata in self._iter_stored_metadata())
+            self._stats.save(version)
+        
+        return self._stats
+    
+    def delete_chunks(self, ids: List[str], batch_size: int = 500) -> int:
+        """
+        Delete chunks by id, keeping the collection stats in step
+        
+        Returns:
+            Number of chunks deleted
+        """
+        if not self.collection:
+            raise ValueError("Collection not initialized. Call create_collection() first.")
+        
+        stats = self._collection_stats()
+        deleted = 0
+        for i in range(0, len(ids), batch_size):
+            existing = self.collection.get(ids=list(ids[i:i + batch_size]), include=["metadatas"])
+            if not existing['ids']:
+                continue
+            self.collection.delete(ids=existing['ids'])
+            stats.remove(metadata or {} for metadata in existing['metadatas'])
+            deleted += len(existing['ids'])
+        
+        if deleted:
+            self._book_flags = None
+            self._mark_updated()
+            stats.save(self._collection_version())
+        
+        return deleted
     
     def semantic_search(self, 
                        query: str, 
                        n_results: int = 5,
                        book_filter: Optional[List[str]] = None,
-                       testament_filter: Optional[str] = None) -> List[Dict[str, Any]]:
+                       testament_filter: Optional[str] = None,
+                       mode: Optional[str] = None,
+                       query_embedding: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
         """
         Semantic search across the bible collection
+        
+        mode is "dense" or "hybrid" (dense and BM25 rankings fused with RRF);
+        defaults to settings.SEARCH_MODE. Pass query_embedding when the query
+        vector is already known (it must come from the collection's model).
+        """
+        
+        query_embeddings = None if query_embedding is None else np.atleast_2d(query_embedding)
+        return self.semantic_search_many([query], n_results, book_filter, testament_filter, mode, query_embeddings)[0]
+    
+    def semantic_search_many(self,
+                             queries: List[str],
+                             n_results: int = 5,
+                             book_filter: Optional[List[str]] = None,
+                             testament_filter: Optional[str] = None,
+                             mode: Optional[str] = None,
+                             query_embeddings: Optional[np.ndarray] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Semantic search for several queries in one Chroma query call
+        
+        The queries are embedded as one batch with the collection's model
+        (through the shared query-embedding cache) and searched together;
+        returns one result list per query. query_embeddings, when given, are
+        used instead of encoding. Responses are cached per query, keyed on
+        the collection version, so only uncached queries reach Chroma.
         """
         
         if not self.collection:
             raise ValueError("Collection not initialized. Call create_collection() first.")
         
-        # Build where clause for filtering
-        where_clause = {}
-        if testament_filter:
-            where_clause['testament'] = testament_filter
+        mode = (mode or settings.SEARCH_MODE).lower()
+        if mode not in ("dense", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}")
+        
+        cache = get_response_cache()
+        version = self._collection_version()
+        keys = [
+            cache.make_key(f"chroma:{self.collection_name}", version, query,
+                           n_results=n_results,
+                           book_filter=sorted(book_filter) if book_filter else None,
+                           testament_filter=testament_filter,
+                           mode=mode)
+            for query in queries
+        ]
+        
+        all_results = [cache.get(key) for key in keys]
+        missing = [i for i, results in enumerate(all_results) if results is None]
+        
+        if missing:
+            if query_embeddings is not None:
+                missing_embeddings = np.asarray(query_embeddings, dtype=np.float32)[missing]
+            else:
+                missing_embeddings = self._encode_queries([queries[i] for i in missing])
+            
+            search = self._hybrid_query if mode == "hybrid" else self._query_collection
+            fresh = search([queries[i] for i in missing], n_results, book_filter, testament_filter, missing_embeddings)
+            for i, results in zip(missing, fresh):
+                cache.put(keys[i], results)
+                all_results[i] = results
+        
+        return all_results
+    
+    def search_by_embedding(self,
+                            query_embeddings: np.ndarray,
+                            n_results: int = 5,
+                            book_filter: Optional[List[str]] = None,
+                            testament_filter: Optional[str] = None) -> List[List[Dict[str, Any]]]:
+        """
+        Dense search for precomputed query vectors (no text, no encoding, no response cache)
         
-        # If book filter is provided, we'll need to post-process since Chroma doesn't support complex JSON queries
+        Returns:
+            One result list per row of query_embeddings
+        """
+        if not self.collection:
+            raise ValueError("Collection not initialized. Call create_collection() first.")
         
+        query_embeddings = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        return self._query_collection([None] * len(query_embeddings), n_results, book_filter, testament_filter, query_embeddings)
+    
+    def embedding_model(self) -> str:
+        """Model that produced the stored vectors (from the collection metadata)"""
+        return (self.collection.metadata or {}).get('embedding_model', settings.EMBEDDING_MODEL)
+    
+    def _check_query_dimension(self, query_embeddings: np.ndarray) -> None:
+        """Fail clearly when query vectors do not match the stored vectors (recorded at ingest)"""
+        
+        expected = (self.collection.metadata or {}).get('embedding_dimension')
+        if expected and query_embeddings.shape[1] != expected:
+            raise ValueError(f"Query vectors have {query_embeddings.shape[1]} dimensions, but collection "
+                             f"{self.collection_name} stores {expected}-d vectors from {self.embedding_model()}")
+    
+    def _encode_queries(self, queries: List[str]) -> np.ndarray:
+        """Query embeddings from the collection's model, served from the query cache when seen before"""
+        return get_query_encoder(self.embedding_model()).encode(list(queries))
+    
+    def _query_collection(self,
+                          queries: List[Optional[str]],
+                          n_results: int,
+                          book_filter: Optional[List[str]],
+                          testament_filter: Optional[str],
+                          query_embeddings: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """Run one Chroma query for a batch of query vectors and format the hits"""
+        
+        query_embeddings = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        self._check_query_dimension(query_embeddings)
+        
+        # Filters are pushed into the query so Chroma only ranks eligible chunks
+        pushdown_books = self._has_book_flags()
+        where_clause = self._build_where(book_filter if pushdown_books else None, testament_filter)
+        
+        fetch = n_results
+        if book_filter and not pushdown_books:
+            # Collections ingested before book flags existed can only post-filter
+            logger.warning("Collection has no book flags; re-ingest it to filter books inside Chroma")
+            fetch = n_results * 5
+        
+        # Collections created before the cosine space rank by squared L2 over raw vectors;
+        # their hits are re-scored by cosine so similarities mean the same everywhere
+        cosine_space = (self.collection.metadata or {}).get('hnsw:space') == 'cosine'
         results = self.collection.query(
-            query_texts=[query],
-            n_results=n_results,
-            where=where_clause if where_clause else None,
-            include=["documents", "metadatas", "distances"]
+            query_embeddings=query_embeddings.tolist(),
+            n_results=fetch,
+            where=where_clause,
+            include=["documents", "metadatas", "distances"] + ([] if cosine_space else ["embeddings"])
         )
         
         # Format results
-        formatted_results = []
-        for i in range(len(results['documents'][0])):
-            result = {
-                'document': results['documents'][0][i],
-                'metadata': results['metadatas'][0][i],
-                'distance': results['distances'][0][i],
-                'similarity': 1 - results['distances'][0][i],  # Convert distance to similarity
-                'books': json.loads(results['metadatas'][0][i]['books'])
-            }
+        all_results = []
+        for q in range(len(queries)):
+            formatted_results = []
+            for i in range(len(results['documents'][q])):
+                if cosine_space:
+                    similarity = 1 - results['distances'][q][i]
+                else:
+                    similarity = _cosine_similarity(query_embeddings[q], results['embeddings'][q][i])
+                result = {
+                    'id': results['ids'][q][i],
+                    'document': results['documents'][q][i],
+                    'metadata': results['metadatas'][q][i],
+                    'distance': 1 - similarity,
+                    'similarity': similarity,
+                    'books': json.loads(results['metadatas'][q][i]['books'])
+                }
+                
+                # Legacy collections: apply book filter after retrieval
+                if book_filter and not pushdown_books:
+                    if not any(book in result['books'] for book in book_filter):
+                        continue
+                
+                formatted_results.append(result)
             
-            # Apply book filter if provided
-            if book_filter:
-                if not any(book in result['books'] for book in book_filter):
-                    continue
+            all_results.append(formatted_results[:n_results])  # Ensure we return requested number
+        
+        return all_results
+    
+    def _hybrid_query(self,
+                      queries: List[str],
+                      n_results: int,
+                      book_filter: Optional[List[str]],
+                      testament_filter: Optional[str],
+                      query_embeddings: np.ndarray) -> List[List[Dict[str, Any]]]:
+        """
+        Dense Chroma candidates fused with BM25 candidates by reciprocal-rank fusion
+        
+        Keyword hits missing from the dense candidates are fetched by id and
+        scored against the query embedding, so every result carries a cosine
+        similarity (the same measure as the dense hits).
+        """
+        
+        candidates = max(settings.HYBRID_CANDIDATES, n_results)
+        dense = self._query_collection(queries, candidates, book_filter, testament_filter, query_embeddings)
+        lexical, records, row_sets = self._lexical_index()
+        mask = self._lexical_mask(row_sets, book_filter, testament_filter)
+        
+        all_results = []
+        for query, query_embedding, dense_results in zip(queries, query_embeddings, dense):
+            by_id = {result['id']: result for result in dense_results}
+            lexical_hits = [(records[row_id]['id'], score) for row_id, score in lexical.top_k(query, candidates, mask)]
+            
+            fused = reciprocal_rank_fusion(
+                [[(result['id'], result['similarity']) for result in dense_results], lexical_hits],
+                k=settings.RRF_K,
+                limit=n_results
+            )
             
-            formatted_results.append(result)
+            missing = [doc_id for doc_id, _ in fused if doc_id not in by_id]
+            if missing:
+                by_id.update(self._score_documents(query_embedding, missing))
+            
+            all_results.append([{**by_id[doc_id], 'fusion_score': fusion_score} for doc_id, fusion_score in fused])
         
-        return formatted_results[:n_results]  # Ensure we return requested number
+        return all_results
+    
+    def _lexical_index(self) -> Tuple[BM25Index, List[Dict[str, Any]], Dict[str, Dict[str, np.ndarray]]]:
+        """
+        BM25 index over the collection documents, rebuilt when the collection changes
+        
+        Returns:
+            (BM25 index, row records, per-book and per-testament sorted row ids)
+        """
+        
+        version = self._collection_version()
+        if self._lexical is None or self._lexical[0] != version:
+            data = self.collection.get(include=["documents", "metadatas"])
+            records = [
+                {'id': doc_id, 'text': document or '', 'metadata': metadata or {}}
+                for doc_id, document, metadata in zip(data['ids'], data['documents'], data['metadatas'])
+            ]
+            
+            # Filter row sets are built once per version, next to the BM25 matrix
+            book_rows: Dict[str, List[int]] = {}
+            testament_rows: Dict[str, List[int]] = {}
+            for row_id, record in enumerate(records):
+                for book in set(json.loads(record['metadata'].get('books', '[]'))):
+                    book_rows.setdefault(book, []).append(row_id)
+                testament = record['metadata'].get('testament')
+                if testament is not None:
+                    testament_rows.setdefault(testament, []).append(row_id)
+            
+            row_sets = {
+                'books': {book: np.asarray(rows, dtype=np.int32) for book, rows in book_rows.items()},
+                'testaments': {name: np.asarray(rows, dtype=np.int32) for name, rows in testament_rows.items()}
+            }
+            self._lexical = (version, BM25Index(records), records, row_sets)
+        
+        return self._lexical[1], self._lexical[2], self._lexical[3]
+    
+    @staticmethod
+    def _lexical_mask(row_sets: Dict[str, Dict[str, np.ndarray]],
+                      book_filter: Optional[List[str]],
+                      testament_filter: Optional[str]) -> Optional[np.ndarray]:
+        """Sorted BM25 row ids passing the book/testament filters (None when unfiltered)"""
+        
+        if not book_filter and not testament_filter:
+            return None
+        
+        empty = np.empty(0, dtype=np.int32)
+        rows = None
+        if book_filter:
+            rows = np.unique(np.concatenate([row_sets['books'].get(book, empty) for book in book_filter]))
+        if testament_filter:
+            testament_rows = row_sets['testaments'].get(testament_filter, empty)
+            rows = testament_rows if rows is None else np.intersect1d(rows, testament_rows, assume_unique=True)
+        return rows
+    
+    def _score_documents(self, query_embedding: np.ndarray, ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Search results for documents fetched by id, scored by cosine similarity to the query vector"""
+        
+        fetched = self.collection.get(ids=ids, include=["documents", "metadatas", "embeddings"])
+        
+        results = {}
+        for doc_id, document, metadata, embedding in zip(
+                fetched['ids'], fetched['documents'], fetched['metadatas'], fetched['embeddings']):
+            similarity = _cosine_similarity(query_embedding, embedding)
+            results[doc_id] = {
+                'id': doc_id,
+                'document': document,
+                'metadata': metadata,
+                'distance': 1 - similarity,
+                'similarity': similarity,
+                'books': json.loads(metadata['books'])
+            }
+        return results
+    
+    def _collection_version(self) -> str:
+        """Identifier of the collection contents for the response cache"""
+        
+        updated_at = (self.collection.metadata or {}).get('updated_at', '')
+        return f"{self.collection.count()}:{updated_at}"
+    
+    def _mark_updated(self) -> None:
+        """Record a content change in the collection metadata (invalidates cached responses)"""
+        
+        metadata = dict(self.collection.metadata or {})
+        metadata['updated_at'] = datetime.now().isoformat()
+        self.collection.modify(metadata=metadata)
+    
+    def _has_book_flags(self) -> bool:
+        """Whether the collection was ingested with per-book metadata flags"""
+        
+        if self._book_flags is None:
+            sample = self.collection.peek(limit=1)
+            self._book_flags = any(
+                key.startswith(BOOK_FLAG_PREFIX) for metadata in sample['metadatas'] for key in metadata
+            )
+        return self._book_flags
+    
+    @staticmethod
+    def _build_where(book_filter: Optional[List[str]] = None,
+                     testament_filter: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Chroma where clause for book/testament filters (None when unfiltered)"""
+        
+        conditions = []
+        if testament_filter:
+            conditions.append({'testament': testament_filter})
+        
+        if book_filter:
+            book_conditions = [{book_flag(book): True} for book in book_filter]
+            conditions.append(book_conditions[0] if len(book_conditions) == 1 else {'$or': book_conditions})
+        
+        if not conditions:
+            return None
+        
+        return conditions[0] if len(conditions) == 1 else {'$and': conditions}
     
     def get_collection_stats(self) -> Dict[str, Any]:
-        """Get comprehensive collection statistics"""
+        """
+        Get comprehensive collection statistics
+        
+        Counts are exact and read from the stats sidecar maintained at ingest
+        (recounted once when the collection was changed behind its back).
+        """
         
         if not self.collection:
             return {"error": "Collection not initialized"}
         
         try:
-            count = self.collection.count()
-            
-            # Sample some chunks to analyze
-            sample_results = self.collection.peek(limit=100)
-            
-            # Analyze testament distribution
-            testament_counts = {'old': 0, 'new': 0}
-            for metadata in sample_results['metadatas']:
-                testament_counts[metadata.get('testament', 'unknown')] += 1
+            summary = self._collection_stats().summary()
             
             stats = {
-                'total_chunks': count,
                 'collection_name': self.collection_name,
-                'testament_distribution': testament_counts,
-                'sample_books': list(set([
-                    json.loads(metadata['books'])[0] if json.loads(metadata['books']) else 'Unknown'
-                    for metadata in sample_results['metadatas'][:10]
-                ])),
+                **summary,
+                'testament_distribution': {'old': 0, 'new': 0, **summary['testament_distribution']},
+                'sample_books': list(summary['book_distribution'])[:10],
                 'persist_directory': str(self.persist_directory)
             }
             
@@ -221,18 +870,20 @@ def main():
     
     db = ChromaBibleDB()
     
-    # Create collection
-    db.create_collection(reset=True)
+    # Create or open the collection; re-runs only write what changed
+    db.create_collection()
     
     # Use production embeddings with all 1,827 chunks
     chunks_file = "/Users/mekdesyared/Embedding/amharic-bible-embeddings/data/embeddings/production_embeddings.jsonl"
     
-    if Path(chunks_file).exists():
-        # Add bible chunks
-        stats = db.add_bible_chunks(chunks_file)
+    if Path(chunks_file).exists() or is_artifact(str(artifact_path_for(chunks_file))):
+        # Sync bible chunks (upsert changed chunks, delete removed ones)
+        stats = db.add_bible_chunks(chunks_file, sync=True)
         
         print("ChromaDB Setup Complete:")
         for key, value in stats.items():
+            if key == 'changes':
+                value = {name: count for name, count in value.items() if name != 'ids'}
             print(f"  {key}: {value}")
         
         # Test search
@@ -0,0 +1,160 @@
+"""
+Exact collection statistics kept in a JSON sidecar next to the Chroma store
+Per-book, per-testament and per-chapter chunk counts plus an embedding norm
+summary are updated on every add, upsert and delete, so stats and coverage
+reports read counters instead of sampling the collection
+"""
+
+import json
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterable
+import sys
+sys.path.append(str(Path(__file__).parent.parent.parent))
+import logging
+
+logger = logging.getLogger(__name__)
+
+STATS_FORMAT_VERSION = 1
+
+
+def _contribution(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Books, testament, chapter and embedding norm a stored chunk contributes"""
+
+    try:
+        books = json.loads(metadata.get('books', '[]'))
+    except (TypeError, ValueError):
+        books = []
+
+    return {
+        'books': sorted(set(books)),
+        'testament': metadata.get('testament', 'unknown'),
+        'chapter': metadata.get('chapter'),
+        'norm': metadata.get('embedding_norm')
+    }
+
+
+class CollectionStats:
+    """
+    Counters over a collection's chunk metadata
+
+    Chunks covering several books count once for each of them. Chapter
+    counts are keyed "<book>|<chapter>" and only cover chunks ingested with
+    a chapter. The norm summary keeps count, sum and sum of squares, so the
+    mean and standard deviation stay exact under deletes.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Sidecar JSON file (loaded when it exists)
+        """
+        self.path = Path(path)
+        self.data = self._empty()
+
+        if self.path.exists():
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    loaded = json.load(f)
+                if loaded.get('format_version') == STATS_FORMAT_VERSION:
+                    self.data = loaded
+            except (OSError, ValueError) as e:
+                logger.warning(f"Could not read collection stats {self.path}: {e}")
+
+    @staticmethod
+    def _empty() -> Dict[str, Any]:
+        return {
+            'format_version': STATS_FORMAT_VERSION,
+            'version': None,
+            'total': 0,
+            'books': {},
+            'testaments': {},
+            'chapters': {},
+            'norms': {'count': 0, 'sum': 0.0, 'sum_sq': 0.0},
+            'updated_at': None
+        }
+
+    def _apply(self, metadata: Dict[str, Any], sign: int) -> None:
+        """Add (sign=1) or remove (sign=-1) one chunk's contribution"""
+
+        contribution = _contribution(metadata)
+        data = self.data
+
+        def bump(counts: Dict[str, int], key: str) -> None:
+            counts[key] = counts.get(key, 0) + sign
+            if counts[key] <= 0:
+                del counts[key]
+
+        data['total'] += sign
+        bump(data['testaments'], contribution['testament'])
+        for book in contribution['books']:
+            bump(data['books'], book)
+            if contribution['chapter'] is not None:
+                bump(data['chapters'], f"{book}|{contribution['chapter']}")
+
+        norm = contribution['norm']
+        if norm is not None:
+            data['norms']['count'] += sign
+            data['norms']['sum'] += sign * norm
+            data['norms']['sum_sq'] += sign * norm * norm
+
+    def add(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """Count newly written chunks"""
+        for metadata in metadatas:
+            self._apply(metadata, 1)
+
+    def remove(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """Uncount deleted (or overwritten) chunks"""
+        for metadata in metadatas:
+            self._apply(metadata, -1)
+
+    def rebuild(self, metadatas: Iterable[Dict[str, Any]]) -> None:
+        """Recount from scratch"""
+        self.data = self._empty()
+        self.add(metadatas)
+
+    def is_current(self, version: str) -> bool:
+        """Whether the counters describe the collection at this version"""
+        return self.data.get('version') == version
+
+    def save(self, version: str) -> None:
+        """Write the sidecar, recording the collection version it matches"""
+
+        self.data['version'] = version
+        self.data['updated_at'] = datetime.now().isoformat()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(self.data, f, ensure_ascii=False, indent=2)
+        temporary.replace(self.path)
+
+    def norm_summary(self) -> Dict[str, float]:
+        """Count, mean and standard deviation of the stored embedding norms"""
+
+        norms = self.data['norms']
+        count = norms['count']
+        if count <= 0:
+            return {'count': 0, 'mean': 0.0, 'std': 0.0}
+
+        mean = norms['sum'] / count
+        return {
+            'count': count,
+            'mean': mean,
+            'std': math.sqrt(max(norms['sum_sq'] / count - mean * mean, 0.0))
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Counters in report form"""
+
+        return {
+            'total_chunks': self.data['total'],
+            'book_distribution': dict(sorted(self.data['books'].items())),
+            'testament_distribution': dict(self.data['testaments']),
+            'chapter_distribution': dict(self.data['chapters']),
+            'books_covered': len(self.data['books']),
+            'chapters_covered': len(self.data['chapters']),
+            'embedding_norms': self.norm_summary(),
+            'updated_at': self.data['updated_at']
+        }